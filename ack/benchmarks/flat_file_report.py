@@ -0,0 +1,68 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Benchmark of get_report_generator_from_flat_file, on synthetic CSV reports.
+
+    PYTHONPATH=. python ack/benchmarks/flat_file_report.py --n-records 1000000
+"""
+import time
+
+import click
+
+from ack.benchmarks.synthetic import synthetic_flat_file_lines
+from ack.utils.text import decode_if_needed, get_report_generator_from_flat_file, parse_decoded_line
+
+
+def legacy_get_report_generator_from_flat_file(line_iterator, delimiter=","):
+    """
+    Flat file parsing as implemented before the single CSV reader, for comparison:
+    one CSV reader is built for each line.
+    """
+    first_line = True
+    for line in line_iterator:
+        line = decode_if_needed(line)
+        if first_line:
+            first_line = False
+            headers = parse_decoded_line(line, delimiter)
+        else:
+            parsed_line = parse_decoded_line(line, delimiter)
+            if len(parsed_line) == len(headers):
+                yield dict(zip(headers, parsed_line))
+
+
+def measure_records_per_second(parse, n_records, width):
+    lines = list(synthetic_flat_file_lines(n_records, width=width))
+    start = time.perf_counter()
+    for _ in parse(iter(lines)):
+        pass
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    return n_records / elapsed
+
+
+@click.command()
+@click.option("--n-records", default=1000000, type=int, help="Number of lines of the synthetic report")
+@click.option("--width", default=20, type=int, help="Number of columns of the synthetic report")
+def main(n_records, width):
+    before = measure_records_per_second(legacy_get_report_generator_from_flat_file, n_records, width)
+    after = measure_records_per_second(get_report_generator_from_flat_file, n_records, width)
+    click.echo(f"Per-line CSV readers: {before:,.0f} records/s")
+    click.echo(f"Single CSV reader: {after:,.0f} records/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
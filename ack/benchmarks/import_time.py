@@ -0,0 +1,80 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Benchmark of the startup time of the CLI entrypoint, when only the commands of a run
+are imported (lazy registry) and when every connector is imported (as before the lazy
+registry). Each scenario is run in a new interpreter.
+
+    PYTHONPATH=. python ack/benchmarks/import_time.py --command read_mysql --command write_local
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import click
+
+LAZY_STARTUP = """
+from ack.entrypoints.cli.main import cli
+for command in {commands!r}:
+    cli.get_command(None, command)
+"""
+
+EAGER_STARTUP = """
+from ack.entrypoints.cli.main import cli
+from ack.utils.registry import import_object
+for path in cli.lazy_commands.values():
+    try:
+        import_object(path)
+    except ImportError:
+        pass
+"""
+
+
+def measure_startup_seconds(code, n_runs):
+    environment = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")]))}
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=environment, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+@click.command()
+@click.option(
+    "--command",
+    "commands",
+    multiple=True,
+    default=["read_mysql", "write_local"],
+    type=str,
+    help="Commands of the measured run",
+)
+@click.option("--n-runs", default=10, type=click.IntRange(min=1), help="Number of runs of each scenario")
+def main(commands, n_runs):
+    baseline = measure_startup_seconds("pass", n_runs)
+    eager = measure_startup_seconds(EAGER_STARTUP, n_runs)
+    lazy = measure_startup_seconds(LAZY_STARTUP.format(commands=list(commands)), n_runs)
+    click.echo(f"Python interpreter startup: {baseline * 1000:,.0f} ms")
+    click.echo(f"CLI startup, all connectors imported: {eager * 1000:,.0f} ms")
+    click.echo(f"CLI startup, only {', '.join(commands)} imported: {lazy * 1000:,.0f} ms ({eager / lazy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
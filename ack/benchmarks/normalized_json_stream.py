@@ -0,0 +1,118 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Benchmark of NormalizedJSONStream key normalization, on Facebook-like records.
+
+    PYTHONPATH=. python ack/benchmarks/normalized_json_stream.py --n-records 1000000
+"""
+import time
+
+import click
+
+from ack.streams.normalized_json_stream import NormalizedJSONStream
+
+
+def facebook_like_records(n_records):
+    for i in range(n_records):
+        record = {
+            "account_id": "1234567890",
+            "campaign_id": str(i % 50),
+            "campaign_name": "Campaign (FR) - Q1",
+            "adset_id": str(i % 500),
+            "adset_name": "Adset: Retargeting / 30d",
+            "ad_id": str(i),
+            "ad_name": "Ad name",
+            "date_start": "2020-01-01",
+            "date_stop": "2020-01-01",
+            "impressions": "1234",
+            "clicks": "12",
+            "spend": "12.34",
+            "reach": "1000",
+            "frequency": "1.2",
+            "cpm": "10.0",
+            "ctr": "0.97",
+            "actions[action_type:link_click]": "10",
+            "actions[action_type:post_engagement]": "22",
+            "actions[action_type:video_view]": "5",
+            "action_values[action_type:purchase]": "120.5",
+            "video_p25_watched_actions[action_type:video_view]": "4",
+            "Conversion Rate %": "1.5",
+        }
+        if i % 3 == 0:
+            record["age"] = "25-34"
+            record["gender"] = "female"
+        yield record
+
+
+def legacy_normalize_keys(o):
+    """
+    Key normalization as implemented before shape-cached plans, for comparison.
+    """
+    if isinstance(o, dict):
+        return {legacy_normalize_key(k): legacy_normalize_keys(v) for k, v in o.items()}
+    elif isinstance(o, list):
+        return [legacy_normalize_keys(v) for v in o]
+    elif o is None:
+        return ""
+    else:
+        return o
+
+
+def legacy_normalize_key(key):
+    return (
+        key.strip()
+        .replace(" ", "_")
+        .replace("-", "_")
+        .replace("(", "_")
+        .replace(")", "")
+        .replace(":", "_")
+        .replace("/", "_")
+        .replace("\\", "_")
+        .replace("][", "_")
+        .replace("[", "_")
+        .replace("]", "_")
+        .replace(".", "_")
+        .replace("%", "per")
+        .strip("_")
+    )
+
+
+def measure_records_per_second(transform, n_records):
+    start = time.perf_counter()
+    for _ in facebook_like_records(n_records):
+        pass
+    generation_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for record in facebook_like_records(n_records):
+        transform(record)
+    elapsed = max(time.perf_counter() - start - generation_time, 1e-9)
+    return n_records / elapsed
+
+
+@click.command()
+@click.option("--n-records", default=1000000, type=int, help="Number of Facebook-like records to normalize")
+def main(n_records):
+    before = measure_records_per_second(legacy_normalize_keys, n_records)
+    after = measure_records_per_second(NormalizedJSONStream.transform_record, n_records)
+    click.echo(f"Legacy key normalization: {before:,.0f} records/s")
+    click.echo(f"Shape-cached key normalization: {after:,.0f} records/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Throughput benchmarks of streams, writers and flat file parsers, on synthetic records.
+Each benchmark is set up (records generated, files built) before being timed, and run
+several times: the best time is kept, as it is the least affected by system noise.
+"""
+import gc
+import gzip
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+import requests
+
+from ack.benchmarks.synthetic import (
+    NullWriter,
+    SyntheticReader,
+    synthetic_date_columns,
+    synthetic_flat_file_lines,
+    synthetic_records,
+)
+from ack.streams.csv_stream import CSVStream
+from ack.streams.format_date_stream import FormatDateStream
+from ack.streams.json_stream import JSONStream
+from ack.streams.normalized_json_stream import NormalizedJSONStream
+from ack.utils.download import iter_response_lines
+from ack.utils.file_reader import create_file_reader
+from ack.utils.pipeline import process_streams
+from ack.utils.text import get_report_batches_from_flat_file, get_report_generator_from_flat_file
+from ack.writers.local.writer import LocalWriter
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """
+    Register a benchmark. A benchmark takes the synthetic data parameters, sets up its
+    inputs and returns a function running the benchmark once and returning the nb of
+    bytes it processed.
+    """
+
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+@benchmark("json_stream")
+def bench_json_stream(**params):
+    records = list(synthetic_records(**params))
+    return lambda: _consume_encoded_records(JSONStream("bench", iter(records)))
+
+
+@benchmark("normalized_json_stream")
+def bench_normalized_json_stream(**params):
+    records = list(synthetic_records(**params))
+    return lambda: _consume_encoded_records(NormalizedJSONStream("bench", iter(records)))
+
+
+@benchmark("format_date_stream")
+def bench_format_date_stream(**params):
+    # Dates are formatted in place: records are generated again for every run
+    records = list(synthetic_records(**params))
+    keys = synthetic_date_columns(params["n_date_columns"])
+    return lambda: _consume_encoded_records(FormatDateStream("bench", iter(records), keys=keys, date_format="%d/%m/%Y"))
+
+
+@benchmark("csv_stream")
+def bench_csv_stream(**params):
+    records = list(synthetic_records(**params))
+    return lambda: _consume_encoded_records(CSVStream("bench", iter(records)))
+
+
+@benchmark("stream_as_file")
+def bench_stream_as_file(**params):
+    records = list(synthetic_records(**params))
+    return lambda: _write_to_null_writer(JSONStream("bench", iter(records)))
+
+
+@benchmark("stream_as_file_gzip")
+def bench_stream_as_file_gzip(**params):
+    records = list(synthetic_records(**params))
+    return lambda: _write_to_null_writer(JSONStream("bench", iter(records)).compress("gzip"))
+
+
+@benchmark("local_writer")
+def bench_local_writer(**params):
+    records = list(synthetic_records(**params))
+    directory = tempfile.TemporaryDirectory()
+
+    def run():
+        writer = LocalWriter(directory.name, "bench.njson")
+        writer.write(JSONStream("bench", iter(records)))
+        # Keeps a reference to the directory, which is removed once the benchmark is done
+        return os.path.getsize(os.path.join(directory.name, "bench.njson"))
+
+    return run
+
+
+@benchmark("pipeline")
+def bench_pipeline(**params):
+    def run():
+        writer = NullWriter()
+        process_streams(SyntheticReader(**params), [writer], normalize_keys=True)
+        return writer.bytes_written
+
+    return run
+
+
+@benchmark("flat_file_report")
+def bench_flat_file_report(nesting, **params):
+    lines = list(synthetic_flat_file_lines(**params))
+    n_bytes = sum(len(line) + 1 for line in lines)
+    return lambda: _consume(get_report_generator_from_flat_file(iter(lines)), n_bytes)
+
+
+@benchmark("flat_file_json")
+def bench_flat_file_json(nesting, **params):
+    lines = list(synthetic_flat_file_lines(**params))
+    return lambda: _consume_encoded_records(JSONStream("bench", get_report_generator_from_flat_file(iter(lines))))
+
+
+@benchmark("flat_file_batch_json")
+def bench_flat_file_batch_json(nesting, **params):
+    lines = list(synthetic_flat_file_lines(**params))
+    return lambda: _consume_encoded_records(JSONStream.from_batches("bench", get_report_batches_from_flat_file(iter(lines))))
+
+
+@benchmark("flat_file_download")
+def bench_flat_file_download(nesting, **params):
+    content = b"\n".join(synthetic_flat_file_lines(**params))
+    return lambda: _consume(get_report_generator_from_flat_file(iter_response_lines(_response(content))), len(content))
+
+
+@benchmark("csv_file_reader")
+def bench_csv_file_reader(nesting, **params):
+    content = b"\n".join(synthetic_flat_file_lines(**params))
+    return lambda: _consume(_read_file("csv", io.BytesIO(content)), len(content))
+
+
+@benchmark("gz_file_reader")
+def bench_gz_file_reader(nesting, **params):
+    content = gzip.compress(b"\n".join(synthetic_flat_file_lines(**params)))
+    return lambda: _consume(_read_file("gz", io.BytesIO(content)), len(content))
+
+
+@benchmark("njson_file_reader")
+def bench_njson_file_reader(**params):
+    content = "".join(JSONStream.encode_record(record) + "\n" for record in synthetic_records(**params)).encode("utf-8")
+    return lambda: _consume(_read_file("njson", io.BytesIO(content)), len(content))
+
+
+def _consume_encoded_records(stream):
+    return sum(len(encoded_record) for encoded_record in stream.encoded_records())
+
+
+def _write_to_null_writer(stream):
+    writer = NullWriter()
+    writer.write(stream)
+    return writer.bytes_written
+
+
+def _consume(iterator, n_bytes):
+    for _ in iterator:
+        pass
+    return n_bytes
+
+
+def _response(content):
+    response = requests.Response()
+    response.raw = io.BytesIO(content)
+    return response
+
+
+def _read_file(_format, fd):
+    return create_file_reader(_format, csv_delimiter=",", csv_fieldnames=None).get_reader()(fd)
+
+
+def run_benchmark(name, repeat=5, **params):
+    """
+    Run a benchmark repeat times, each run being set up again beforehand.
+    """
+    timings, n_bytes = [], 0
+    for _ in range(repeat):
+        run = BENCHMARKS[name](**params)
+        gc.collect()
+        start = time.perf_counter()
+        n_bytes = run()
+        timings.append(time.perf_counter() - start)
+        del run
+
+    best = min(timings)
+    return {
+        "records": params["n_records"],
+        "bytes": n_bytes,
+        "seconds": [round(timing, 6) for timing in timings],
+        "best_seconds": round(best, 6),
+        "median_seconds": round(statistics.median(timings), 6),
+        "records_per_second": round(params["n_records"] / best, 1),
+        "megabytes_per_second": round(n_bytes / best / 1e6, 3),
+    }
+
+
+def run_suite(names=None, repeat=5, **params):
+    """
+    Run the given benchmarks (all of them by default), and return their results
+    along with the parameters and environment of the run, so that runs can be
+    compared across commits.
+    """
+    names = names or sorted(BENCHMARKS)
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": _get_git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "parameters": params,
+        "benchmarks": {name: run_benchmark(name, repeat, **params) for name in names},
+    }
+
+
+def compare_results(results, baseline):
+    """
+    Ratio of the throughput of each benchmark to its throughput in the baseline
+    results (above 1 if faster), for benchmarks run in both.
+    """
+    if results["parameters"] != baseline["parameters"]:
+        raise ValueError(
+            f"Results were obtained with different parameters: {results['parameters']} vs {baseline['parameters']}"
+        )
+    return {
+        name: round(result["records_per_second"] / baseline["benchmarks"][name]["records_per_second"], 3)
+        for name, result in results["benchmarks"].items()
+        if name in baseline["benchmarks"]
+    }
+
+
+def write_results(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def read_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _get_git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
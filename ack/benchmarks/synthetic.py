@@ -0,0 +1,116 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Synthetic reader and null writer, to measure the throughput of streams and writers
+independently of any API.
+"""
+import random
+from datetime import date, timedelta
+
+from ack.readers.reader import Reader
+from ack.streams.json_stream import JSONStream
+from ack.writers.writer import Writer
+
+NULL_WRITER_READ_SIZE = 64 * 1024
+
+
+def synthetic_columns(width):
+    """
+    Names of the flat columns of synthetic records, with the spaces and special
+    characters usually found in report headers.
+    """
+    return [f"Metric {i} (%)" if i % 3 == 0 else f"column_{i}" for i in range(width)]
+
+
+def synthetic_date_columns(n_date_columns):
+    return [f"date_{i}" for i in range(n_date_columns)]
+
+
+def synthetic_records(n_records, width=20, nesting=0, n_date_columns=1, seed=0):
+    """
+    Generate n_records deterministic records, with width flat columns (strings, ints
+    and floats), n_date_columns "%Y-%m-%d" date columns and, if nesting > 0, a "details"
+    column holding dicts nested nesting levels deep.
+    """
+    rng = random.Random(seed)
+    columns = synthetic_columns(width)
+    date_columns = synthetic_date_columns(n_date_columns)
+    start_date = date(2020, 1, 1)
+    for i in range(n_records):
+        record = {}
+        for j, column in enumerate(columns):
+            if j % 3 == 0:
+                record[column] = round(rng.random(), 4)
+            elif j % 3 == 1:
+                record[column] = rng.randrange(1000000)
+            else:
+                record[column] = f"value_{rng.randrange(1000)}"
+        for j, column in enumerate(date_columns):
+            record[column] = (start_date + timedelta(days=(i + j) % 365)).strftime("%Y-%m-%d")
+        if nesting > 0:
+            record["details"] = _nested_dict(rng, nesting)
+        yield record
+
+
+def synthetic_flat_file_lines(n_records, width=20, n_date_columns=1, seed=0, delimiter=","):
+    """
+    Lines of a CSV report with the flat columns of synthetic records, as yielded by
+    the line iterator of an HTTP response: bytes without line terminator.
+    """
+    columns = synthetic_columns(width) + synthetic_date_columns(n_date_columns)
+    yield delimiter.join(columns).encode("utf-8")
+    for record in synthetic_records(n_records, width, 0, n_date_columns, seed):
+        yield delimiter.join(str(record[column]) for column in columns).encode("utf-8")
+
+
+def _nested_dict(rng, depth):
+    nested = {"id": rng.randrange(1000), "name": f"name_{rng.randrange(1000)}"}
+    if depth > 1:
+        nested["child"] = _nested_dict(rng, depth - 1)
+    return nested
+
+
+class SyntheticReader(Reader):
+    def __init__(self, n_records, width=20, nesting=0, n_date_columns=1, n_streams=1, seed=0):
+        self.n_records = n_records
+        self.width = width
+        self.nesting = nesting
+        self.n_date_columns = n_date_columns
+        self.n_streams = n_streams
+        self.seed = seed
+
+    def read(self):
+        for i in range(self.n_streams):
+            records = synthetic_records(self.n_records, self.width, self.nesting, self.n_date_columns, self.seed + i)
+            yield JSONStream(f"synthetic_{i}", records)
+
+
+class NullWriter(Writer):
+    """
+    Writer reading streams as files and discarding their content, only counting bytes.
+    """
+
+    def __init__(self):
+        self.bytes_written = 0
+
+    def write(self, stream):
+        file = stream.as_file()
+        buffer = file.read(NULL_WRITER_READ_SIZE)
+        while buffer:
+            self.bytes_written += len(buffer)
+            buffer = file.read(NULL_WRITER_READ_SIZE)
@@ -0,0 +1,297 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Opt-in cache of API responses on disk, so that rerunning a job (e.g. after a writer
+failed) replays the responses of the previous run instead of calling the API again.
+Requests are keyed by a hash of their connector, method, URL (with sorted parameters)
+and body, which includes the date window of the report.
+Connectors opt in through a pooled session created with cached=True (see
+ack.clients.api.session), mount_response_cache() for sessions of SDKs, or CachingHttp
+for googleapiclient. Requests sent in an uncached() block (e.g. checking the status of
+a job) always reach the API. Rate limiters should only be fed by requests that reach
+the API (see api_requests()), so that replayed responses are not throttled.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ack.clients.api.config import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Credentials can change between runs without changing the response
+UNCACHED_PARAMS = ("access_token", "accessToken", "appsecret_proof")
+# Headers of the received response that no longer apply to its decoded body
+DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class ResponseCache:
+    """
+    Responses stored in directory, in files named by the hash of their request. Entries
+    expire ttl seconds after they were stored, and the least recently used entries are
+    removed once all the entries take more than max_bytes.
+    """
+
+    def __init__(self, directory, ttl=RESPONSE_CACHE_TTL, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, namespace, method, url, body=None):
+        scheme, netloc, path, query, _ = urlsplit(url)
+        params = [(name, value) for name, value in parse_qsl(query, keep_blank_values=True) if name not in UNCACHED_PARAMS]
+        url = urlunsplit((scheme, netloc, path, urlencode(sorted(params)), ""))
+        request = json.dumps([namespace, method.upper(), url, _normalize_body(body)])
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Status, headers and body of the response stored under key, if it has not expired.
+        """
+        path = self._path(key)
+        try:
+            stored = os.stat(path).st_mtime
+            if time.time() - stored > self.ttl:
+                return None
+            with open(path, "rb") as f:
+                metadata = json.loads(f.readline())
+                body = f.read()
+            # The access time of an entry orders entries for eviction
+            os.utime(path, (time.time(), stored))
+        except FileNotFoundError:
+            return None
+        return metadata["status"], metadata["headers"], body
+
+    def set(self, key, status, headers, body):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        headers = {name: value for name, value in headers.items() if name.lower() not in DROPPED_HEADERS}
+        with tempfile.NamedTemporaryFile("wb", dir=self.directory, suffix=".tmp", delete=False) as f:
+            f.write(json.dumps({"status": status, "headers": headers}).encode() + b"\n")
+            f.write(body)
+            size = f.tell()
+        os.replace(f.name, path)
+        with self._lock:
+            self._size = self._scan_size() if self._size is None else self._size + size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_dir():
+                yield from (file for file in os.scandir(entry.path) if file.is_file())
+
+    def _scan_size(self):
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self):
+        now = time.time()
+        entries = [(entry.path, entry.stat()) for entry in self._entries()]
+        # Expired entries first, then the least recently used ones
+        entries.sort(key=lambda entry: (now - entry[1].st_mtime <= self.ttl, entry[1].st_atime))
+        self._size = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if self._size <= self.max_bytes and now - stat.st_mtime <= self.ttl:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= stat.st_size
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    Adapter of a requests session replaying the responses stored in the response cache,
+    if it is enabled, and storing the successful responses it receives (reading them
+    whole, even if the request was streamed).
+    """
+
+    def __init__(self, namespace, **kwargs):
+        super().__init__(**kwargs)
+        self.namespace = namespace
+
+    def send(self, request, **kwargs):
+        cache = get_response_cache()
+        if cache is None:
+            _before_api_request()
+            return super().send(request, **kwargs)
+        key = cache.key(self.namespace, request.method, request.url, request.body)
+        entry = cache.get(key)
+        if entry is not None:
+            return self._build_cached_response(request, *entry)
+        _before_api_request()
+        response = super().send(request, **kwargs)
+        if 200 <= response.status_code < 300:
+            cache.set(key, response.status_code, dict(response.headers), response.content)
+        return response
+
+    def _build_cached_response(self, request, status, headers, body):
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+        return response
+
+
+class CachingHttp:
+    """
+    Wrapper of an httplib2.Http object (e.g. authorized by credentials, so that the
+    requests refreshing the credentials are never cached), to be given to googleapiclient.
+    """
+
+    def __init__(self, http, namespace):
+        self.http = http
+        self.namespace = namespace
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        cache = get_response_cache()
+        if cache is None:
+            _before_api_request()
+            return self.http.request(uri, method, body, headers, *args, **kwargs)
+        key = cache.key(self.namespace, method, uri, body)
+        entry = cache.get(key)
+        if entry is not None:
+            import httplib2
+
+            status, headers, content = entry
+            return httplib2.Response({**headers, "status": str(status)}), content
+        _before_api_request()
+        response, content = self.http.request(uri, method, body, headers, *args, **kwargs)
+        if 200 <= response.status < 300:
+            cache.set(key, response.status, dict(response), content)
+        return response, content
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+
+def mount_response_cache(session, namespace, **kwargs):
+    """
+    Mount a CachingHTTPAdapter (created with kwargs) on a requests session, e.g. the
+    session of an SDK.
+    """
+    adapter = CachingHTTPAdapter(namespace, **kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_response_cache = None
+_local = threading.local()
+
+
+def configure_response_cache(
+    response_cache_dir=None, response_cache_ttl=RESPONSE_CACHE_TTL, response_cache_max_bytes=RESPONSE_CACHE_MAX_BYTES
+):
+    """
+    Enable the response cache of the process if a directory is provided (see the options
+    of the entrypoints), or disable it.
+    """
+    global _response_cache
+    _response_cache = None
+    if response_cache_dir:
+        _response_cache = ResponseCache(response_cache_dir, response_cache_ttl, response_cache_max_bytes)
+
+
+def get_response_cache():
+    """
+    Response cache of the process, unless disabled or called in an uncached() block.
+    """
+    return None if getattr(_local, "uncached", False) else _response_cache
+
+
+@contextmanager
+def uncached():
+    """
+    Send the requests of the block (by the current thread) to the API.
+    """
+    previous = getattr(_local, "uncached", False)
+    _local.uncached = True
+    try:
+        yield
+    finally:
+        _local.uncached = previous
+
+
+class ApiRequests:
+    """
+    Requests of an api_requests() block that reached the API.
+    """
+
+    def __init__(self, before=None):
+        self.before = before
+        self.count = 0
+
+
+@contextmanager
+def api_requests(before=None):
+    """
+    Count the requests of the block (sent by the current thread through a caching session)
+    that reach the API, i.e. that are not replayed from the response cache, calling before()
+    ahead of each of them (e.g. to acquire a rate limiter).
+    """
+    previous = getattr(_local, "api_requests", None)
+    _local.api_requests = requests = ApiRequests(before)
+    try:
+        yield requests
+    finally:
+        _local.api_requests = previous
+
+
+def _before_api_request():
+    requests = getattr(_local, "api_requests", None)
+    if requests is not None:
+        if requests.before is not None:
+            requests.before()
+        requests.count += 1
+
+
+def _normalize_body(body):
+    """
+    Body of a request as a string, JSON bodies being re-encoded with sorted keys.
+    """
+    if not body:
+        return None
+    if not isinstance(body, bytes):
+        body = body.encode() if isinstance(body, str) else repr(body).encode()
+    try:
+        return json.dumps(json.loads(body), sort_keys=True)
+    except ValueError:
+        return hashlib.sha256(body).hexdigest()
@@ -0,0 +1,78 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Pooled HTTP sessions: connectors send their requests through the session returned by
+get_session(), so that connections to an API are kept alive and reused from page to
+page (instead of a new TCP and TLS handshake per request), by every thread of a process.
+"""
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from ack.clients.api.cache import CachingHTTPAdapter
+from ack.clients.api.stats import HTTP_STATS
+from requests.adapters import HTTPAdapter
+
+HTTP_POOL_SIZE = 10
+# Seconds to connect, and to wait for the server between two bytes of a response
+HTTP_TIMEOUT = (10, 300)
+
+
+class PooledSession(requests.Session):
+    """
+    Session keeping up to pool_size connections alive per host, so that as many threads
+    can use it concurrently, and sending requests without a timeout with the default one.
+    As with requests.get(), cookies are not persisted between requests, and responses are
+    compressed if the server supports it (gzip or deflate, decoded by requests).
+    Responses are counted in HTTP_STATS, and passed to the given response hooks.
+    If a cache_namespace is given, responses are cached under it when the response cache
+    is enabled.
+    """
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT, hooks=(), cache_namespace=None):
+        super().__init__()
+        self.timeout = timeout
+        if cache_namespace:
+            adapter = CachingHTTPAdapter(cache_namespace, pool_connections=pool_size, pool_maxsize=pool_size)
+        else:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.hooks["response"] = [HTTP_STATS.observe, *hooks]
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, **kwargs)
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(name="default", cached=False, **kwargs):
+    """
+    Session registered under name (e.g. the name of a connector), created with kwargs
+    (see PooledSession) on first use, so that the readers of a process share its pool.
+    If cached, its responses are cached under name when the response cache is enabled.
+    """
+    with _sessions_lock:
+        if name not in _sessions:
+            _sessions[name] = PooledSession(cache_namespace=name if cached else None, **kwargs)
+        return _sessions[name]
@@ -0,0 +1,56 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Counters of the HTTP requests sent by connectors, kept apart from ack.clients.api.session
+so that the run metrics can report them without importing requests.
+"""
+import threading
+
+HTTP_COUNTERS = ("requests", "errors", "cache_hits")
+
+
+class HttpStats:
+    """
+    Counters of the responses received by the pooled sessions of a process, and time
+    spent waiting for them (until their headers were received). Responses replayed from
+    the response cache (see ack.clients.api.cache) are only counted as cache hits.
+    """
+
+    def __init__(self):
+        self._counters = dict.fromkeys(HTTP_COUNTERS, 0)
+        self._seconds = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, response, *args, **kwargs):
+        """
+        Response hook of the pooled sessions.
+        """
+        with self._lock:
+            if getattr(response, "from_cache", False):
+                self._counters["cache_hits"] += 1
+                return
+            self._counters["requests"] += 1
+            self._counters["errors"] += response.status_code >= 400
+            self._seconds += response.elapsed.total_seconds()
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "seconds": self._seconds}
+
+
+HTTP_STATS = HttpStats()
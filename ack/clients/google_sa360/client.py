@@ -17,6 +17,7 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 from ack.config import logger
+from ack.utils.download import iter_response_lines
 import httplib2
 import requests
 
@@ -115,7 +116,7 @@ class GoogleSA360Client:
         headers.update({"Authorization": self.auth})
         r = requests.get(request.uri, stream=True, headers=headers)
 
-        yield from r.iter_lines()
+        yield from iter_response_lines(r)
 
     def direct_report_download(self, report_id, file_id):
         # Retrieve the file metadata.
@@ -18,7 +18,7 @@
 
 import urllib
 
-import requests
+from ack.clients.api.session import get_session
 from ack.config import logger
 from ack.readers.salesforce.config import (
     SALESFORCE_DESCRIBE_ENDPOINT,
@@ -30,6 +30,7 @@ from ack.readers.salesforce.config import (
 
 class SalesforceClient:
     def __init__(self, user, password, consumer_key, consumer_secret):
+        self._session = get_session("salesforce")
         self._user = user
         self._password = password
         self._consumer_key = consumer_key
@@ -64,7 +65,7 @@ class SalesforceClient:
     def _load_access_info(self):
         logger.info("Retrieving Salesforce access token")
 
-        res = requests.post(SALESFORCE_LOGIN_ENDPOINT, params=self._get_login_params())
+        res = self._session.post(SALESFORCE_LOGIN_ENDPOINT, params=self._get_login_params())
 
         res.raise_for_status()
 
@@ -86,7 +87,7 @@ class SalesforceClient:
     def _request_data(self, path, params=None):
 
         endpoint = urllib.parse.urljoin(self.instance_url, path)
-        response = requests.get(endpoint, headers=self.headers, params=params, timeout=30)
+        response = self._session.get(endpoint, headers=self.headers, params=params, timeout=30)
 
         response.raise_for_status()
 
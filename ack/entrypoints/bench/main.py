@@ -0,0 +1,71 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import click
+
+from ack.benchmarks.suite import BENCHMARKS, compare_results, read_results, run_suite, write_results
+
+
+@click.command(name="bench")
+@click.option(
+    "--benchmark",
+    "benchmarks",
+    multiple=True,
+    help="(Optional) Benchmark to run. Can be given several times. All benchmarks are run by default.",
+    type=click.Choice(sorted(BENCHMARKS)),
+)
+@click.option("--n-records", default=100000, help="Number of synthetic records per run.", type=click.IntRange(min=1))
+@click.option("--width", default=20, help="Number of flat columns of synthetic records.", type=click.IntRange(min=1))
+@click.option("--nesting", default=0, help="Depth of the nested column of synthetic records.", type=click.IntRange(min=0))
+@click.option("--date-columns", default=1, help="Number of date columns of synthetic records.", type=click.IntRange(min=0))
+@click.option("--seed", default=0, help="Seed of the synthetic record generator.", type=int)
+@click.option(
+    "--repeat",
+    default=5,
+    help="Number of runs of each benchmark, the best one being kept.",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--output",
+    default=None,
+    help="(Optional) Path of the JSON file results are written to.",
+    type=click.Path(dir_okay=False),
+)
+@click.option(
+    "--compare",
+    default=None,
+    help="(Optional) Path of the JSON results of a previous run, to compare throughputs with.",
+    type=click.Path(exists=True, dir_okay=False),
+)
+def bench(benchmarks, n_records, width, nesting, date_columns, seed, repeat, output, compare):
+    results = run_suite(
+        list(benchmarks), repeat, n_records=n_records, width=width, nesting=nesting, n_date_columns=date_columns, seed=seed,
+    )
+    ratios = compare_results(results, read_results(compare)) if compare else {}
+
+    for name, result in results["benchmarks"].items():
+        line = f"{name:<24}{result['records_per_second']:>14,.0f} records/s{result['megabytes_per_second']:>10.1f} MB/s"
+        if name in ratios:
+            line += f"  (x{ratios[name]:.2f})"
+        click.echo(line)
+
+    if output:
+        write_results(results, output)
+
+
+if __name__ == "__main__":
+    bench()
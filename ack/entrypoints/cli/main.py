@@ -17,45 +17,113 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 import click
 
+from ack.clients.api.config import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_OPTIONS, RESPONSE_CACHE_TTL
+from ack.streams.compression import COMPRESSIONS
+from ack.utils.pipeline import OUTPUT_FORMATS, process_streams
+from ack.utils.registry import LazyGroup
 from ack.writers.writer import Writer
 from ack.entrypoints.cli.writers import writers
 from ack.readers.reader import Reader
 from ack.entrypoints.cli.readers import readers
-from ack.streams.json_stream import JSONStream
-from ack.streams.normalized_json_stream import NormalizedJSONStream
 
 
-@click.group(chain=True)
+@click.group(chain=True, cls=LazyGroup, lazy_commands={**readers, **writers})
 @click.option(
     "--normalize-keys",
     default=False,
     help="(Optional) If set to true, will normalize output keys, removing white spaces and special characters.",
     type=bool,
 )
-def cli(normalize_keys):
+@click.option(
+    "--max-concurrent-streams",
+    default=1,
+    help="(Optional) Maximum number of streams yielded by the reader that can be written at the same time.",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--compression",
+    default=None,
+    help="(Optional) Compression of output files. The file extension and content encoding are set accordingly.",
+    type=click.Choice(COMPRESSIONS),
+)
+@click.option(
+    "--output-format",
+    default="njson",
+    help="(Optional) Format of output files: newline-delimited JSON, or CSV with a single header line.",
+    type=click.Choice(OUTPUT_FORMATS),
+)
+@click.option(
+    "--max-part-bytes",
+    default=None,
+    help="(Optional) If set, each stream is split into files of at most about this number of bytes (after compression).",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--max-part-rows",
+    default=None,
+    help="(Optional) If set, each stream is split into files of at most this number of records.",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--metrics-file",
+    default=None,
+    help="(Optional) Path of a JSON file the run summary (records, bytes, timings and peak memory) is written to.",
+    type=click.Path(dir_okay=False, writable=True),
+)
+@click.option(
+    "--prometheus-file",
+    default=None,
+    help="(Optional) Path of a Prometheus textfile the run metrics are written to.",
+    type=click.Path(dir_okay=False, writable=True),
+)
+@click.option(
+    "--profile",
+    default=None,
+    help="(Optional) Directory the cProfile stats of the reader and of each stream write are written to.",
+    type=click.Path(file_okay=False, writable=True),
+)
+@click.option(
+    "--prefetch-records",
+    default=None,
+    help="(Optional) If set, records of each stream are fetched ahead on a background thread, buffering at most this "
+    "number of records, so that reader API calls run while writers upload.",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "--response-cache-dir",
+    default=None,
+    help="(Optional) Directory API responses are cached in, so that a rerun replays them instead of calling the API "
+    "again (for the connectors supporting it).",
+    type=click.Path(file_okay=False, writable=True),
+)
+@click.option(
+    "--response-cache-ttl",
+    default=RESPONSE_CACHE_TTL,
+    help="(Optional) Number of seconds after which a cached API response expires.",
+    type=click.IntRange(min=0),
+)
+@click.option(
+    "--response-cache-max-bytes",
+    default=RESPONSE_CACHE_MAX_BYTES,
+    help="(Optional) Size of the response cache above which the least recently used responses are removed.",
+    type=click.IntRange(min=1),
+)
+def cli(**kwargs):
     pass
 
 
-def build_commands(cli, available_commands):
-    for cmd in available_commands:
-        cli.add_command(cmd)
-
-
 @cli.resultcallback()
-def process_command_pipeline(provided_commands, normalize_keys):
+def process_command_pipeline(provided_commands, **options):
+    from ack.clients.api.cache import configure_response_cache
+
+    configure_response_cache(**{key: options.pop(key) for key in RESPONSE_CACHE_OPTIONS})
     cmd_instances = [cmd() for cmd in provided_commands]
     provided_readers = list(filter(lambda o: isinstance(o, Reader), cmd_instances))
     provided_writers = list(filter(lambda o: isinstance(o, Writer), cmd_instances))
 
     _validate_provided_commands(provided_readers, provided_writers)
 
-    reader = provided_readers[0]
-    for stream in reader.read():
-        for writer in provided_writers:
-            if normalize_keys and issubclass(stream.__class__, JSONStream):
-                writer.write(NormalizedJSONStream.create_from_stream(stream))
-            else:
-                writer.write(stream)
+    process_streams(provided_readers[0], provided_writers, **options)
 
 
 def _validate_provided_commands(provided_readers, provided_writers):
@@ -68,6 +136,4 @@ def _validate_provided_commands(provided_readers, provided_writers):
 
 
 if __name__ == "__main__":
-    available_commands = readers + writers
-    build_commands(cli, available_commands)
     cli()
@@ -15,55 +15,31 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
-from ack.readers.adobe_analytics_1_4.cli import adobe_analytics_1_4
-from ack.readers.adobe_analytics_2_0.cli import adobe_analytics_2_0
-from ack.readers.amazon_s3.cli import amazon_s3
-from ack.readers.awin_advertiser.cli import awin_advertiser
-from ack.readers.confluence.cli import confluence
-from ack.readers.facebook.cli import facebook
-from ack.readers.google_ads.cli import google_ads
-from ack.readers.google_analytics.cli import google_analytics
-from ack.readers.google_cloud_storage.cli import google_cloud_storage
-from ack.readers.google_dbm.cli import google_dbm
-from ack.readers.google_dcm.cli import google_dcm
-from ack.readers.google_dv360.cli import google_dv360
-from ack.readers.google_sa360.cli import google_sa360
-from ack.readers.google_search_console.cli import google_search_console
-from ack.readers.google_sheets.cli import google_sheets
-from ack.readers.google_sheets_old.cli import google_sheets_old
-from ack.readers.mysql.cli import mysql
-from ack.readers.mytarget.cli import mytarget
-from ack.readers.radarly.cli import radarly
-from ack.readers.salesforce.cli import salesforce
-from ack.readers.the_trade_desk.cli import the_trade_desk
-from ack.readers.twitter.cli import twitter
-from ack.readers.yandex_campaign.cli import yandex_campaigns
-from ack.readers.yandex_statistics.cli import yandex_statistics
-
-
-readers = [
-    adobe_analytics_1_4,
-    adobe_analytics_2_0,
-    amazon_s3,
-    awin_advertiser,
-    confluence,
-    facebook,
-    google_ads,
-    google_analytics,
-    google_cloud_storage,
-    google_dbm,
-    google_dcm,
-    google_dv360,
-    google_sa360,
-    google_search_console,
-    google_sheets,
-    google_sheets_old,
-    mysql,
-    mytarget,
-    radarly,
-    salesforce,
-    the_trade_desk,
-    twitter,
-    yandex_campaigns,
-    yandex_statistics,
-]
+# Click commands of readers, by command name. Modules are only imported when the
+# command is invoked (see ack.utils.registry.LazyGroup).
+readers = {
+    "read_adobe": "ack.readers.adobe_analytics_1_4.cli:adobe_analytics_1_4",
+    "read_adobe_2_0": "ack.readers.adobe_analytics_2_0.cli:adobe_analytics_2_0",
+    "read_s3": "ack.readers.amazon_s3.cli:amazon_s3",
+    "read_awin": "ack.readers.awin_advertiser.cli:awin_advertiser",
+    "read_confluence": "ack.readers.confluence.cli:confluence",
+    "read_facebook": "ack.readers.facebook.cli:facebook",
+    "read_googleads": "ack.readers.google_ads.cli:google_ads",
+    "read_ga": "ack.readers.google_analytics.cli:google_analytics",
+    "read_gcs": "ack.readers.google_cloud_storage.cli:google_cloud_storage",
+    "read_dbm": "ack.readers.google_dbm.cli:google_dbm",
+    "read_dcm": "ack.readers.google_dcm.cli:google_dcm",
+    "read_dv360": "ack.readers.google_dv360.cli:google_dv360",
+    "read_sa360": "ack.readers.google_sa360.cli:google_sa360",
+    "read_search_console": "ack.readers.google_search_console.cli:google_search_console",
+    "read_gs": "ack.readers.google_sheets.cli:google_sheets",
+    "read_gsheets": "ack.readers.google_sheets_old.cli:google_sheets_old",
+    "read_mysql": "ack.readers.mysql.cli:mysql",
+    "read_mytarget": "ack.readers.mytarget.cli:mytarget",
+    "read_radarly": "ack.readers.radarly.cli:radarly",
+    "read_salesforce": "ack.readers.salesforce.cli:salesforce",
+    "read_ttd": "ack.readers.the_trade_desk.cli:the_trade_desk",
+    "read_twitter": "ack.readers.twitter.cli:twitter",
+    "read_yandex_campaigns": "ack.readers.yandex_campaign.cli:yandex_campaigns",
+    "read_yandex_statistics": "ack.readers.yandex_statistics.cli:yandex_statistics",
+}
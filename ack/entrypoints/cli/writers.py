@@ -15,11 +15,13 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
-from ack.writers.amazon_s3.cli import amazon_s3
-from ack.writers.azure_blob_storage.cli import azure_blob_storage
-from ack.writers.console.cli import console
-from ack.writers.google_bigquery.cli import google_bigquery
-from ack.writers.google_cloud_storage.cli import google_cloud_storage
-from ack.writers.local.cli import local
-
-writers = [amazon_s3, console, google_bigquery, google_cloud_storage, local, azure_blob_storage]
+# Click commands of writers, by command name. Modules are only imported when the
+# command is invoked (see ack.utils.registry.LazyGroup).
+writers = {
+    "write_s3": "ack.writers.amazon_s3.cli:amazon_s3",
+    "write_console": "ack.writers.console.cli:console",
+    "write_bq": "ack.writers.google_bigquery.cli:google_bigquery",
+    "write_gcs": "ack.writers.google_cloud_storage.cli:google_cloud_storage",
+    "write_local": "ack.writers.local.cli:local",
+    "write_azure_blob": "ack.writers.azure_blob_storage.cli:azure_blob_storage",
+}
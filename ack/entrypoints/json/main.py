@@ -15,12 +15,22 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import os
+from functools import partial
+
 import click
 
-from ack.streams.json_stream import JSONStream
-from ack.streams.normalized_json_stream import NormalizedJSONStream
+from ack.clients.api.config import RESPONSE_CACHE_OPTIONS
+from ack.entrypoints.json.readers import readers_global_client_credentials
 from ack.utils.file_reader import read_json
 from ack.utils.formatter import format_reader, format_writers
+from ack.utils.metrics import report_jobs
+from ack.utils.pipeline import PIPELINE_OPTIONS, process_streams
+from ack.utils.scheduler import Job, log_job_results, run_jobs
+
+
+# Written once for all the jobs of a multi-job config, when set at its root
+JOBS_REPORT_OPTIONS = ("metrics_file", "prometheus_file")
 
 
 @click.command()
@@ -29,18 +39,77 @@ from ack.utils.formatter import format_reader, format_writers
 )
 def read_and_write(config_file):
     data = read_json(config_file)
-    if "normalize_keys" not in data.keys():
-        data["normalize_keys"] = False
+    # The response cache is shared by the jobs of a multi-job config
+    cache_options = {key: data[key] for key in RESPONSE_CACHE_OPTIONS if key in data}
+    if cache_options:
+        from ack.clients.api.cache import configure_response_cache
+
+        configure_response_cache(**cache_options)
+
+    if "jobs" in data:
+        run_config_jobs(data)
+        return
 
     reader = format_reader(data["reader"])
     writers = format_writers(data["writers"])
+    options = {key: data[key] for key in PIPELINE_OPTIONS if key in data}
+
+    process_streams(reader, writers, **options)
+
+
+def run_config_jobs(data):
+    """
+    Run the jobs of a multi-job config, and fail if any of them failed.
+    """
+    max_concurrent_jobs = data.get("max_concurrent_jobs", 1)
+    connector_limits = data.get("max_concurrent_jobs_per_connector", {})
+    if max_concurrent_jobs < 1 or any(limit < 1 for limit in connector_limits.values()):
+        raise click.BadParameter("Maximum numbers of concurrent jobs must be greater than 0")
+
+    job_summaries = {}
+    results = run_jobs(build_jobs(data, job_summaries), max_concurrent_jobs, connector_limits)
+    report_jobs(
+        {result.name: job_summaries[result.name] for result in results if result.name in job_summaries},
+        data.get("metrics_file"),
+        data.get("prometheus_file"),
+    )
+    n_failed = log_job_results(results)
+    if n_failed:
+        raise click.ClickException(f"{n_failed} of {len(results)} jobs failed")
+
+
+def build_jobs(data, job_summaries=None):
+    """
+    Build the jobs of a multi-job config. Pipeline options set at the root of the
+    config apply to every job, unless overridden by the job. Writers with the same
+    config are shared by jobs, while readers are only built when their job starts.
+    The run summaries of jobs are collected in job_summaries ({job name: summary}),
+    so that the metrics files set at the root of the config are written once for all
+    jobs, and a root profile directory gets a subdirectory per job.
+    """
+    default_options = {key: data[key] for key in PIPELINE_OPTIONS if key in data and key not in JOBS_REPORT_OPTIONS}
+    writer_instances = {}
+    jobs = []
+    for index, job in enumerate(data["jobs"], start=1):
+        reader_name = job["reader"]["name"]
+        connectors = [reader_name] + [writer["name"] for writer in job["writers"]]
+        global_clients = {}
+        if reader_name in readers_global_client_credentials:
+            credentials = tuple(job["reader"].get(field) for field in readers_global_client_credentials[reader_name])
+            global_clients[reader_name] = credentials
+        name = job.get("name", f"{index}_{reader_name}")
+        options = {**default_options, **{key: job[key] for key in PIPELINE_OPTIONS if key in job}}
+        if "profile" in default_options and "profile" not in job:
+            options["profile"] = os.path.join(default_options["profile"], name)
+        writers = format_writers(job["writers"], writer_instances)
+        on_summary = partial(job_summaries.__setitem__, name) if job_summaries is not None else None
+        run = partial(run_job, job["reader"], writers, options, on_summary=on_summary)
+        jobs.append(Job(name, run, connectors, global_clients))
+    return jobs
+
 
-    for stream in reader.read():
-        for writer in writers:
-            if data["normalize_keys"] and issubclass(stream.__class__, JSONStream):
-                writer.write(NormalizedJSONStream.create_from_stream(stream))
-            else:
-                writer.write(stream)
+def run_job(reader_config, writers, options, on_summary=None):
+    process_streams(format_reader(reader_config), writers, on_summary=on_summary, **options)
 
 
 if __name__ == "__main__":
@@ -15,79 +15,87 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
-from ack.readers.adobe_analytics_1_4.config import AdobeAnalytics14ReaderConfig
-from ack.readers.adobe_analytics_2_0.config import AdobeAnalytics20ReaderConfig
-from ack.readers.amazon_s3.config import AmazonS3ReaderConfig
-from ack.readers.awin_advertiser.config import AwinAdvertiserReaderConfig
-from ack.readers.confluence.config import ConfluenceReaderConfig
-from ack.readers.facebook.config import FacebookReaderConfig
-from ack.readers.google_ads.config import GoogleAdsReaderConfig
-from ack.readers.google_analytics.config import GoogleAnalyticsReaderConfig
-from ack.readers.google_cloud_storage.config import GoogleCloudStorageReaderConfig
-from ack.readers.google_dbm.config import GoogleDBMReaderConfig
-from ack.readers.google_dcm.config import GoogleDCMReaderConfig
-from ack.readers.google_dv360.config import GoogleDV360ReaderConfig
-from ack.readers.google_sa360.config import GoogleSA360ReaderConfig
-from ack.readers.google_search_console.config import GoogleSearchConsoleReaderConfig
-from ack.readers.google_sheets.config import GoogleSheetsReaderConfig
-from ack.readers.google_sheets_old.config import GoogleSheetsReaderOldConfig
-from ack.readers.mysql.config import MySQLReaderConfig
-from ack.readers.mytarget.config import MyTargetReaderConfig
-from ack.readers.radarly.config import RadarlyReaderConfig
-from ack.readers.adobe_analytics_1_4.reader import AdobeAnalytics14Reader
-from ack.readers.adobe_analytics_2_0.reader import AdobeAnalytics20Reader
-from ack.readers.amazon_s3.reader import AmazonS3Reader
-from ack.readers.awin_advertiser.reader import AwinAdvertiserReader
-from ack.readers.confluence.reader import ConfluenceReader
-from ack.readers.facebook.reader import FacebookReader
-from ack.readers.google_ads.reader import GoogleAdsReader
-from ack.readers.google_analytics.reader import GoogleAnalyticsReader
-from ack.readers.google_cloud_storage.reader import GoogleCloudStorageReader
-from ack.readers.google_dbm.reader import GoogleDBMReader
-from ack.readers.google_dcm.reader import GoogleDCMReader
-from ack.readers.google_dv360.reader import GoogleDV360Reader
-from ack.readers.google_sa360.reader import GoogleSA360Reader
-from ack.readers.google_search_console.reader import GoogleSearchConsoleReader
-from ack.readers.google_sheets.reader import GoogleSheetsReader
-from ack.readers.google_sheets_old.reader import GoogleSheetsReaderOld
-from ack.readers.mysql.reader import MySQLReader
-from ack.readers.mytarget.reader import MyTargetReader
-from ack.readers.radarly.reader import RadarlyReader
-from ack.readers.salesforce.config import SalesforceReaderConfig
-from ack.readers.salesforce.reader import SalesforceReader
-from ack.readers.the_trade_desk.config import TheTradeDeskReaderConfig
-from ack.readers.the_trade_desk.reader import TheTradeDeskReader
-from ack.readers.twitter.config import TwitterReaderConfig
-from ack.readers.twitter.reader import TwitterReader
-from ack.readers.yandex_campaign.config import YandexCampaignReaderConfig
-from ack.readers.yandex_campaign.reader import YandexCampaignReader
-from ack.readers.yandex_statistics.config import YandexStatisticsReaderConfig
-from ack.readers.yandex_statistics.reader import YandexStatisticsReader
+from ack.utils.registry import LazyRegistry
 
+# Reader and config classes of readers, by reader name. Modules are only imported
+# when a reader is accessed.
+readers_classes = LazyRegistry(
+    {
+        "adobe_analytics_1_4": (
+            "ack.readers.adobe_analytics_1_4.reader:AdobeAnalytics14Reader",
+            "ack.readers.adobe_analytics_1_4.config:AdobeAnalytics14ReaderConfig",
+        ),
+        "adobe_analytics_2_0": (
+            "ack.readers.adobe_analytics_2_0.reader:AdobeAnalytics20Reader",
+            "ack.readers.adobe_analytics_2_0.config:AdobeAnalytics20ReaderConfig",
+        ),
+        "amazon_s3": ("ack.readers.amazon_s3.reader:AmazonS3Reader", "ack.readers.amazon_s3.config:AmazonS3ReaderConfig"),
+        "awin": (
+            "ack.readers.awin_advertiser.reader:AwinAdvertiserReader",
+            "ack.readers.awin_advertiser.config:AwinAdvertiserReaderConfig",
+        ),
+        "confluence": (
+            "ack.readers.confluence.reader:ConfluenceReader",
+            "ack.readers.confluence.config:ConfluenceReaderConfig",
+        ),
+        "facebook": ("ack.readers.facebook.reader:FacebookReader", "ack.readers.facebook.config:FacebookReaderConfig"),
+        "google_ads": ("ack.readers.google_ads.reader:GoogleAdsReader", "ack.readers.google_ads.config:GoogleAdsReaderConfig"),
+        "google_analytics": (
+            "ack.readers.google_analytics.reader:GoogleAnalyticsReader",
+            "ack.readers.google_analytics.config:GoogleAnalyticsReaderConfig",
+        ),
+        "google_cloud_storage": (
+            "ack.readers.google_cloud_storage.reader:GoogleCloudStorageReader",
+            "ack.readers.google_cloud_storage.config:GoogleCloudStorageReaderConfig",
+        ),
+        "google_dbm": ("ack.readers.google_dbm.reader:GoogleDBMReader", "ack.readers.google_dbm.config:GoogleDBMReaderConfig"),
+        "google_dcm": ("ack.readers.google_dcm.reader:GoogleDCMReader", "ack.readers.google_dcm.config:GoogleDCMReaderConfig"),
+        "google_dv360": (
+            "ack.readers.google_dv360.reader:GoogleDV360Reader",
+            "ack.readers.google_dv360.config:GoogleDV360ReaderConfig",
+        ),
+        "google_sa360": (
+            "ack.readers.google_sa360.reader:GoogleSA360Reader",
+            "ack.readers.google_sa360.config:GoogleSA360ReaderConfig",
+        ),
+        "google_search_console": (
+            "ack.readers.google_search_console.reader:GoogleSearchConsoleReader",
+            "ack.readers.google_search_console.config:GoogleSearchConsoleReaderConfig",
+        ),
+        "google_sheets": (
+            "ack.readers.google_sheets.reader:GoogleSheetsReader",
+            "ack.readers.google_sheets.config:GoogleSheetsReaderConfig",
+        ),
+        "google_sheets_old": (
+            "ack.readers.google_sheets_old.reader:GoogleSheetsReaderOld",
+            "ack.readers.google_sheets_old.config:GoogleSheetsReaderOldConfig",
+        ),
+        "mysql": ("ack.readers.mysql.reader:MySQLReader", "ack.readers.mysql.config:MySQLReaderConfig"),
+        "mytarget": ("ack.readers.mytarget.reader:MyTargetReader", "ack.readers.mytarget.config:MyTargetReaderConfig"),
+        "radarly": ("ack.readers.radarly.reader:RadarlyReader", "ack.readers.radarly.config:RadarlyReaderConfig"),
+        "salesforce": (
+            "ack.readers.salesforce.reader:SalesforceReader",
+            "ack.readers.salesforce.config:SalesforceReaderConfig",
+        ),
+        "the_trade_desk": (
+            "ack.readers.the_trade_desk.reader:TheTradeDeskReader",
+            "ack.readers.the_trade_desk.config:TheTradeDeskReaderConfig",
+        ),
+        "twitter": ("ack.readers.twitter.reader:TwitterReader", "ack.readers.twitter.config:TwitterReaderConfig"),
+        "yandex_campaign": (
+            "ack.readers.yandex_campaign.reader:YandexCampaignReader",
+            "ack.readers.yandex_campaign.config:YandexCampaignReaderConfig",
+        ),
+        "yandex_statistics": (
+            "ack.readers.yandex_statistics.reader:YandexStatisticsReader",
+            "ack.readers.yandex_statistics.config:YandexStatisticsReaderConfig",
+        ),
+    }
+)
 
-readers_classes = {
-    "adobe_analytics_1_4": (AdobeAnalytics14Reader, AdobeAnalytics14ReaderConfig),
-    "adobe_analytics_2_0": (AdobeAnalytics20Reader, AdobeAnalytics20ReaderConfig),
-    "amazon_s3": (AmazonS3Reader, AmazonS3ReaderConfig),
-    "awin": (AwinAdvertiserReader, AwinAdvertiserReaderConfig),
-    "confluence": (ConfluenceReader, ConfluenceReaderConfig),
-    "facebook": (FacebookReader, FacebookReaderConfig),
-    "google_ads": (GoogleAdsReader, GoogleAdsReaderConfig),
-    "google_analytics": (GoogleAnalyticsReader, GoogleAnalyticsReaderConfig),
-    "google_cloud_storage": (GoogleCloudStorageReader, GoogleCloudStorageReaderConfig),
-    "google_dbm": (GoogleDBMReader, GoogleDBMReaderConfig),
-    "google_dcm": (GoogleDCMReader, GoogleDCMReaderConfig),
-    "google_dv360": (GoogleDV360Reader, GoogleDV360ReaderConfig),
-    "google_sa360": (GoogleSA360Reader, GoogleSA360ReaderConfig),
-    "google_search_console": (GoogleSearchConsoleReader, GoogleSearchConsoleReaderConfig),
-    "google_sheets": (GoogleSheetsReader, GoogleSheetsReaderConfig),
-    "google_sheets_old": (GoogleSheetsReaderOld, GoogleSheetsReaderOldConfig),
-    "mysql": (MySQLReader, MySQLReaderConfig),
-    "mytarget": (MyTargetReader, MyTargetReaderConfig),
-    "radarly": (RadarlyReader, RadarlyReaderConfig),
-    "salesforce": (SalesforceReader, SalesforceReaderConfig),
-    "the_trade_desk": (TheTradeDeskReader, TheTradeDeskReaderConfig),
-    "twitter": (TwitterReader, TwitterReaderConfig),
-    "yandex_campaign": (YandexCampaignReader, YandexCampaignReaderConfig),
-    "yandex_statistics": (YandexStatisticsReader, YandexStatisticsReaderConfig),
+# Config fields of the credentials of readers using a process-wide API client:
+# jobs using such a reader with different credentials cannot run at the same time.
+readers_global_client_credentials = {
+    "facebook": ("app_id", "app_secret", "access_token"),
+    "radarly": ("client_id", "client_secret"),
 }
@@ -15,24 +15,26 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
-from ack.writers.amazon_s3.config import AmazonS3WriterConfig
-from ack.writers.azure_blob_storage.config import AzureBlobStorageWriterConfig
-from ack.writers.azure_blob_storage.writer import AzureBlobStorageWriter
-from ack.writers.google_bigquery.config import GoogleBigQueryWriterConfig
-from ack.writers.google_cloud_storage.config import GoogleCloudStorageWriterConfig
-from ack.writers.local.config import LocalWriterConfig
-from ack.writers.amazon_s3.writer import AmazonS3Writer
-from ack.writers.console.writer import ConsoleWriter
-from ack.writers.google_bigquery.writer import GoogleBigQueryWriter
-from ack.writers.google_cloud_storage.writer import GoogleCloudStorageWriter
-from ack.writers.local.writer import LocalWriter
+from ack.utils.registry import LazyRegistry
 
-
-writers_classes = {
-    "amazon_s3": (AmazonS3Writer, AmazonS3WriterConfig),
-    "console": (ConsoleWriter,),
-    "google_bigquery": (GoogleBigQueryWriter, GoogleBigQueryWriterConfig),
-    "google_cloud_storage": (GoogleCloudStorageWriter, GoogleCloudStorageWriterConfig),
-    "local": (LocalWriter, LocalWriterConfig),
-    "azure_blob_storage": (AzureBlobStorageWriter, AzureBlobStorageWriterConfig),
-}
+# Writer classes, and config classes of writers with arguments, by writer name.
+# Modules are only imported when a writer is accessed.
+writers_classes = LazyRegistry(
+    {
+        "amazon_s3": ("ack.writers.amazon_s3.writer:AmazonS3Writer", "ack.writers.amazon_s3.config:AmazonS3WriterConfig"),
+        "console": ("ack.writers.console.writer:ConsoleWriter",),
+        "google_bigquery": (
+            "ack.writers.google_bigquery.writer:GoogleBigQueryWriter",
+            "ack.writers.google_bigquery.config:GoogleBigQueryWriterConfig",
+        ),
+        "google_cloud_storage": (
+            "ack.writers.google_cloud_storage.writer:GoogleCloudStorageWriter",
+            "ack.writers.google_cloud_storage.config:GoogleCloudStorageWriterConfig",
+        ),
+        "local": ("ack.writers.local.writer:LocalWriter", "ack.writers.local.config:LocalWriterConfig"),
+        "azure_blob_storage": (
+            "ack.writers.azure_blob_storage.writer:AzureBlobStorageWriter",
+            "ack.writers.azure_blob_storage.config:AzureBlobStorageWriterConfig",
+        ),
+    }
+)
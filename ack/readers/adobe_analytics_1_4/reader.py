@@ -22,18 +22,18 @@
 import datetime
 import json
 from itertools import chain
-from time import sleep
 
-import requests
 from click import ClickException
 from ack.clients.adobe_analytics.client import AdobeAnalyticsClient
+from ack.clients.api.session import get_session
 from ack.config import logger
 from ack.readers.adobe_analytics_1_4.config import ADOBE_API_ENDPOINT, MAX_WAIT_REPORT_DELAY
 from ack.readers.adobe_analytics_1_4.helper import parse
 from ack.readers.reader import Reader
 from ack.streams.json_stream import JSONStream
 from ack.utils.date_handler import check_date_range_definition_conformity
-from ack.utils.exceptions import ReportDescriptionError, ReportNotReadyError
+from ack.utils.exceptions import ReportDescriptionError
+from ack.utils.poller import PENDING, poll_job
 from ack.utils.retry import retry
 
 
@@ -44,6 +44,7 @@ class AdobeAnalytics14Reader(Reader):
         self.adobe_client = AdobeAnalyticsClient(client_id, client_secret, tech_account_id, org_id, private_key)
         self.global_company_id = global_company_id
         self.kwargs = kwargs
+        self.session = get_session("adobe_analytics")
 
         check_date_range_definition_conformity(
             self.kwargs.get("start_date"), self.kwargs.get("end_date"), self.kwargs.get("day_range")
@@ -57,7 +58,7 @@ class AdobeAnalytics14Reader(Reader):
         api_method = f"{api}.{method}"
         data = data or dict()
         logger.info(f"{api}.{method} {data}")
-        response = requests.post(
+        response = self.session.post(
             ADOBE_API_ENDPOINT,
             params={"method": api_method},
             data=json.dumps(data),
@@ -142,19 +143,11 @@ class AdobeAnalytics14Reader(Reader):
         - Doc: https://github.com/AdobeDocs/analytics-1.4-apis/blob/master/docs/reporting-api/methods/r_Get.md
         """
 
-        def request_f():
-            return self.request(api="Report", method="Get", data={"reportID": report_id, "page": page_number},)
-
-        response = request_f()
-        idx = 1
-        while response.get("error") == "report_not_ready":
-            logger.info(f"waiting {idx} s for report to be ready")
-            sleep(idx + 1)
-            if idx + 1 > MAX_WAIT_REPORT_DELAY:
-                raise ReportNotReadyError("waited too long for report to be ready")
-            idx = idx * 2
-            response = request_f()
-        return response
+        def check_report():
+            response = self.request(api="Report", method="Get", data={"reportID": report_id, "page": page_number},)
+            return PENDING if response.get("error") == "report_not_ready" else response
+
+        return poll_job(check_report, name=f"Report {report_id}", min_interval=1, timeout=MAX_WAIT_REPORT_DELAY)
 
     def download_report(self, rep_id):
         """
@@ -17,12 +17,12 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 import json
-import time
 from datetime import timedelta
 from itertools import chain
 
-import requests
 from ack.clients.adobe_analytics.client import AdobeAnalyticsClient
+from ack.clients.api.cache import api_requests
+from ack.clients.api.session import get_session
 from ack.config import logger
 from ack.readers.adobe_analytics_2_0.config import API_REQUESTS_OVER_WINDOW_LIMIT, API_WINDOW_DURATION, DATEFORMAT
 from ack.readers.adobe_analytics_2_0.helper import (
@@ -35,6 +35,7 @@ from ack.readers.reader import Reader
 from ack.streams.json_stream import JSONStream
 from ack.utils.date_handler import build_date_range
 from ack.utils.exceptions import APIRateLimitError
+from ack.utils.rate_limit import SlidingWindowLimiter, shared_limiter
 from ack.utils.retry import retry
 
 
@@ -61,7 +62,11 @@ class AdobeAnalytics20Reader(Reader):
         self.metrics = list(metric)
         self.start_date, self.end_date = build_date_range(start_date, end_date, date_range)
         self.end_date = self.end_date + timedelta(days=1)
-        self.ingestion_tracker = []
+        self.rate_limiter = shared_limiter(
+            ("adobe_analytics_2_0", global_company_id),
+            lambda: SlidingWindowLimiter(API_REQUESTS_OVER_WINDOW_LIMIT, API_WINDOW_DURATION),
+        )
+        self.session = get_session("adobe_analytics_2_0", cached=True)
         self.node_values = {}
 
     def format_date_range(self):
@@ -93,15 +98,7 @@ class AdobeAnalytics20Reader(Reader):
         """
         Monitoring API rate limit (12 requests every 6 seconds).
         """
-
-        current_time = time.time()
-        self.ingestion_tracker.append(current_time)
-        window_ingestion_tracker = [t for t in self.ingestion_tracker if t >= (current_time - API_WINDOW_DURATION)]
-
-        if len(window_ingestion_tracker) >= API_REQUESTS_OVER_WINDOW_LIMIT:
-            sleep_time = window_ingestion_tracker[0] + API_WINDOW_DURATION - current_time
-            logger.warning(f"Throttling activated: sleeping for {sleep_time} seconds...")
-            time.sleep(sleep_time)
+        self.rate_limiter.acquire()
 
     @retry
     def get_report_page(self, rep_desc, page_nb=0):
@@ -109,14 +106,15 @@ class AdobeAnalytics20Reader(Reader):
         Getting a single report page, and returning it into a raw JSON format.
         """
 
-        self.throttle()
         rep_desc["settings"]["page"] = page_nb
 
-        response = requests.post(
-            f"https://analytics.adobe.io/api/{self.global_company_id}/reports",
-            headers=self.adobe_client.build_request_headers(self.global_company_id),
-            data=json.dumps(rep_desc),
-        ).json()
+        # Pages replayed from the response cache are not throttled
+        with api_requests(before=self.throttle):
+            response = self.session.post(
+                f"https://analytics.adobe.io/api/{self.global_company_id}/reports",
+                headers=self.adobe_client.build_request_headers(self.global_company_id),
+                data=json.dumps(rep_desc),
+            ).json()
 
         if response.get("message") == "Too many requests":
             raise APIRateLimitError("API rate limit was exceeded.")
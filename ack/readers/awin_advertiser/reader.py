@@ -16,7 +16,7 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-import requests
+from ack.clients.api.session import get_session
 from ack.config import logger
 from ack.readers.awin_advertiser.config import AWIN_API_ENDPOINT, DATEFORMAT, REPORT_TYPES
 from ack.readers.reader import Reader
@@ -28,6 +28,7 @@ class AwinAdvertiserReader(Reader):
     def __init__(
         self, auth_token, advertiser_id, report_type, region, campaign, timezone, interval, remove_tags, start_date, end_date
     ):
+        self.session = get_session("awin_advertiser")
         self.auth_token = auth_token
         self.advertiser_id = advertiser_id
         self.report_type = report_type
@@ -66,7 +67,7 @@ class AwinAdvertiserReader(Reader):
                 'accessToken': self.auth_token
             }
 
-        response = requests.get(
+        response = self.session.get(
             build_url, params=payload
         )
         json_response = response.json()
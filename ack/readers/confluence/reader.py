@@ -19,8 +19,8 @@
 import base64
 from itertools import chain
 
-import requests
 from click import ClickException
+from ack.clients.api.session import get_session
 from ack.readers.confluence.config import CONTENT_ENDPOINT, RECORDS_PER_PAGE
 from ack.readers.confluence.helper import CUSTOM_FIELDS, parse_response
 from ack.readers.reader import Reader
@@ -29,6 +29,7 @@ from ack.streams.json_stream import JSONStream
 
 class ConfluenceReader(Reader):
     def __init__(self, user_login, api_token, atlassian_domain, content_type, spacekey, field):
+        self.session = get_session("confluence")
         self.user_login = user_login
         self.api_token = api_token
         self._build_headers()
@@ -72,7 +73,7 @@ class ConfluenceReader(Reader):
             params["spaceKey"] = spacekey
 
         url = f"{self.atlassian_domain}/{CONTENT_ENDPOINT}"
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         if response.ok:
             return response.json()
         else:
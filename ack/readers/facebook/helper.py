@@ -16,11 +16,6 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-import json
-from time import sleep
-
-from ack.config import logger
-
 
 def get_action_breakdown_filters(field_path):
     """
@@ -179,20 +174,11 @@ def generate_batches(iterable, batch_size):
         yield batch
 
 
-def monitor_usage(response):
+def monitor_usage(response, rate_limiter):
     """
-    Extracts "X-Business-Use-Case-Usage" header from a FacebookResponse object.
-    If one of the 3 API usage rates (call_count, total_cputime, total_time)
-    is above 75%, puts the program to sleep for 5 minutes.
+    Extracts usage headers (e.g. "X-Business-Use-Case-Usage") from a FacebookResponse object,
+    and pauses the calls made through rate_limiter according to the highest usage rate
+    (call_count, total_cputime, total_time), or until the estimated time to regain access.
     Documentation: https://developers.facebook.com/docs/graph-api/overview/rate-limiting/
     """
-
-    for header in response._headers:
-        if header["name"] == "X-Business-Use-Case-Usage":
-            usage_header = json.loads(header["value"])
-            usage_header_values = list(usage_header.values())[0][0]
-            usage_rates = [v for k, v in usage_header_values.items() if k in ["call_count", "total_cputime", "total_time"]]
-
-    if max(usage_rates) > 75:
-        logger.info("75% rate limit reached. Sleeping for 5 minutes...")
-        sleep(300)
+    rate_limiter.update({header["name"]: header["value"] for header in response._headers or []})
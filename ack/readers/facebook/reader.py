@@ -24,6 +24,7 @@ from math import ceil
 from click import ClickException
 from facebook_business.adobjects.adreportrun import AdReportRun
 from facebook_business.api import FacebookAdsApi
+from ack.clients.api.cache import api_requests, mount_response_cache, uncached
 from ack.config import logger
 from ack.readers.facebook.config import (
     BATCH_SIZE_LIMIT,
@@ -38,6 +39,7 @@ from ack.readers.facebook.helper import generate_batches, get_action_breakdown_f
 from ack.readers.reader import Reader
 from ack.streams.json_stream import JSONStream
 from ack.utils.date_handler import check_date_range_definition_conformity
+from ack.utils.rate_limit import AdaptiveRateLimiter, shared_limiter
 from tenacity import retry, stop_after_attempt, stop_after_delay, wait_exponential, wait_none
 
 
@@ -65,6 +67,9 @@ class FacebookReader(Reader):
         self.app_secret = app_secret
         self.access_token = access_token
         self.api = FacebookAdsApi.init(self.app_id, self.app_secret, self.access_token)
+        # The SDK sends its requests through the requests session of its FacebookSession
+        mount_response_cache(self.api._session.requests, "facebook")
+        self.rate_limiter = shared_limiter(("facebook", self.app_id), AdaptiveRateLimiter)
 
         # Level inputs
         self.object_ids = object_id
@@ -225,7 +230,8 @@ class FacebookReader(Reader):
 
     @retry(wait=wait_exponential(multiplier=5, max=300), stop=stop_after_delay(2400))
     def _wait_for_100_percent_completion(self, async_job):
-        async_job.api_get()
+        with uncached():
+            async_job.api_get()
         percent_completion = async_job[AdReportRun.Field.async_percent_completion]
         status = async_job[AdReportRun.Field.async_status]
         logger.info(f"{status}: {percent_completion}%")
@@ -236,7 +242,8 @@ class FacebookReader(Reader):
 
     @retry(wait=wait_exponential(multiplier=10, max=60), stop=stop_after_delay(300))
     def _wait_for_complete_report(self, async_job):
-        async_job.api_get()
+        with uncached():
+            async_job.api_get()
         status = async_job[AdReportRun.Field.async_status]
         if status == "Job Running":
             raise Exception(status)
@@ -282,18 +289,23 @@ class FacebookReader(Reader):
             for obj in batch:
 
                 def callback_success(response):
-                    batch_responses.append(response.json())
-                    monitor_usage(response)
+                    batch_responses.append(response)
 
                 def callback_failure(response):
                     raise response.error()
 
                 obj.api_get(fields=fields, params=params, batch=api_batch, success=callback_success, failure=callback_failure)
 
-            # Execute batch
-            api_batch.execute()
+            # Execute batch, once usage rates allow it (unless it is replayed from the response cache)
+            with api_requests(before=self.rate_limiter.acquire) as sent_requests:
+                api_batch.execute()
 
-            yield from batch_responses
+            # The usage headers of a replayed batch are those of a previous run
+            if sent_requests.count:
+                for response in batch_responses:
+                    monitor_usage(response, self.rate_limiter)
+
+            yield from (response.json() for response in batch_responses)
 
     def format_and_yield(self, record):
         """
@@ -21,6 +21,7 @@ from datetime import datetime, timedelta
 import httplib2
 from click import ClickException
 from googleapiclient import discovery
+from ack.clients.api.cache import CachingHttp
 from ack.config import logger
 from ack.readers.google_analytics.config import DATEFORMAT, DISCOVERY_URI, GOOGLE_TOKEN_URI, PREFIX
 from ack.readers.reader import Reader
@@ -45,6 +46,7 @@ class GoogleAnalyticsReader(Reader):
 
         http = credentials.authorize(httplib2.Http())
         credentials.refresh(http)
+        http = CachingHttp(http, "google_analytics")
         self.client_v4 = discovery.build(
             "analytics", "v4", http=http, cache_discovery=False, discoveryServiceUrl=DISCOVERY_URI
         )
@@ -26,10 +26,12 @@ from ack.config import logger
 from ack.readers.google_dbm.config import GOOGLE_TOKEN_URI
 from ack.readers.reader import Reader
 from ack.streams.format_date_stream import FormatDateStream
+from ack.streams.record_batch import records_from_batches, skip_last_rows
 from ack.utils.date_handler import check_date_range_definition_conformity, get_date_start_and_date_stop_from_date_range
-from ack.utils.text import get_report_generator_from_flat_file, skip_last
+from ack.utils.download import iter_response_lines
+from ack.utils.poller import PENDING, poll_job
+from ack.utils.text import get_report_batches_from_flat_file, get_report_generator_from_flat_file
 from oauth2client import GOOGLE_REVOKE_URI, client
-from tenacity import retry, stop_after_delay, wait_exponential
 
 
 class GoogleDBMReader(Reader):
@@ -102,15 +104,17 @@ class GoogleDBMReader(Reader):
         query = self._client.queries().createquery(body=body_query).execute()
         return query
 
-    @retry(wait=wait_exponential(multiplier=1, min=60, max=3600), stop=stop_after_delay(36000))
     def _wait_for_query(self, query_id):
         logger.info(f"waiting for query of id : {query_id} to complete running")
+        return poll_job(lambda: self._check_query(query_id), name=f"Query {query_id}")
+
+    def _check_query(self, query_id):
         query_infos = self.get_query(query_id)
         if query_infos["metadata"]["running"] or (
             "googleCloudStoragePathForLatestReport" not in query_infos["metadata"]
             and "googleDrivePathForLatestReport" not in query_infos["metadata"]
         ):
-            raise Exception("Query still running.")
+            return PENDING
         else:
             return query_infos
 
@@ -133,6 +137,9 @@ class GoogleDBMReader(Reader):
         return url
 
     def get_query_report(self, existing_query=True):
+        return records_from_batches(self.get_query_report_batches(existing_query))
+
+    def get_query_report_batches(self, existing_query=True):
         url = self.get_query_report_url(existing_query)
         report = requests.get(url, stream=True)
         if self.kwargs["query_param_type"] == "TYPE_REACH_AND_FREQUENCY" and self.kwargs["add_date_to_report"]:
@@ -141,11 +148,13 @@ class GoogleDBMReader(Reader):
                 "date_start": start.strftime(self.kwargs.get("date_format")),
                 "date_stop": stop.strftime(self.kwargs.get("date_format")),
             }
-            report_gen = get_report_generator_from_flat_file(report.iter_lines(), add_column=True, column_dict=column_dict)
-            return skip_last(report_gen, 1)
+            report_batches = get_report_batches_from_flat_file(
+                iter_response_lines(report), add_column=True, column_dict=column_dict
+            )
+            return skip_last_rows(report_batches, 1)
         else:
-            report_gen = get_report_generator_from_flat_file(report.iter_lines())
-            return skip_last(report_gen, 1)
+            report_batches = get_report_batches_from_flat_file(iter_response_lines(report))
+            return skip_last_rows(report_batches, 1)
 
     def list_query_reports(self):
         reports_infos = self._client.reports().listreports(queryId=self.kwargs.get("query_id")).execute()
@@ -178,9 +187,9 @@ class GoogleDBMReader(Reader):
         elif request_type == "custom_query":
             data = [self.create_and_get_query()]
         elif request_type == "existing_query_report":
-            data = self.get_query_report(existing_query=True)
+            data = self.get_query_report_batches(existing_query=True)
         elif request_type == "custom_query_report":
-            data = self.get_query_report(existing_query=False)
+            data = self.get_query_report_batches(existing_query=False)
         elif request_type == "list_reports":
             data = self.list_query_reports()
         elif request_type == "lineitems_objects":
@@ -191,4 +200,7 @@ class GoogleDBMReader(Reader):
                 yield record
 
         # should replace results later by a good identifier
-        yield FormatDateStream("results", result_generator(), keys=["Date"], date_format=self.kwargs.get("date_format"))
+        if request_type in ("existing_query_report", "custom_query_report"):
+            yield FormatDateStream.from_batches("results", data, keys=["Date"], date_format=self.kwargs.get("date_format"))
+        else:
+            yield FormatDateStream("results", result_generator(), keys=["Date"], date_format=self.kwargs.get("date_format"))
@@ -28,11 +28,11 @@ from ack.readers.google_dv360.config import FILE_NAMES
 from ack.readers.reader import Reader
 from ack.streams.format_date_stream import FormatDateStream
 from ack.streams.json_stream import JSONStream
-from ack.utils.exceptions import RetryTimeoutError, SdfOperationError
+from ack.utils.exceptions import SdfOperationError
 from ack.utils.file_reader import sdf_to_njson_generator, unzip
+from ack.utils.poller import PENDING, poll_job
 from ack.utils.stdout_to_log import http_log, http_log_for_init
 from oauth2client import GOOGLE_REVOKE_URI, client
-from tenacity import retry, stop_after_delay, wait_exponential
 
 
 class GoogleDV360Reader(Reader):
@@ -76,9 +76,6 @@ class GoogleDV360Reader(Reader):
         """
         return [f"SDF-{FILE_NAMES[file_type]}" for file_type in self.kwargs.get("file_type")]
 
-    @retry(
-        wait=wait_exponential(multiplier=1, min=60, max=3600), stop=stop_after_delay(36000),
-    )
     def __wait_sdf_download_request(self, operation):
         """
         Wait for a sdf task to be completed. ie. (file ready for download)
@@ -88,11 +85,13 @@ class GoogleDV360Reader(Reader):
                 operation (dict): task metadata updated with resource location.
         """
         logger.info(f"waiting for SDF operation: {operation['name']} to complete running.")
-        get_request = self._client.sdfdownloadtasks().operations().get(name=operation["name"])
-        operation = get_request.execute()
-        if "done" not in operation:
-            raise RetryTimeoutError("The operation has taken more than 10 hours to complete.\n")
-        return operation
+
+        def check_operation():
+            get_request = self._client.sdfdownloadtasks().operations().get(name=operation["name"])
+            updated_operation = get_request.execute()
+            return updated_operation if "done" in updated_operation else PENDING
+
+        return poll_job(check_operation, name=f"SDF operation {operation['name']}")
 
     def __create_sdf_task(self, body):
         """
@@ -19,8 +19,9 @@
 from ack.clients.google_sa360.client import GoogleSA360Client
 from ack.readers.reader import Reader
 from ack.streams.json_stream import JSONStream
+from ack.streams.record_batch import records_from_batches
 from ack.utils.date_handler import build_date_range
-from ack.utils.text import get_report_generator_from_flat_file
+from ack.utils.text import get_report_batches_from_flat_file
 
 
 class GoogleSA360Reader(Reader):
@@ -51,6 +52,9 @@ class GoogleSA360Reader(Reader):
         self.start_date, self.end_date = build_date_range(start_date, end_date, date_range)
 
     def result_generator(self):
+        return records_from_batches(self.result_batches())
+
+    def result_batches(self):
         for advertiser_id in self.advertiser_ids:
             body = self.sa360_client.generate_report_body(
                 self.agency_id,
@@ -67,10 +71,10 @@ class GoogleSA360Reader(Reader):
             report_data = self.sa360_client.assert_report_file_ready(report_id)
 
             for line_iterator in self.sa360_client.download_report_files(report_data, report_id):
-                yield from get_report_generator_from_flat_file(line_iterator)
+                yield from get_report_batches_from_flat_file(line_iterator)
 
     def read(self):
         if not self.advertiser_ids:
             self.advertiser_ids = self.sa360_client.get_all_advertisers_of_agency(self.agency_id)
 
-        yield JSONStream("results" + "_".join(self.advertiser_ids), self.result_generator())
+        yield JSONStream.from_batches("results" + "_".join(self.advertiser_ids), self.result_batches())
@@ -36,6 +36,7 @@ from ack.utils.processor import processor
 @click.option("--mysql-redis-state-service-name")
 @click.option("--mysql-redis-state-service-host")
 @click.option("--mysql-redis-state-service-port", default=6379)
+@click.option("--mysql-sqlite-state-service-path")
 @processor("mysql_user", "mysql_password")
 def mysql(**kwargs):
     query_key = "mysql_query"
@@ -48,6 +49,7 @@ def mysql(**kwargs):
         "mysql_redis_state_service_host",
         "mysql_redis_state_service_port",
     ]
+    sqlite_state_service_keys = ["mysql_redis_state_service_name", "mysql_sqlite_state_service_path"]
 
     if hasnt_arg(query_key, kwargs) and hasnt_arg(table_key, kwargs):
         raise click.BadParameter("Must specify either a table or a query for MySQL reader")
@@ -58,15 +60,20 @@ def mysql(**kwargs):
     if has_arg(query_key, kwargs) and hasnt_arg(query_name_key, kwargs):
         raise click.BadParameter("Must specify a query name when running a MySQL query")
 
-    redis_state_service_enabled = all([has_arg(key, kwargs) for key in redis_state_service_keys])
+    state_service_enabled = all([has_arg(key, kwargs) for key in redis_state_service_keys]) or all(
+        [has_arg(key, kwargs) for key in sqlite_state_service_keys]
+    )
 
-    if has_arg(watermark_column_key, kwargs) and not redis_state_service_enabled:
+    if has_arg("mysql_redis_state_service_host", kwargs) and has_arg("mysql_sqlite_state_service_path", kwargs):
+        raise click.BadParameter("Cannot specify both a Redis host and a SQLite path for MySQL state management")
+
+    if has_arg(watermark_column_key, kwargs) and not state_service_enabled:
         raise click.BadParameter("You must configure state management to use MySQL watermarks")
 
-    if hasnt_arg(watermark_column_key, kwargs) and redis_state_service_enabled:
+    if hasnt_arg(watermark_column_key, kwargs) and state_service_enabled:
         raise click.BadParameter("You must specify a MySQL watermark when using state management")
 
-    if hasnt_arg(watermark_init_key, kwargs) and redis_state_service_enabled:
+    if hasnt_arg(watermark_init_key, kwargs) and state_service_enabled:
         raise click.BadParameter("You must specify an initial MySQL watermark value when using state management")
 
     return MySQLReader(**extract_args("mysql_", kwargs))
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, root_validator
 
 
 class MySQLReaderConfig(BaseModel):
@@ -13,5 +13,15 @@ class MySQLReaderConfig(BaseModel):
     query_name: str
     table: str
     redis_state_service_name: str
-    redis_state_service_host: str
+    redis_state_service_host: str = None
     redis_state_service_port: int = 6379
+    sqlite_state_service_path: str = None
+
+    @root_validator
+    def single_state_service_backend(cls, values):
+        backends = [values.get("redis_state_service_host"), values.get("sqlite_state_service_path")]
+        if values.get("watermark_column") and not any(backends):
+            raise ValueError("A Redis host or a SQLite path must be given to manage the watermark state")
+        if all(backends):
+            raise ValueError("Cannot specify both a Redis host and a SQLite path for state management")
+        return values
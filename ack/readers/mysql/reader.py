@@ -20,7 +20,7 @@ import sqlalchemy
 from ack.config import logger
 from ack.readers.reader import Reader
 from ack.streams.json_stream import JSONStream
-from ack.utils.redis import RedisStateService
+from ack.utils.state import create_state_service
 from ack.utils.retry import retry
 from ack.readers.mysql.helper import build_custom_query, build_table_query
 
@@ -42,18 +42,19 @@ class MySQLReader(Reader):
         redis_state_service_name,
         redis_state_service_host,
         redis_state_service_port,
+        sqlite_state_service_path=None,
     ):
 
         self._engine = self._create_engine(host, port, user, password, database)
         self._name = table if table else query_name
         self._schema = schema
         self._watermark_column = watermark_column
-        self._redis_state_service = RedisStateService(
-            redis_state_service_name, redis_state_service_host, redis_state_service_port
+        self._state_service = create_state_service(
+            redis_state_service_name, redis_state_service_host, redis_state_service_port, sqlite_state_service_path
         )
 
         if watermark_column:
-            self._watermark_value = self._redis_state_service.get(self._name) or watermark_init
+            self._watermark_value = self._state_service.get(self._name) or watermark_init
 
         if table:
             self._query = build_table_query(self._engine, schema, table, watermark_column, self._watermark_value)
@@ -97,12 +98,13 @@ class MySQLReader(Reader):
                 yield dict(row.items())
 
                 if self._watermark_column:
-                    self._redis_state_service.set(self._name, row[self._watermark_column])
+                    self._state_service.checkpoint(self._name, row[self._watermark_column])
 
                 row = rows.fetchone()
             rows.close()
 
-        return JSONStream(self._name, result_generator())
+        # The watermark is only checkpointed once the stream has been written
+        return JSONStream(self._name, result_generator()).on_commit(self._state_service.commit)
 
     def close(self):
         logger.info("Closing MySQL connection")
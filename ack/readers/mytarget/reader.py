@@ -20,7 +20,7 @@ import itertools
 from datetime import datetime
 from typing import Any, Dict, List, Tuple
 
-import requests
+from ack.clients.api.session import get_session
 from ack.readers.mytarget.config import HTTP_STATUS_RATE_LIMIT_EXCEEDED, HTTP_STATUS_OK, LIMIT_REQUEST_MYTARGET, REQUEST_CONFIG
 from ack.readers.reader import Reader
 from ack.streams.json_stream import JSONStream
@@ -32,6 +32,7 @@ from ack.config import logger
 
 class MyTargetReader(Reader):
     def __init__(self, client_id, client_secret, refresh_token, request_type, date_range, start_date, end_date, **kwargs):
+        self.session = get_session("mytarget")
         self.client_id = client_id
         self.client_secret = client_secret
         self.agency_client_token = {"refresh_token": refresh_token}
@@ -80,7 +81,7 @@ class MyTargetReader(Reader):
         """
         parameters_refresh_token = self.__generate_params_dict("refresh_agency_token")
         request_refresh_token = self.__create_request("refresh_agency_token", parameters_refresh_token)
-        refreshed_token = requests.post(**request_refresh_token).json()
+        refreshed_token = self.session.post(**request_refresh_token).json()
         self.set_agency_client_token(refreshed_token)
 
     def __retrieve_all_data(self) -> Tuple[Dict[str, Dict[str, str]], Dict[str, Dict[str, str]], Dict[str, Dict[str, str]]]:
@@ -187,7 +188,7 @@ class MyTargetReader(Reader):
         """
         parameters = self.__generate_params_dict(name_content, offset=offset)
         request = self.__create_request(name_content, parameters)
-        resp = requests.get(**request)
+        resp = self.session.get(**request)
         if resp.status_code == HTTP_STATUS_RATE_LIMIT_EXCEEDED:
             raise RateLimitExceeded("The requests-per-time unit limit was exceeded")
         elif resp.status_code != HTTP_STATUS_OK:
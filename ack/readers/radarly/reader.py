@@ -17,7 +17,6 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 import sys
-import time
 import traceback
 from collections import OrderedDict
 from datetime import datetime, timedelta
@@ -27,6 +26,7 @@ import numpy as np
 from ack.config import logger
 from ack.readers.reader import Reader
 from ack.streams.json_stream import JSONStream
+from ack.utils.rate_limit import SlidingWindowLimiter, shared_limiter
 from ack.utils.retry import retry
 
 from radarly import RadarlyApi
@@ -72,6 +72,13 @@ class RadarlyReader(Reader):
 
         self.throttle = throttle
         self.throttling_threshold_coefficient = throttling_threshold_coefficient
+        # Each date range may return up to api_date_period_limit posts: at most throttling_threshold_coefficient
+        # * api_quarterly_posts_limit posts can be requested over api_window seconds
+        max_date_ranges = int(throttling_threshold_coefficient * api_quarterly_posts_limit // api_date_period_limit)
+        self.rate_limiter = shared_limiter(
+            ("radarly", client_id, api_window, max_date_ranges),
+            lambda: SlidingWindowLimiter(max(1, max_date_ranges), api_window),
+        )
 
     def read(self):
         """
@@ -81,21 +88,10 @@ class RadarlyReader(Reader):
         logger.info(f"API Compliant Date Ranges and Posts Volumes: {date_ranges_and_posts_volumes}")
         api_compliant_date_ranges = list(date_ranges_and_posts_volumes.keys())
 
-        t0 = time.time()
-        ingestion_tracker = []
-
         for i, date_range in enumerate(api_compliant_date_ranges):
 
             if self.throttle:
-                current_time = time.time() - t0
-                ingestion_tracker.append(current_time)
-                posts_ingested_over_window = (
-                    sum(np.array(ingestion_tracker) > current_time - self.api_window) * self.api_date_period_limit
-                )
-                if posts_ingested_over_window > self.throttling_threshold_coefficient * self.api_quarterly_posts_limit:
-                    sleep_duration = self.api_window * (self.api_date_period_limit / self.api_quarterly_posts_limit)
-                    logger.info(f"Throttling activated: waiting for {sleep_duration} seconds...")
-                    time.sleep(sleep_duration)
+                self.rate_limiter.acquire()
 
             all_publications = self.get_publications_iterator(date_range)
             name = f"""radarly_{date_range[0].strftime("%Y-%m-%d-%H-%M-%S")}_{date_range[1].strftime(
@@ -35,6 +35,7 @@ from ack.utils.processor import processor
 @click.option("--salesforce-redis-state-service-name")
 @click.option("--salesforce-redis-state-service-host")
 @click.option("--salesforce-redis-state-service-port", default=6379)
+@click.option("--salesforce-sqlite-state-service-path")
 @processor("salesforce_consumer_key", "salesforce_consumer_secret", "salesforce_user", "salesforce_password")
 def salesforce(**kwargs):
     query_key = "salesforce_query"
@@ -47,6 +48,7 @@ def salesforce(**kwargs):
         "salesforce_redis_state_service_host",
         "salesforce_redis_state_service_port",
     ]
+    sqlite_state_service_keys = ["salesforce_redis_state_service_name", "salesforce_sqlite_state_service_path"]
 
     if hasnt_arg(query_key, kwargs) and hasnt_arg(object_type_key, kwargs):
         raise click.BadParameter("Must specify either an object type or a query for Salesforce")
@@ -57,15 +59,20 @@ def salesforce(**kwargs):
     if has_arg(query_key, kwargs) and hasnt_arg(query_name_key, kwargs):
         raise click.BadParameter("Must specify a query name when running a Salesforce query")
 
-    redis_state_service_enabled = all([has_arg(key, kwargs) for key in redis_state_service_keys])
+    state_service_enabled = all([has_arg(key, kwargs) for key in redis_state_service_keys]) or all(
+        [has_arg(key, kwargs) for key in sqlite_state_service_keys]
+    )
 
-    if has_arg(watermark_column_key, kwargs) and not redis_state_service_enabled:
+    if has_arg("salesforce_redis_state_service_host", kwargs) and has_arg("salesforce_sqlite_state_service_path", kwargs):
+        raise click.BadParameter("Cannot specify both a Redis host and a SQLite path for Salesforce state management")
+
+    if has_arg(watermark_column_key, kwargs) and not state_service_enabled:
         raise click.BadParameter("You must configure state management to use Salesforce watermarks")
 
-    if hasnt_arg(watermark_column_key, kwargs) and redis_state_service_enabled:
+    if hasnt_arg(watermark_column_key, kwargs) and state_service_enabled:
         raise click.BadParameter("You must specify a Salesforce watermark when using state management")
 
-    if hasnt_arg(watermark_init_key, kwargs) and redis_state_service_enabled:
+    if hasnt_arg(watermark_init_key, kwargs) and state_service_enabled:
         raise click.BadParameter("You must specify an initial Salesforce watermark value when using state management")
 
     return SalesforceReader(**extract_args("salesforce_", kwargs))
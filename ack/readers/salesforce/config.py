@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
-from pydantic import BaseModel
+from pydantic import BaseModel, root_validator
 
 SALESFORCE_LOGIN_ENDPOINT = "https://login.salesforce.com/services/oauth2/token"
 SALESFORCE_LOGIN_REDIRECT = "https://login.salesforce.com/services/oauth2/success"
@@ -38,5 +38,15 @@ class SalesforceReaderConfig(BaseModel):
     query_name: str
     table: str
     redis_state_service_name: str
-    redis_state_service_host: str
+    redis_state_service_host: str = None
     redis_state_service_port: int = 6379
+    sqlite_state_service_path: str = None
+
+    @root_validator
+    def single_state_service_backend(cls, values):
+        backends = [values.get("redis_state_service_host"), values.get("sqlite_state_service_path")]
+        if values.get("watermark_column") and not any(backends):
+            raise ValueError("A Redis host or a SQLite path must be given to manage the watermark state")
+        if all(backends):
+            raise ValueError("Cannot specify both a Redis host and a SQLite path for state management")
+        return values
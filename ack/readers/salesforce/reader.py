@@ -21,7 +21,7 @@ import collections
 from ack.readers.reader import Reader
 from ack.clients.salesforce.client import SalesforceClient
 from ack.streams.json_stream import JSONStream
-from ack.utils.redis import RedisStateService
+from ack.utils.state import create_state_service
 from ack.utils.retry import retry
 
 
@@ -40,6 +40,7 @@ class SalesforceReader(Reader):
         redis_state_service_name,
         redis_state_service_host,
         redis_state_service_port,
+        sqlite_state_service_path=None,
     ):
         self._name = query_name or object_type
         self._client = SalesforceClient(user, password, consumer_key, consumer_secret)
@@ -47,8 +48,8 @@ class SalesforceReader(Reader):
         self._watermark_init = watermark_init
         self._object_type = object_type
         self._query = query
-        self._redis_state_service = RedisStateService(
-            redis_state_service_name, redis_state_service_host, redis_state_service_port
+        self._state_service = create_state_service(
+            redis_state_service_name, redis_state_service_host, redis_state_service_port, sqlite_state_service_path
         )
 
     def build_object_type_query(self, object_type, watermark_column):
@@ -72,7 +73,7 @@ class SalesforceReader(Reader):
             watermark_value = None
 
             if self._watermark_column:
-                watermark_value = self._redis_state_service.get(self._name) or self._watermark_init
+                watermark_value = self._state_service.get(self._name) or self._watermark_init
 
             if self._object_type:
                 self._query = self.build_object_type_query(self._object_type, self._watermark_column)
@@ -87,9 +88,10 @@ class SalesforceReader(Reader):
                 yield row
 
                 if self._watermark_column:
-                    self._redis_state_service.set(self._name, row[self._watermark_column])
+                    self._state_service.checkpoint(self._name, row[self._watermark_column])
 
-        yield JSONStream(self._name, result_generator())
+        # The watermark is only checkpointed once the stream has been written
+        yield JSONStream(self._name, result_generator()).on_commit(self._state_service.commit)
 
     @classmethod
     def _clean_record(cls, record):
@@ -19,22 +19,24 @@
 
 from datetime import timedelta
 
-import requests
+from ack.clients.api.session import get_session
 from ack.config import logger
 from ack.readers.reader import Reader
 from ack.readers.the_trade_desk.config import API_ENDPOINTS, API_HOST, DEFAULT_PAGING_ARGS, DEFAULT_REPORT_SCHEDULE_ARGS
 from ack.readers.the_trade_desk.helper import format_date
 from ack.streams.json_stream import JSONStream
 from ack.utils.date_handler import build_date_range
-from ack.utils.exceptions import ReportScheduleNotReadyError, ReportTemplateNotFoundError
+from ack.utils.download import iter_response_lines
+from ack.utils.exceptions import ReportTemplateNotFoundError
+from ack.utils.poller import PENDING, poll_job
 from ack.utils.text import get_report_generator_from_flat_file
-from tenacity import retry, stop_after_delay, wait_exponential
 
 
 class TheTradeDeskReader(Reader):
     def __init__(
         self, login, password, advertiser_id, report_template_name, report_schedule_name, start_date, end_date, date_range,
     ):
+        self.session = get_session("the_trade_desk")
         self.login = login
         self.password = password
         self._build_headers()
@@ -53,7 +55,7 @@ class TheTradeDeskReader(Reader):
             "Password": self.password,
             "TokenExpirationInMinutes": 1440,
         }
-        response = requests.post(url=url, headers=headers, json=payload)
+        response = self.session.post(url=url, headers=headers, json=payload)
         if response.ok:
             return response.json()["Token"]
         else:
@@ -64,7 +66,7 @@ class TheTradeDeskReader(Reader):
 
     def _make_api_call(self, method, endpoint, payload={}):
         url = f"{API_HOST}/{endpoint}"
-        response = requests.request(method=method, url=url, headers=self.headers, json=payload)
+        response = self.session.request(method=method, url=url, headers=self.headers, json=payload)
         if response.ok:
             if response.content:
                 return response.json()
@@ -101,18 +103,18 @@ class TheTradeDeskReader(Reader):
         json_response = self._make_api_call(method, endpoint, payload)
         self.report_schedule_id = json_response["ReportScheduleId"]
 
-    @retry(
-        wait=wait_exponential(multiplier=1, min=60, max=3600), stop=stop_after_delay(36000),
-    )
     def _wait_for_download_url(self):
+        report_execution_details = poll_job(self._check_report_execution, name=f"ReportScheduleId '{self.report_schedule_id}'")
+        # As the ReportSchedule that we just created runs only once,
+        # the API response will include only one ReportDelivery (so we can get index "[0]")
+        self.download_url = report_execution_details["ReportDeliveries"][0]["DownloadURL"]
+        logger.info(f"ReportScheduleId '{self.report_schedule_id}' is ready. DownloadURL: {self.download_url}")
+
+    def _check_report_execution(self):
         report_execution_details = self._get_report_execution_details()
         if report_execution_details["ReportExecutionState"] == "Pending":
-            raise ReportScheduleNotReadyError(f"ReportSchedule '{self.report_schedule_id}' is still running.")
-        else:
-            # As the ReportSchedule that we just created runs only once,
-            # the API response will include only one ReportDelivery (so we can get index "[0]")
-            self.download_url = report_execution_details["ReportDeliveries"][0]["DownloadURL"]
-            logger.info(f"ReportScheduleId '{self.report_schedule_id}' is ready. DownloadURL: {self.download_url}")
+            return PENDING
+        return report_execution_details
 
     def _get_report_execution_details(self):
         method, endpoint = API_ENDPOINTS["get_report_execution_details"]
@@ -128,8 +130,8 @@ class TheTradeDeskReader(Reader):
         return report_execution_details
 
     def _download_report(self):
-        report = requests.get(url=self.download_url, headers=self.headers, stream=True)
-        return get_report_generator_from_flat_file(report.iter_lines())
+        report = self.session.get(url=self.download_url, headers=self.headers, stream=True)
+        return get_report_generator_from_flat_file(iter_response_lines(report))
 
     def _delete_report_schedule(self):
         logger.info(f"Deleting ReportScheduleId '{self.report_schedule_id}'")
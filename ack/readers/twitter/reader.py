@@ -34,6 +34,7 @@ from ack.readers.twitter.config import (
 )
 from ack.streams.json_stream import JSONStream
 from ack.utils.date_handler import build_date_range
+from ack.utils.poller import PENDING, get_poller
 from tenacity import retry, stop_after_delay, wait_exponential, retry_if_exception_type, before_sleep_log
 from twitter_ads import API_VERSION
 from twitter_ads.client import Client
@@ -154,24 +155,23 @@ class TwitterReader(Reader):
 
         all_responses = []
 
-        for job_id in job_ids:
-
-            logger.info(f"Processing job_id: {job_id}")
+        # The jobs are polled together, their reports being downloaded as they complete
+        job_results = [
+            get_poller().submit(lambda job_id=job_id: self._check_job(job_id), name=f"Job {job_id}") for job_id in job_ids
+        ]
 
-            # job_result = self.get_job_result(job_id)
-            # waiting_sec = 2
+        try:
+            for job_id, job_result in zip(job_ids, job_results):
 
-            # while job_result.status == "PROCESSING":
-            #     logger.info(f"Waiting {waiting_sec} seconds for job to be completed")
-            #     sleep(waiting_sec)
-            #     if waiting_sec > MAX_WAITING_SEC:
-            #         raise JobTimeOutError("Waited too long for job to be completed")
-            #     waiting_sec *= 2
-            #     job_result = self.get_job_result(job_id)
+                logger.info(f"Processing job_id: {job_id}")
 
-            job_result = self._waiting_for_job_to_complete(job_id)
-            raw_analytics_response = self.get_raw_analytics_response(job_result)
-            all_responses.append(self.parse(raw_analytics_response))
+                job_result = job_result.result()
+                raw_analytics_response = self.get_raw_analytics_response(job_result)
+                all_responses.append(self.parse(raw_analytics_response))
+        finally:
+            # Stop polling the other jobs if one of them failed
+            for job_result in job_results:
+                job_result.cancel()
 
         return chain(*all_responses)
 
@@ -210,14 +210,13 @@ class TwitterReader(Reader):
             for chunk_entity_ids in split_list(entity_ids, MAX_ENTITY_IDS_PER_JOB)
         ]
 
-    @retry(wait=wait_exponential(multiplier=1, min=60, max=3600), stop=stop_after_delay(36000))
-    def _waiting_for_job_to_complete(self, job_id):
+    def _check_job(self, job_id):
         """
-        Retrying to get job_result until job status is 'COMPLETED'.
+        Get job_result once job status is no longer 'PROCESSING'.
         """
         job_result = self.get_job_result(job_id)
         if job_result.status == "PROCESSING":
-            raise Exception(f"Job {job_id} is still running.")
+            return PENDING
         else:
             return job_result
 
@@ -16,7 +16,6 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
-import time
 from http import HTTPStatus
 from typing import Dict, Tuple
 
@@ -27,6 +26,8 @@ from ack.config import logger
 from ack.readers.reader import Reader
 from ack.readers.yandex_statistics.config import YANDEX_DIRECT_API_BASE_URL
 from ack.streams.json_stream import JSONStream
+from ack.utils.download import iter_response_lines
+from ack.utils.poller import Pending, poll_job
 from ack.utils.text import get_report_generator_from_flat_file
 
 
@@ -46,33 +47,34 @@ class YandexStatisticsReader(Reader):
         api_client = ApiClient(self.token, YANDEX_DIRECT_API_BASE_URL)
         body = self._build_request_body()
         headers = self._build_request_headers()
-        while True:
+
+        def check_report():
             response = api_client.execute_request(url="reports", body=body, headers=headers, stream=True)
-            if response.status_code == HTTPStatus.CREATED:
-                waiting_time = int(response.headers["retryIn"])
-                logger.info(f"Report added to queue. Should be ready in {waiting_time} min.")
-                time.sleep(waiting_time * 60)
-            elif response.status_code == HTTPStatus.ACCEPTED:
-                logger.info("Report in queue.")
+            if response.status_code in (HTTPStatus.CREATED, HTTPStatus.ACCEPTED):
+                # retryIn is the nb of seconds after which the report should be requested again
+                retry_in = int(response.headers.get("retryIn", 0))
+                if response.status_code == HTTPStatus.CREATED:
+                    logger.info(f"Report added to queue. Should be ready in {retry_in} s.")
+                else:
+                    logger.info("Report in queue.")
+                return Pending(retry_in or None)
             elif response.status_code == HTTPStatus.OK:
                 logger.info("Report successfully retrieved.")
-
-                return get_report_generator_from_flat_file(response.iter_lines(), delimiter="\t", skip_n_first=1,)
-
-                return get_report_generator_from_flat_file(response.iter_lines(), delimiter="\t", skip_n_first=1,)
-
+                return response
             elif response.status_code == HTTPStatus.BAD_REQUEST:
                 logger.error("Invalid request.")
                 logger.error(response.json())
-                break
             elif response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR:
                 logger.error("Internal server error.")
                 logger.error(response.json())
-                break
             else:
                 logger.error(response.json())
-                break
-        return None
+            return None
+
+        response = poll_job(check_report, name=f"Report {self.report_name}")
+        if response is None:
+            return None
+        return get_report_generator_from_flat_file(iter_response_lines(response), delimiter="\t", skip_n_first=1,)
 
     def _build_request_body(self) -> Dict:
         body = {}
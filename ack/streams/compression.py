@@ -0,0 +1,45 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import zlib
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+COMPRESSIONS = (GZIP, ZSTD)
+COMPRESSION_EXTENSIONS = {GZIP: "gz", ZSTD: "zst"}
+
+
+def check_compression(compression):
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression}. Available compressions are {list(COMPRESSIONS)}")
+    return compression
+
+
+def create_compressor(compression):
+    """
+    Returns an incremental compressor, exposing compress(data) and flush() methods.
+    """
+    if compression == GZIP:
+        return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if compression == ZSTD:
+        try:
+            import zstandard
+        except ImportError as err:
+            raise ImportError("The zstandard package is required to use zstd compression") from err
+        return zstandard.ZstdCompressor().compressobj()
+    raise ValueError(f"Unknown compression {compression}. Available compressions are {list(COMPRESSIONS)}")
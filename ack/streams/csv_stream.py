@@ -0,0 +1,130 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import csv
+import io
+import json
+from itertools import chain, islice
+
+from ack.config import logger
+from ack.streams.stream import Stream
+
+CSV_HEADER_SAMPLE_SIZE = 1000
+LATE_KEYS_POLICIES = ("ignore", "fail")
+
+
+class LateKeyError(Exception):
+    """Raised when a record has keys that are not part of the CSV header"""
+
+    pass
+
+
+class CSVStream(Stream):
+    """
+    Stream of dict records, written as a CSV file with a single header line.
+
+    The columns of the header are the keys of the first header_sample_size records,
+    in order of appearance. Missing keys are written as empty values, and keys
+    appearing after the header has been written are either ignored (with a warning)
+    or raise a LateKeyError, according to the late_keys policy.
+    """
+
+    extension = "csv"
+    mime_type = "text/csv"
+    has_header = True
+
+    def __init__(
+        self, name, source_generator, header_sample_size=CSV_HEADER_SAMPLE_SIZE, late_keys="ignore", delimiter=",",
+    ):
+        if late_keys not in LATE_KEYS_POLICIES:
+            raise ValueError(f"Unknown late keys policy {late_keys}. Available policies are {list(LATE_KEYS_POLICIES)}")
+        super().__init__(name, source_generator)
+        self.header_sample_size = header_sample_size
+        self.late_keys = late_keys
+        self.delimiter = delimiter
+        self.columns = None
+        self._column_set = set()
+        self._ignored_keys = set()
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, delimiter=delimiter, lineterminator="\n")
+
+    def encoded_records(self):
+        """
+        Buffer the first records to discover the columns, then yield the header
+        followed by encoded records.
+        """
+        self._discover_columns()
+        header = (self._encode_row(self.columns) + "\n").encode("utf-8")
+        return chain([header], map(self.encode_record_as_bytes, self._iterator))
+
+    def decode_records(self, encoded_records):
+        """
+        Decode encoded records, the first one being the header.
+        """
+        lines = (line.decode("utf-8") if isinstance(line, bytes) else line for line in encoded_records)
+        reader = csv.reader(lines, delimiter=self.delimiter)
+        columns = next(reader, None)
+        if columns is not None:
+            self._set_columns(columns)
+            for row in reader:
+                yield dict(zip(columns, row))
+
+    def encode_record(self, record) -> str:
+        record = self.transform_record(record)
+        late_keys = record.keys() - self._column_set
+        if late_keys:
+            self._handle_late_keys(late_keys)
+        values = [record.get(column) for column in self.columns]
+        return self._encode_row([v if type(v) not in (dict, list) else json.dumps(v, default=str) for v in values])
+
+    def decode_record(self, record):
+        if isinstance(record, bytes):
+            record = record.decode("utf-8")
+        return dict(zip(self.columns, next(csv.reader([record], delimiter=self.delimiter))))
+
+    def readlines(self):
+        self._discover_columns()
+        return super().readlines()
+
+    def _discover_columns(self):
+        if self.columns is not None:
+            return
+        sample = list(islice(self._iterator, self.header_sample_size))
+        columns = {}
+        for record in sample:
+            columns.update(dict.fromkeys(self.transform_record(record)))
+        self._set_columns(list(columns))
+        self._iterator = chain(sample, self._iterator)
+
+    def _set_columns(self, columns):
+        self.columns = columns
+        self._column_set = set(columns)
+
+    def _encode_row(self, row):
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(row)
+        # Line terminator is added by encode_record_as_bytes
+        return self._buffer.getvalue()[:-1]
+
+    def _handle_late_keys(self, late_keys):
+        if self.late_keys == "fail":
+            raise LateKeyError(f"Keys {sorted(late_keys)} are not part of the CSV header of stream {self.name}")
+        new_keys = late_keys - self._ignored_keys
+        if new_keys:
+            logger.warning(f"Ignoring keys {sorted(new_keys)} that are not part of the CSV header of stream {self.name}")
+            self._ignored_keys.update(new_keys)
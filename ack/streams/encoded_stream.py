@@ -0,0 +1,66 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from ack.streams.stream import Stream
+
+
+class EncodedStream(Stream):
+    """
+        Stream whose records have already been encoded as bytes by a source stream.
+        It keeps the name, extension, mime type, compression, rolling and commit hooks of its source stream,
+        so that writers can process it exactly as they would process the source stream.
+    """
+
+    def __init__(self, source_stream, encoded_records):
+        self._name = source_stream._name
+        self._source_stream = source_stream
+        self._source_generator = encoded_records
+        self._iterator = iter(encoded_records)
+        self.extension = source_stream.extension
+        self.mime_type = source_stream.mime_type
+        self.compression = source_stream.compression
+        self.has_header = source_stream.has_header
+        self._commit_hooks = source_stream._commit_hooks
+        self.roll(source_stream.max_part_bytes, source_stream.max_part_rows)
+
+    def __iter__(self):
+        """
+            Iterating over an encoded stream yields the records decoded by the source stream.
+        """
+        return iter(self._source_stream.decode_records(self._iterator))
+
+    @property
+    def source_stream(self):
+        return self._source_stream
+
+    def records(self):
+        """
+            Records have already been transformed by the source stream before being encoded.
+        """
+        return iter(self)
+
+    def is_encoded_by(self, stream_class):
+        return isinstance(self._source_stream, stream_class)
+
+    def encoded_records(self):
+        return self._iterator
+
+    def encode_record(self, record) -> str:
+        return self._source_stream.encode_record(record)
+
+    def decode_record(self, record):
+        return self._source_stream.decode_record(record)
@@ -15,35 +15,117 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
-from ack.streams.json_stream import JSONStream
-import dateutil.parser
 from datetime import datetime
+from functools import lru_cache
+
+import dateutil.parser
+
+from ack.streams.json_stream import JSONStream
+from ack.streams.record_batch import RecordBatch
+
+FORMATTED_DATES_CACHE_SIZE = 4096
+
+# Formats tried to infer the date format of a column. They all give the same result
+# as dateutil.parser.parse with its default parameters, when they match a value.
+CANDIDATE_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%Y%m%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+)
+
+# Positions of year, month and day in formats that can be parsed by slicing
+SLICED_DATE_FORMATS = {
+    "%Y-%m-%d": (10, (4, 7), "-", (0, 4), (5, 7), (8, 10)),
+    "%Y/%m/%d": (10, (4, 7), "/", (0, 4), (5, 7), (8, 10)),
+    "%Y%m%d": (8, (), "", (0, 4), (4, 6), (6, 8)),
+}
 
 
 class FormatDateStream(JSONStream):
-    keys = []
-    date_format = "%Y-%m-%d"
+    """
+    JSON stream formatting the dates of the given keys with date_format.
+
+    The input format of each key is inferred from its first value, and then used
+    to parse the next values with a precompiled strptime format (or by slicing,
+    for common formats). Formatted values are memoized, and dateutil is only used
+    for values that do not match the inferred format.
+    """
 
     def __init__(self, name, source_generator, keys: [] = None, date_format: str = "%Y-%m-%d"):
         super().__init__(name, source_generator)
-        FormatDateStream.keys = keys
-        FormatDateStream.date_format = date_format
+        self.keys = keys or []
+        self.date_format = date_format
+        self._input_formats = {}
+        self._format_date = lru_cache(maxsize=FORMATTED_DATES_CACHE_SIZE)(self._convert_date)
 
-    @classmethod
-    def encode_record(cls, record):
-        return super(FormatDateStream, cls).encode_record(cls._parse_record(record))
+    def encode_record(self, record):
+        return super(FormatDateStream, self).encode_record(self.transform_record(record))
 
-    @classmethod
-    def _parse_record(cls, o):
+    def transform_record(self, record):
+        return self._parse_record(record)
+
+    def transform_batch(self, batch):
+        columns = [(index, key) for index, key in enumerate(batch.headers) if key in self.keys]
+        if not columns:
+            return batch
+        rows = []
+        for row in batch.rows:
+            row = list(row)
+            for index, key in columns:
+                v = row[index]
+                if v is not None and len(v) > 1:
+                    row[index] = self._format_date(key, v)
+            rows.append(row)
+        return RecordBatch(batch.headers, rows)
+
+    def _parse_record(self, o):
         if isinstance(o, dict):
-            for k, v in o.items():
-                if k in cls.keys:
-                    if len(v) > 1:
-                        o[k] = cls._format_date(v)
+            for k in self.keys:
+                v = o.get(k)
+                if v is not None and len(v) > 1:
+                    o[k] = self._format_date(k, v)
         return o
 
+    def _convert_date(self, key, v):
+        if key not in self._input_formats:
+            self._input_formats[key] = self._infer_input_format(v)
+        input_format = self._input_formats[key]
+        parsed_date = None
+        if input_format is not None:
+            parsed_date = self._parse_with_format(v, input_format)
+        if parsed_date is None:
+            parsed_date = dateutil.parser.parse(v)
+        return parsed_date.strftime(self.date_format)
+
     @classmethod
-    def _format_date(cls, v):
-        parsed_date = dateutil.parser.parse(v)
-        datetimeobject = datetime.strptime(str(parsed_date), "%Y-%m-%d  %H:%M:%S")
-        return datetimeobject.strftime(cls.date_format)
+    def _infer_input_format(cls, v):
+        try:
+            expected_date = dateutil.parser.parse(v)
+        except (ValueError, OverflowError):
+            return None
+        for candidate_format in CANDIDATE_DATE_FORMATS:
+            if cls._parse_with_format(v, candidate_format) == expected_date:
+                return candidate_format
+        return None
+
+    @staticmethod
+    def _parse_with_format(v, input_format):
+        """
+        Returns the parsed date, or None if the value does not match the format.
+        """
+        sliced_format = SLICED_DATE_FORMATS.get(input_format)
+        try:
+            if sliced_format is not None:
+                length, separator_positions, separator, year, month, day = sliced_format
+                if len(v) != length or any(v[position] != separator for position in separator_positions):
+                    return None
+                return datetime(int(v[year[0] : year[1]]), int(v[month[0] : month[1]]), int(v[day[0] : day[1]]))
+            return datetime.strptime(v, input_format)
+        except ValueError:
+            return None
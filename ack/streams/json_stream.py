@@ -16,6 +16,8 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 import json
+from json.encoder import encode_basestring_ascii
+from operator import add
 
 from ack.streams.stream import Stream
 
@@ -26,8 +28,23 @@ class JSONStream(Stream):
 
     @classmethod
     def decode_record(cls, record):
-        return json.loads(record, encoding="utf-8")
+        return json.loads(record)
 
     @classmethod
     def encode_record(cls, record) -> str:
         return json.dumps(record, default=str)
+
+    def encode_batch(self, batch):
+        """
+            Encode the rows of a record batch without building dicts: the key prefix of
+            each column is encoded once, and values are encoded as json.dumps would.
+        """
+        if len(set(batch.headers)) != len(batch.headers):
+            return ((json.dumps(record, default=str) + "\n").encode("utf-8") for record in batch.records())
+        prefixes = [f"{encode_basestring_ascii(str(key))}: " for key in batch.headers]
+        return (self._encode_row(prefixes, row) for row in batch.rows)
+
+    @staticmethod
+    def _encode_row(prefixes, row):
+        values = [encode_basestring_ascii(v) if type(v) is str else json.dumps(v, default=str) for v in row]
+        return ("{" + ", ".join(map(add, prefixes, values)) + "}\n").encode("utf-8")
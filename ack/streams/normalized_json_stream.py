@@ -15,20 +15,51 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from functools import lru_cache
+
 from ack.streams.json_stream import JSONStream
+from ack.streams.record_batch import RecordBatch
+
+NORMALIZED_KEYS_CACHE_SIZE = 8192
+KEYS_PLANS_CACHE_SIZE = 512
+
+_SCALAR_TYPES = (str, int, float, bool)
 
 
 class NormalizedJSONStream(JSONStream):
     @classmethod
     def encode_record(cls, record):
-        return super(NormalizedJSONStream, cls).encode_record(cls._normalize_keys(record))
+        return super(NormalizedJSONStream, cls).encode_record(cls.transform_record(record))
+
+    @classmethod
+    def transform_record(cls, record):
+        return cls._normalize_keys(record)
+
+    def transform_batch(self, batch):
+        """
+        Headers of a record batch are normalized once, and the values of its rows as
+        the values of a record.
+        """
+        return RecordBatch(_get_keys_plan(batch.headers), [self._normalize_keys(row) for row in batch.rows])
 
     @classmethod
     def _normalize_keys(cls, o):
+        """
+        Records yielded by a reader share a handful of shapes: the normalized keys of
+        a dict are looked up in a plan cached by its tuple of keys, and values only
+        go through a recursive call when they are not plain scalars.
+        """
         if isinstance(o, dict):
-            return {cls._normalize_key(k): cls._normalize_keys(v) for k, v in o.items()}
-        elif isinstance(o, list):
-            return [cls._normalize_keys(v) for v in o]
+            keys = _get_keys_plan(tuple(o))
+            return dict(zip(keys, [v if type(v) in _SCALAR_TYPES else cls._normalize_value(v) for v in o.values()]))
+        elif isinstance(o, (list, tuple)):
+            return [v if type(v) in _SCALAR_TYPES else cls._normalize_value(v) for v in o]
+        return cls._normalize_value(o)
+
+    @classmethod
+    def _normalize_value(cls, o):
+        if isinstance(o, (dict, list, tuple)):
+            return cls._normalize_keys(o)
         elif o is None:
             return ""
         else:
@@ -36,19 +67,29 @@ class NormalizedJSONStream(JSONStream):
 
     @staticmethod
     def _normalize_key(key):
-        return (
-            key.strip()
-            .replace(" ", "_")
-            .replace("-", "_")
-            .replace("(", "_")
-            .replace(")", "")
-            .replace(":", "_")
-            .replace("/", "_")
-            .replace("\\", "_")
-            .replace("][", "_")
-            .replace("[", "_")
-            .replace("]", "_")
-            .replace(".", "_")
-            .replace("%", "per")
-            .strip("_")
-        )
+        return _normalize_key(str(key))
+
+
+@lru_cache(maxsize=KEYS_PLANS_CACHE_SIZE)
+def _get_keys_plan(keys):
+    return tuple(_normalize_key(str(key)) for key in keys)
+
+
+@lru_cache(maxsize=NORMALIZED_KEYS_CACHE_SIZE)
+def _normalize_key(key):
+    return (
+        key.strip()
+        .replace(" ", "_")
+        .replace("-", "_")
+        .replace("(", "_")
+        .replace(")", "")
+        .replace(":", "_")
+        .replace("/", "_")
+        .replace("\\", "_")
+        .replace("][", "_")
+        .replace("[", "_")
+        .replace("]", "_")
+        .replace(".", "_")
+        .replace("%", "per")
+        .strip("_")
+    )
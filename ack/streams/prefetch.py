@@ -0,0 +1,63 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import threading
+
+from ack.utils.channel import END_OF_STREAM, Channel
+
+PREFETCH_MAX_RECORDS = 10000
+PREFETCH_BATCH_SIZE = 100
+
+
+def prefetch(iterable, max_records=PREFETCH_MAX_RECORDS, batch_size=PREFETCH_BATCH_SIZE):
+    """
+        Lazily yield the items of iterable, consumed ahead by a background thread.
+        At most about max_records items are buffered, in batches of batch_size items.
+        The thread is started by the first iteration. An exception raised by the iterable
+        is raised to the consumer, and the iterable is closed as soon as the consumer
+        stops iterating (e.g. if its writer fails).
+    """
+    batch_size = max(1, min(batch_size, max_records))
+    channel = Channel(queue_size=max(1, max_records // batch_size))
+    thread = threading.Thread(target=_produce, args=(iterable, channel, batch_size), name="ack-prefetch", daemon=True)
+    thread.start()
+    try:
+        yield from channel
+    finally:
+        channel.close()
+        thread.join()
+
+
+def _produce(iterable, channel, batch_size):
+    iterator = iter(iterable)
+    try:
+        batch = []
+        for item in iterator:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                channel.put(batch)
+                batch = []
+                if channel.closed:
+                    return
+        if batch:
+            channel.put(batch)
+        channel.put(END_OF_STREAM)
+    except Exception as err:
+        channel.put(err)
+    finally:
+        if hasattr(iterator, "close"):
+            iterator.close()
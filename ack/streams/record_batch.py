@@ -0,0 +1,71 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+RECORD_BATCH_SIZE = 1000
+
+
+class RecordBatch(object):
+    """
+        Batch of records sharing the same keys, stored as one tuple of headers and a list
+        of row tuples, so that no dict is built for a record unless it is needed.
+    """
+
+    __slots__ = ("headers", "rows")
+
+    def __init__(self, headers, rows):
+        self.headers = tuple(headers)
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __eq__(self, other):
+        return isinstance(other, RecordBatch) and (self.headers, self.rows) == (other.headers, other.rows)
+
+    def __repr__(self):
+        return f"RecordBatch(headers={self.headers!r}, rows={len(self.rows)})"
+
+    def records(self):
+        """
+            Lazily yield the records of the batch, as dicts.
+        """
+        headers = self.headers
+        return (dict(zip(headers, row)) for row in self.rows)
+
+
+def records_from_batches(batches):
+    """
+        Lazily yield the records of an iterator of record batches, as dicts.
+    """
+    for batch in batches:
+        yield from batch.records()
+
+
+def skip_last_rows(batches, n):
+    """
+        Skips the n last rows of an iterator of record batches
+    """
+    pending, n_pending = [], 0
+    for batch in batches:
+        pending.append(batch)
+        n_pending += len(batch)
+        while pending and n_pending - len(pending[0]) >= n:
+            n_pending -= len(pending[0])
+            yield pending.pop(0)
+    rows = [row for batch in pending for row in batch.rows][: max(n_pending - n, 0)]
+    if rows:
+        yield RecordBatch(pending[0].headers, rows)
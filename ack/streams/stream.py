@@ -18,14 +18,34 @@
 from datetime import datetime
 import time
 import io
+import re
+from itertools import chain, islice
+
+from ack.streams.compression import COMPRESSION_EXTENSIONS, check_compression, create_compressor
+from ack.streams.prefetch import PREFETCH_MAX_RECORDS, prefetch
+from ack.streams.record_batch import RECORD_BATCH_SIZE, records_from_batches
+from ack.streams.stream_part import StreamPart
+
+STREAM_BUFFER_SIZE = 256 * 1024
+STREAM_BATCH_RECORDS = 64
+# Timestamp appended to stream names by Stream.create_stream_name
+STREAM_NAME_TIMESTAMP = re.compile(r"_\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2}")
 
 
 class Stream(object):
     _name = None
     _source_generator = None
+    _batches = None
+    _batch_records = None
 
     extension = None
     mime_type = "application/octet-stream"
+    compression = None
+    has_header = False
+    max_part_bytes = None
+    max_part_rows = None
+    _commit_hooks = ()
+    _encoded_records_stages = ()
 
     def __init__(self, name, source_generator):
         """
@@ -35,6 +55,26 @@ class Stream(object):
         self._source_generator = source_generator
         self._iterator = iter(source_generator)
 
+    @classmethod
+    def from_batches(cls, name, batches, *args, **kwargs):
+        """
+            Create a stream from a generator yielding RecordBatch objects. Records are encoded
+            directly from the rows of the batches, and are only built as dicts if a stage
+            needing them (e.g. map or filter) is added to the stream.
+        """
+        stream = cls(name, (), *args, **kwargs)
+        stream._source_generator = batches
+        stream._batches = iter(batches)
+        stream._iterator = stream._batch_records = records_from_batches(stream._batches)
+        return stream
+
+    @property
+    def is_batched(self):
+        """
+            Whether the records of the stream are still read as record batches.
+        """
+        return self._batches is not None and self._iterator is self._batch_records
+
     def __len__(self):
         return self._source_generator.__len__()
 
@@ -45,8 +85,122 @@ class Stream(object):
         """
         return self._iterator
 
-    def as_file(self) -> io.BufferedReader:
-        return self._iterable_to_stream(self._iterator, self.encode_record_as_bytes)
+    def as_file(self, buffer_size=None) -> io.BufferedReader:
+        """
+            Read the stream as a binary file of encoded records.
+            Records are encoded by batches of about buffer_size bytes,
+            and compressed incrementally if a compression is set.
+        """
+        compressor = create_compressor(self.compression) if self.compression else None
+        return self._iterable_to_stream(self.read_encoded_records(), None, buffer_size or STREAM_BUFFER_SIZE, compressor)
+
+    def encoded_records(self):
+        """
+            Lazily yield the content of the stream as bytes, one encoded record at a time.
+        """
+        if self.is_batched:
+            return chain.from_iterable(map(self.encode_batch, self.batches()))
+        return map(self.encode_record_as_bytes, self._iterator)
+
+    def read_encoded_records(self):
+        """
+            Lazily yield the encoded records of the stream, through the stages added by
+            map_encoded_records. Writers consuming encoded records must read them this way.
+        """
+        encoded_records = self.encoded_records()
+        for function in self._encoded_records_stages:
+            encoded_records = function(encoded_records)
+        return encoded_records
+
+    def map_encoded_records(self, function):
+        """
+            Add a lazy stage applying function to the iterator of encoded records, when they
+            are read by a writer (e.g. to count encoded bytes). Stages are kept by the streams
+            created from the stream by create_from_stream. Returns the stream itself.
+        """
+        self._encoded_records_stages = (*self._encoded_records_stages, function)
+        return self
+
+    def batches(self):
+        """
+            Lazily yield each record batch of a batched stream, as transformed by transform_batch.
+        """
+        return map(self.transform_batch, self._batches)
+
+    def map_batches(self, function):
+        """
+            Add a lazy stage applying function to the iterator of record batches of a batched
+            stream. Returns the stream itself, which stays batched.
+        """
+        self._batches = function(self._batches)
+        self._iterator = self._batch_records = records_from_batches(self._batches)
+        return self
+
+    def decode_records(self, encoded_records):
+        """
+            Lazily decode records previously yielded by encoded_records.
+        """
+        return map(self.decode_record, encoded_records)
+
+    def compress(self, compression):
+        """
+            Set the compression (gzip or zstd) applied to the stream when read as a file.
+            Returns the stream itself, so that it can be chained with other stages.
+        """
+        self.compression = check_compression(compression)
+        return self
+
+    @property
+    def content_encoding(self):
+        return self.compression
+
+    def roll(self, max_part_bytes=None, max_part_rows=None):
+        """
+            Set the maximum size (in bytes, after compression) and nb of records of the
+            parts the stream is split into when written. Returns the stream itself.
+        """
+        self.max_part_bytes = max_part_bytes
+        self.max_part_rows = max_part_rows
+        return self
+
+    @property
+    def is_rolled(self):
+        return bool(self.max_part_bytes or self.max_part_rows)
+
+    def parts(self):
+        """
+            Lazily split the encoded records of the stream into StreamPart objects,
+            at record boundaries. A part is yielded as soon as it reaches max_part_bytes
+            bytes or max_part_rows records, so that it can be written while the next one
+            is being built. The header of the stream, if any, is repeated in every part.
+            An empty stream is yielded as a single empty part.
+        """
+        encoded_records = iter(self.read_encoded_records())
+        header = next(encoded_records, None) if self.has_header else None
+        part, index = None, 0
+        for encoded_record in encoded_records:
+            if part is None:
+                index += 1
+                part = self._start_part(index, header)
+            part.write(encoded_record)
+            if self._is_part_full(part):
+                yield part.finish()
+                part = None
+        if part is not None:
+            yield part.finish()
+        elif index == 0:
+            yield self._start_part(1, header).finish()
+
+    def _start_part(self, index, header):
+        part = StreamPart(self, index)
+        if header is not None:
+            part.write(header, is_row=False)
+        return part
+
+    def _is_part_full(self, part):
+        return (self.max_part_rows is not None and part.rows >= self.max_part_rows) or (
+            self.max_part_bytes is not None and part.size >= self.max_part_bytes
+        )
 
     def readlines(self):
         """
@@ -56,16 +210,101 @@ class Stream(object):
         for record in self:
             yield self.decode_record(self.encode_record(record))
 
+    def records(self):
+        """
+            Lazily yield each record of the stream, as transformed by transform_record.
+            Records stay Python objects: they are not encoded then decoded.
+        """
+        return map(self.transform_record, self)
+
+    def map(self, function):
+        """
+            Add a lazy stage applying function to every record of the stream.
+            Returns the stream itself, so that stages can be chained.
+        """
+        self._iterator = map(function, self._iterator)
+        return self
+
+    def filter(self, predicate):
+        """
+            Add a lazy stage keeping only the records for which predicate is true.
+            Returns the stream itself, so that stages can be chained.
+        """
+        self._iterator = filter(predicate, self._iterator)
+        return self
+
+    def prefetch(self, max_records=PREFETCH_MAX_RECORDS):
+        """
+            Consume the records of the stream ahead, on a background thread buffering at
+            most about max_records records, so that the source generator (e.g. API calls)
+            runs while the writer is busy (e.g. uploading). Returns the stream itself.
+        """
+        if self.is_batched:
+            return self.map_batches(lambda batches: prefetch(batches, max(1, max_records // RECORD_BATCH_SIZE), 1))
+        self._iterator = prefetch(self._iterator, max_records)
+        return self
+
+    def on_commit(self, hook):
+        """
+            Register a function called by commit(), once the stream has been written (e.g. to
+            checkpoint the state of the reader it comes from). Returns the stream itself.
+        """
+        self._commit_hooks = (*self._commit_hooks, hook)
+        return self
+
+    def commit(self):
+        """
+            Call the hooks registered by on_commit. Must only be called once all the records
+            of the stream have been successfully written.
+        """
+        for hook in self._commit_hooks:
+            hook()
+
+    def is_encoded_by(self, stream_class):
+        """
+            Whether the records of the stream are encoded by the given stream class.
+        """
+        return isinstance(self, stream_class)
+
     @classmethod
     def create_from_stream(cls, source_stream):
-        if isinstance(source_stream, cls):
+        if source_stream.is_encoded_by(cls):
             return source_stream
 
-        return cls(source_stream.name, source_stream.readlines())
+        name = ".".join(filter(None, [source_stream._name, source_stream.extension]))
+        if source_stream.is_batched:
+            stream = cls.from_batches(name, source_stream.batches())
+        else:
+            stream = cls(name, source_stream.records())
+        stream.compress(source_stream.compression)
+        stream._commit_hooks = source_stream._commit_hooks
+        stream._encoded_records_stages = source_stream._encoded_records_stages
+        return stream.roll(source_stream.max_part_bytes, source_stream.max_part_rows)
 
     @classmethod
-    def encode_record_as_bytes(cls, record) -> bytes:
-        return (cls.encode_record(record) + "\n").encode("utf-8")
+    def transform_record(cls, record):
+        """
+            Transformation applied to a record before it is encoded.
+        """
+        return record
+
+    def transform_batch(self, batch):
+        """
+            Transformation applied to a record batch before it is encoded, which must give
+            the same records as transform_record: streams transforming their records must
+            override both.
+        """
+        return batch
+
+    def encode_batch(self, batch):
+        """
+            Lazily yield the records of a transformed record batch as bytes, one encoded record
+            at a time.
+        """
+        return map(self.encode_record_as_bytes, batch.records())
+
+    def encode_record_as_bytes(self, record) -> bytes:
+        return (self.encode_record(record) + "\n").encode("utf-8")
 
     @classmethod
     def encode_record(cls, record) -> str:
@@ -83,41 +322,77 @@ class Stream(object):
 
     @property
     def name(self):
-        return ".".join(filter(None, [self._name, self.extension]))
+        return f"{self._name}{self.suffix}"
+
+    @property
+    def base_name(self):
+        """
+            Name given to the stream by its reader, without the timestamp added by create_stream_name
+            nor extensions, e.g. "results" for "results_2020-01-01-00-00-00.njson.gz"
+        """
+        return STREAM_NAME_TIMESTAMP.split(self._name, 1)[0]
+
+    @property
+    def suffix(self):
+        """
+            Extensions of the file the stream is written to, e.g. ".njson.gz"
+        """
+        return "".join(f".{ext}" for ext in [self.extension, COMPRESSION_EXTENSIONS.get(self.compression)] if ext)
 
     @staticmethod
-    def _iterable_to_stream(iterable, encode, buffer_size=io.DEFAULT_BUFFER_SIZE):
+    def _iterable_to_stream(iterable, encode, buffer_size=STREAM_BUFFER_SIZE, compressor=None):
         """
-        Credit goes to 'Mechanical snail'
-            at https://stackoverflow.com/questions/6657820/python-convert-an-iterable-to-a-stream
+        Lets you use an iterable (e.g. a generator) as a read-only input stream,
+        each element being converted to bytes by the encode function
+        (elements are expected to be bytes already if encode is None).
 
-        Lets you use an iterable (e.g. a generator) that yields bytestrings as a
-        read-only
-        input stream.
+        Elements are encoded in batches of about buffer_size bytes, the number of
+        elements per batch being adapted to the observed size of encoded elements.
+        Reads are served through a memoryview on the joined bytes of each batch, so
+        that a batch is never copied again, nor its leftovers into new bytes objects.
+        If a compressor is given, each batch is compressed incrementally.
 
-        The stream implements Python 3's newer I/O API (available in Python 2's io
-        module).
+        The stream implements Python 3's newer I/O API.
         For efficiency, the stream is buffered.
         """
+        iterator = iter(iterable) if encode is None else map(encode, iterable)
 
         class IterStream(io.RawIOBase):
             def __init__(self):
-                self.leftover = None
+                self.batch = memoryview(b"")
+                self.batch_records = STREAM_BATCH_RECORDS
+                self.exhausted = False
+                self.position = 0
                 self.count = 0
 
             def readable(self):
                 return True
 
             def readinto(self, b):
-                try:
-                    chunk_length = len(b)  # We're supposed to return at most this much
-                    chunk = self.leftover or encode(next(iterable))
-                    output, self.leftover = chunk[:chunk_length], chunk[chunk_length:]
-                    b[: len(output)] = output
-                    self.count += len(output)
-                    return len(output)
-                except StopIteration:
+                if self.position >= len(self.batch) and not self._encode_batch():
                     return 0  # indicate EOF
+                size = min(len(b), len(self.batch) - self.position)
+                b[:size] = self.batch[self.position : self.position + size]
+                self.position += size
+                self.count += size
+                return size
+
+            def _encode_batch(self):
+                data = b""
+                # A compressor may buffer a whole batch without returning any data
+                while not data and not self.exhausted:
+                    data = b"".join(islice(iterator, self.batch_records))
+                    if data:
+                        self.batch_records = max(1, self.batch_records * buffer_size // len(data))
+                        if compressor is not None:
+                            data = compressor.compress(data)
+                    else:
+                        self.exhausted = True
+                        if compressor is not None:
+                            data = compressor.flush()
+                self.batch.release()
+                self.batch, self.position = memoryview(data), 0
+                return len(data) > 0
 
             # tell should be implemented for GCS
             def tell(self):
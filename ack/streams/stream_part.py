@@ -0,0 +1,64 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import tempfile
+
+from ack.streams.compression import create_compressor
+
+PART_SPOOL_SIZE = 8 * 1024 * 1024
+
+
+class StreamPart(object):
+    """
+        Part of a stream split by Stream.parts: a sequence of consecutive encoded
+        (and possibly compressed) records, spooled to a temporary file so that it
+        can be read several times, e.g. to retry an upload.
+        Parts kept in memory are moved to disk once larger than PART_SPOOL_SIZE bytes.
+    """
+
+    def __init__(self, stream, index):
+        self.index = index
+        self.suffix = f"-{index:05d}{stream.suffix}"
+        self.name = f"{stream._name}{self.suffix}"
+        self.mime_type = stream.mime_type
+        self.content_encoding = stream.content_encoding
+        self.rows = 0
+        self.size = 0
+        self._file = tempfile.SpooledTemporaryFile(max_size=PART_SPOOL_SIZE)
+        self._compressor = create_compressor(stream.compression) if stream.compression else None
+
+    def write(self, encoded_record, is_row=True):
+        if self._compressor is not None:
+            encoded_record = self._compressor.compress(encoded_record)
+        self.size += self._file.write(encoded_record)
+        self.rows += is_row
+
+    def finish(self):
+        """
+            Flush the compressor: no record can be written to the part afterwards.
+        """
+        if self._compressor is not None:
+            self.size += self._file.write(self._compressor.flush())
+            self._compressor = None
+        return self
+
+    def as_file(self):
+        self._file.seek(0)
+        return self._file
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,63 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import queue
+import threading
+
+CHANNEL_PUT_TIMEOUT = 0.1
+
+END_OF_STREAM = object()
+
+
+class Channel:
+    """
+        Bounded queue of item batches, passed from a producer thread to a single consumer.
+        The producer puts batches, then END_OF_STREAM, or the exception that stopped it,
+        which is raised by the consumer. The consumer closes the channel when it stops
+        listening, so that the producer is never blocked forever.
+    """
+
+    def __init__(self, queue_size):
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = threading.Event()
+
+    @property
+    def closed(self):
+        return self._closed.is_set()
+
+    def close(self):
+        self._closed.set()
+
+    def put(self, item):
+        """
+            Block until the item is queued, unless the consumer stops listening.
+        """
+        while not self.closed:
+            try:
+                self._queue.put(item, timeout=CHANNEL_PUT_TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is END_OF_STREAM:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield from item
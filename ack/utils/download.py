@@ -0,0 +1,87 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import codecs
+import zlib
+
+from ack.config import logger
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+
+
+def iter_response_lines(response, chunk_size=DOWNLOAD_CHUNK_SIZE, encoding="utf-8"):
+    """
+    Yields the decoded lines of a streamed HTTP response, without line terminator.
+
+    The response body is read by chunks of chunk_size bytes and decoded by a single
+    incremental decoder, so that the cost of a download doesn't depend on the number
+    of lines of the report. A Content-Encoding: gzip is decoded by requests, and a body
+    that is itself a gzip file (e.g. a report stored as .csv.gz) is decompressed on the fly.
+    """
+    yield from iter_lines(decode_chunks(response.iter_content(chunk_size=chunk_size), encoding))
+
+
+def decode_chunks(chunks, encoding="utf-8"):
+    """
+    Decodes an iterator of byte chunks, which may split multi-byte characters
+    anywhere, into an iterator of text chunks.
+
+    Bytes that can't be decoded are ignored, and reported in a single warning.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    decompressor = None
+    for index, chunk in enumerate(chunk for chunk in chunks if chunk):
+        if index == 0 and chunk.startswith(GZIP_MAGIC_NUMBER):
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        if decompressor:
+            chunk = decompressor.decompress(chunk)
+        decoder, text = _decode(decoder, chunk)
+        if text:
+            yield text
+    decoder, text = _decode(decoder, decompressor.flush() if decompressor else b"", final=True)
+    if text:
+        yield text
+
+
+def _decode(decoder, chunk, final=False):
+    state = decoder.getstate()
+    try:
+        return decoder, decoder.decode(chunk, final)
+    except UnicodeDecodeError as e:
+        logger.warning(
+            "An error has occurred while parsing the file. "
+            f"Some bytes could not be decoded in {e.encoding} and will be ignored. "
+            f"Invalid input that the codec failed on: {e.object[e.start : e.end]}"
+        )
+        decoder = codecs.getincrementaldecoder(e.encoding)(errors="ignore")
+        decoder.setstate(state)
+        return decoder, decoder.decode(chunk, final)
+
+
+def iter_lines(text_chunks):
+    """
+    Splits an iterator of text chunks into lines, without line terminator.
+    """
+    pending = ""
+    for text in text_chunks:
+        lines = (pending + text).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line[:-1] if line.endswith("\r") else line
+    if pending:
+        yield pending[:-1] if pending.endswith("\r") else pending
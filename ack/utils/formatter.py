@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import json
 from typing import Dict, List
 
 from ack.readers.reader import Reader
@@ -29,7 +30,19 @@ def format_reader(reader: Dict) -> Reader:
     return readers_classes[reader_name][0](**config.dict())
 
 
-def format_writers(writers: List[Dict]) -> [Writer]:
+def format_writers(writers: List[Dict], instances: Dict = None) -> [Writer]:
+    """
+    Build writers from their configs. If an instances dict is given, writers with
+    the same config share the same instance (and its authenticated client), the
+    dict being updated with the writers that are built.
+    """
+    if instances is not None:
+        keys = [json.dumps(writer, sort_keys=True) for writer in writers]
+        for key, writer in zip(keys, writers):
+            if key not in instances:
+                instances[key] = format_writers([writer])[0]
+        return [instances[key] for key in keys]
+
     writers_list = []
     for writer in writers:
         writer_name = writer.pop("name")
@@ -0,0 +1,341 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+from ack.clients.api.stats import HTTP_STATS
+from ack.config import logger
+from ack.utils.retry import RETRY_BUDGET
+
+METRIC_PREFIX = "ack"
+
+
+class StreamMetrics:
+    """
+    Counters of a single stream: records read from its source generator, encoded bytes,
+    time blocked in the source generator and total time spent in the writer.
+    As writers pull records from the stream, the time spent in the writer includes the
+    time blocked in the source generator: the difference is the time spent encoding
+    and uploading records.
+    """
+
+    def __init__(self, name, label=None):
+        self.name = name
+        self.label = label or name
+        self.records = 0
+        self.encoded_bytes = 0
+        self.source_seconds = 0.0
+        self.write_seconds = 0.0
+
+    def observe_source(self, stream):
+        """
+        Count records and time blocked in the source generator of the stream.
+        Must be called before any stream is derived from it.
+        """
+        if stream.is_batched:
+            return stream.map_batches(lambda batches: self._timed_records(iter(batches), count=len))
+        stream._iterator = self._timed_records(iter(stream._iterator))
+        return stream
+
+    def observe_encoding(self, stream):
+        """
+        Count the bytes of the records encoded by the stream, before compression.
+        """
+        return stream.map_encoded_records(self._counted_bytes)
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "label": self.label,
+            "records": self.records,
+            "encoded_bytes": self.encoded_bytes,
+            "source_seconds": round(self.source_seconds, 3),
+            "write_seconds": round(self.write_seconds, 3),
+            "sink_seconds": round(max(self.write_seconds - self.source_seconds, 0.0), 3),
+            "records_per_second": round(self.records / self.write_seconds, 1) if self.write_seconds else None,
+        }
+
+    def _timed_records(self, iterator, count=None):
+        """
+        Yield the items of iterator, which are records unless a count function
+        giving the nb of records of an item (e.g. of a record batch) is provided.
+        """
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.source_seconds += clock() - start
+                return
+            self.source_seconds += clock() - start
+            self.records += 1 if count is None else count(item)
+            yield item
+
+    def _counted_bytes(self, encoded_records):
+        for encoded_record in encoded_records:
+            self.encoded_bytes += len(encoded_record)
+            yield encoded_record
+
+
+class RunMetrics:
+    """
+    Metrics of a run: time spent in the reader to yield streams, metrics of every
+    written stream, retry counters (see ack.utils.retry), HTTP requests sent through
+    pooled sessions (see ack.clients.api.session) and peak resident memory of the
+    process. At the end of the run,
+    a JSON summary is logged, and can be written to a file along with a Prometheus
+    textfile (see the textfile collector of the Prometheus node exporter).
+    """
+
+    def __init__(self):
+        self.streams = []
+        self.reader_seconds = 0.0
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._retry_stats = RETRY_BUDGET.stats()
+        self._http_stats = HTTP_STATS.stats()
+
+    def timed_streams(self, streams):
+        """
+        Lazily yield the streams of the reader, counting the time spent to yield them
+        (e.g. to request and wait for reports).
+        """
+        iterator = iter(streams)
+        while True:
+            start = time.perf_counter()
+            try:
+                stream = next(iterator)
+            except StopIteration:
+                self.reader_seconds += time.perf_counter() - start
+                return
+            self.reader_seconds += time.perf_counter() - start
+            yield stream
+
+    def add_stream(self, name, label=None):
+        stream_metrics = StreamMetrics(name, label)
+        with self._lock:
+            self.streams.append(stream_metrics)
+        return stream_metrics
+
+    def summary(self, status):
+        streams = [stream_metrics.as_dict() for stream_metrics in self.streams]
+        duration = time.perf_counter() - self._start
+        records = sum(stream["records"] for stream in streams)
+        return {
+            "status": status,
+            "duration_seconds": round(duration, 3),
+            "reader_seconds": round(self.reader_seconds, 3),
+            "records": records,
+            "encoded_bytes": sum(stream["encoded_bytes"] for stream in streams),
+            "records_per_second": round(records / duration, 1) if duration else None,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "retries": self.retry_stats(),
+            "http": self.http_stats(),
+            "streams": streams,
+        }
+
+    def retry_stats(self):
+        """
+        Counters of the retry budget since the start of the run. The budget is shared
+        by the process: runs executed concurrently (e.g. jobs) are all counted.
+        """
+        stats = RETRY_BUDGET.stats()
+        return {counter: value - self._retry_stats[counter] for counter, value in stats.items()}
+
+    def http_stats(self):
+        """
+        Counters of the HTTP requests sent through pooled sessions since the start of
+        the run, shared by the process as the retry counters.
+        """
+        stats = HTTP_STATS.stats()
+        return {counter: round(value - self._http_stats[counter], 3) for counter, value in stats.items()}
+
+    def report(self, status, metrics_file=None, prometheus_file=None):
+        summary = self.summary(status)
+        logger.info(f"Run summary: {json.dumps(summary)}")
+        if metrics_file:
+            with open(metrics_file, "w") as f:
+                json.dump(summary, f, indent=2)
+        if prometheus_file:
+            write_prometheus_textfile(summary, prometheus_file)
+        return summary
+
+
+def peak_rss_bytes():
+    """
+    Peak resident set size of the process, in bytes.
+    """
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in kilobytes on Linux
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def format_prometheus_metrics(summary):
+    return _format_prometheus_metrics([({}, summary)])
+
+
+def format_jobs_prometheus_metrics(job_summaries):
+    """
+    Metrics of the runs of the jobs of a multi-job config, labelled by job name.
+    """
+    return _format_prometheus_metrics([({"job": name}, summary) for name, summary in job_summaries.items()])
+
+
+def _format_prometheus_metrics(labelled_summaries):
+    """
+    Metrics of run summaries, each given with the labels of its series.
+    """
+    run_metrics = [
+        ("run_success", "gauge", "Whether the last run succeeded", lambda summary: int(summary["status"] == "success")),
+        ("run_duration_seconds", "gauge", "Duration of the last run", lambda summary: summary["duration_seconds"]),
+        (
+            "run_reader_seconds",
+            "gauge",
+            "Time spent in the reader to yield streams",
+            lambda summary: summary["reader_seconds"],
+        ),
+        (
+            "run_peak_rss_bytes",
+            "gauge",
+            "Peak resident set size of the process",
+            lambda summary: summary["peak_rss_bytes"],
+        ),
+        (
+            "run_last_timestamp_seconds",
+            "gauge",
+            "Unix time of the end of the last run",
+            lambda summary: round(time.time(), 3),
+        ),
+        (
+            "run_retries",
+            "gauge",
+            "Retries of failed calls during the last run",
+            lambda summary: summary["retries"]["retries"],
+        ),
+        (
+            "run_retries_denied",
+            "gauge",
+            "Failed calls of the last run not retried as the retry budget was exhausted",
+            lambda summary: summary["retries"]["budget_exhausted"],
+        ),
+        (
+            "run_http_requests",
+            "gauge",
+            "HTTP requests sent through pooled sessions",
+            lambda summary: summary["http"]["requests"],
+        ),
+        (
+            "run_http_errors",
+            "gauge",
+            "HTTP responses of the last run with an error status",
+            lambda summary: summary["http"]["errors"],
+        ),
+        (
+            "run_http_seconds",
+            "gauge",
+            "Time spent waiting for HTTP responses during the last run",
+            lambda summary: summary["http"]["seconds"],
+        ),
+        (
+            "run_http_cache_hits",
+            "gauge",
+            "HTTP responses replayed from the response cache",
+            lambda summary: summary["http"]["cache_hits"],
+        ),
+    ]
+    stream_metrics = [
+        ("stream_records_total", "counter", "Records read from the source generator of the stream", "records"),
+        ("stream_encoded_bytes_total", "counter", "Bytes of encoded records, before compression", "encoded_bytes"),
+        ("stream_source_seconds_total", "counter", "Time blocked in the source generator of the stream", "source_seconds"),
+        ("stream_write_seconds_total", "counter", "Time spent in the writer, source included", "write_seconds"),
+    ]
+
+    lines = []
+    for name, metric_type, help_text, get_value in run_metrics:
+        lines += _format_metric_header(name, metric_type, help_text)
+        for labels, summary in labelled_summaries:
+            lines.append(f"{METRIC_PREFIX}_{name}{_format_labels(labels)} {get_value(summary)}")
+    for name, metric_type, help_text, key in stream_metrics:
+        lines += _format_metric_header(name, metric_type, help_text)
+        for labels, summary in labelled_summaries:
+            for stream_label, value in _sum_by_stream_label(summary["streams"], key).items():
+                lines.append(f"{METRIC_PREFIX}_{name}{_format_labels({**labels, 'stream': stream_label})} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _sum_by_stream_label(streams, key):
+    """
+    Sum the values of the streams sharing a label (e.g. several streams of a reader), so
+    that series are stable from one run to the next whatever the names of the streams.
+    """
+    values = {}
+    for stream in streams:
+        label = stream.get("label", stream["name"])
+        values[label] = round(values.get(label, 0) + stream[key], 3)
+    return values
+
+
+def write_prometheus_textfile(summary, path):
+    """
+    Write the metrics of the summary to a Prometheus textfile.
+    """
+    _write_textfile(format_prometheus_metrics(summary), path)
+
+
+def report_jobs(job_summaries, metrics_file=None, prometheus_file=None):
+    """
+    Write the run summaries of the jobs of a multi-job config ({job name: summary}) to a
+    single JSON file, and to a single Prometheus textfile where series are labelled by job.
+    """
+    if metrics_file:
+        with open(metrics_file, "w") as f:
+            json.dump({"jobs": job_summaries}, f, indent=2)
+    if prometheus_file:
+        _write_textfile(format_jobs_prometheus_metrics(job_summaries), prometheus_file)
+
+
+def _write_textfile(content, path):
+    """
+    Write a Prometheus textfile. The file is replaced atomically, so that the collector
+    never reads a partially written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) as f:
+        f.write(content)
+    os.chmod(f.name, 0o644)
+    os.replace(f.name, path)
+
+
+def _format_metric_header(name, metric_type, help_text):
+    return [f"# HELP {METRIC_PREFIX}_{name} {help_text}", f"# TYPE {METRIC_PREFIX}_{name} {metric_type}"]
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
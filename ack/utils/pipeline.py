@@ -0,0 +1,166 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ack.config import logger
+from ack.streams.compression import check_compression
+from ack.streams.csv_stream import CSVStream
+from ack.streams.json_stream import JSONStream
+from ack.streams.normalized_json_stream import NormalizedJSONStream
+from ack.utils.metrics import RunMetrics
+from ack.utils.profiler import Profiler
+from ack.writers.broadcast_writer import BroadcastWriter
+
+OUTPUT_FORMATS = ("njson", "csv")
+PIPELINE_OPTIONS = (
+    "normalize_keys",
+    "max_concurrent_streams",
+    "compression",
+    "output_format",
+    "max_part_bytes",
+    "max_part_rows",
+    "metrics_file",
+    "prometheus_file",
+    "profile",
+    "prefetch_records",
+)
+
+
+def process_streams(
+    reader,
+    writers,
+    normalize_keys=False,
+    max_concurrent_streams=1,
+    compression=None,
+    output_format="njson",
+    max_part_bytes=None,
+    max_part_rows=None,
+    metrics_file=None,
+    prometheus_file=None,
+    profile=None,
+    prefetch_records=None,
+    on_summary=None,
+):
+    """
+    Write every stream yielded by the reader to the provided writers.
+    Params
+        :reader (Reader): reader yielding the streams to write
+        :writers (list): writers to send each stream to (in parallel if more than one)
+        :normalize_keys (bool): whether to normalize the keys of JSON streams
+        :max_concurrent_streams (int): nb of streams that can be written at the same time
+        :compression (str): compression of written files (gzip or zstd), if any
+        :output_format (str): format of written JSON streams (njson or csv)
+        :max_part_bytes (int): if set, streams are split into parts of at most about this nb of bytes
+        :max_part_rows (int): if set, streams are split into parts of at most this nb of records
+        :metrics_file (str): if set, path of the JSON file the run summary is written to
+        :prometheus_file (str): if set, path of the Prometheus textfile the run metrics are written to
+        :profile (str): if set, directory the profiles of the reader and of each stream write are written to
+        :prefetch_records (int): if set, nb of records of each stream consumed ahead on a background thread
+        :on_summary (callable): if set, called with the run summary, even if the run failed
+    """
+    check_compression(compression)
+    writer = BroadcastWriter(writers) if len(writers) > 1 else writers[0]
+    metrics = RunMetrics()
+    profiler = Profiler(profile) if profile else None
+
+    def write_stream(stream):
+        stream_metrics = metrics.add_stream(stream.name, stream.base_name)
+        stream_metrics.observe_source(stream)
+        if prefetch_records:
+            stream.prefetch(prefetch_records)
+        if normalize_keys and issubclass(stream.__class__, JSONStream):
+            stream = NormalizedJSONStream.create_from_stream(stream)
+        if output_format == "csv" and issubclass(stream.__class__, JSONStream):
+            stream = CSVStream.create_from_stream(stream)
+        if compression:
+            stream.compress(compression)
+        if max_part_bytes or max_part_rows:
+            stream.roll(max_part_bytes, max_part_rows)
+        stream_metrics.name = stream.name
+        stream_metrics.observe_encoding(stream)
+        start = time.perf_counter()
+        with profiler.profile_write(stream.name) if profiler else nullcontext():
+            writer.write(stream)
+        stream_metrics.write_seconds = time.perf_counter() - start
+        stream.commit()
+        return stream.name
+
+    status = "failed"
+    try:
+        streams = metrics.timed_streams(profiler.profiled_streams(reader.read()) if profiler else reader.read())
+        if max_concurrent_streams > 1:
+            write_streams_concurrently(streams, write_stream, max_concurrent_streams)
+        else:
+            for stream in streams:
+                write_stream(stream)
+        status = "success"
+    finally:
+        summary = metrics.report(status, metrics_file, prometheus_file)
+        if on_summary:
+            on_summary(summary)
+
+
+def write_streams_concurrently(streams, write_stream, max_concurrent_streams):
+    """
+    Consume the stream generator and write streams on a pool of worker threads.
+    At most max_concurrent_streams streams are in flight: the generator is only
+    advanced when a worker is available. Completions are logged in the order
+    streams were generated, and the first error stops the generation of new
+    streams, cancels the streams that have not started yet and is raised.
+    """
+    in_flight = deque()
+    executor = ThreadPoolExecutor(max_workers=max_concurrent_streams, thread_name_prefix="ack-stream")
+    try:
+        for index, stream in enumerate(streams, start=1):
+            _wait_for_available_worker(in_flight, max_concurrent_streams)
+            logger.info(f"Starting stream #{index}: {stream.name}")
+            in_flight.append((index, executor.submit(write_stream, stream)))
+            _log_completed_streams(in_flight)
+
+        while in_flight:
+            wait([future for _, future in in_flight], return_when=FIRST_COMPLETED)
+            _raise_first_error(in_flight)
+            _log_completed_streams(in_flight)
+    finally:
+        for _, future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _wait_for_available_worker(in_flight, max_concurrent_streams):
+    running = [future for _, future in in_flight if not future.done()]
+    while len(running) >= max_concurrent_streams:
+        wait(running, return_when=FIRST_COMPLETED)
+        running = [future for future in running if not future.done()]
+    _raise_first_error(in_flight)
+
+
+def _raise_first_error(in_flight):
+    for index, future in in_flight:
+        if future.done() and not future.cancelled() and future.exception() is not None:
+            logger.error(f"Stream #{index} failed, cancelling remaining streams")
+            raise future.exception()
+
+
+def _log_completed_streams(in_flight):
+    while in_flight and in_flight[0][1].done():
+        index, future = in_flight.popleft()
+        logger.info(f"Stream #{index} written: {future.result()}")
@@ -0,0 +1,182 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Poller of remote report jobs (e.g. a query run by the API before its report can be
+downloaded): a single background thread checks all the outstanding jobs of a process,
+each at an interval starting short and growing with its running time, and resolves the
+future returned to the reader once its job is completed. A check failing with a transient
+error (see ack.utils.retry) is retried at the next interval, until the job times out.
+"""
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+from ack.clients.api.cache import uncached
+from ack.config import logger
+from ack.utils.exceptions import RetryTimeoutError
+from ack.utils.retry import RETRY_BUDGET, get_retry_after, is_retryable
+
+POLL_MIN_INTERVAL = 2
+POLL_MAX_INTERVAL = 300
+POLL_BACKOFF = 1.5
+POLL_TIMEOUT = 36000
+
+
+class Pending:
+    """
+    Returned by the check of a job still running, with the nb of seconds after which the
+    job should be checked again if the API gives one.
+    """
+
+    __slots__ = ("retry_in",)
+
+    def __init__(self, retry_in=None):
+        self.retry_in = retry_in
+
+
+PENDING = Pending()
+
+
+class _Job:
+    __slots__ = ("check", "name", "interval", "max_interval", "started", "deadline", "future")
+
+    def __init__(self, check, name, min_interval, max_interval, timeout):
+        self.check = check
+        self.name = name
+        self.interval = min_interval
+        self.max_interval = max_interval
+        self.started = time.monotonic()
+        self.deadline = self.started + timeout
+        self.future = Future()
+
+
+class JobPoller:
+    """
+    Checks submitted jobs from a single thread, started when jobs are submitted and stopped
+    once they are all done. A check returns PENDING (or a Pending instance) while its job is
+    running, and any other value once it is completed: this value resolves the future of
+    the job, as would an exception raised by the check, unless this error is transient.
+    """
+
+    def __init__(
+        self, min_interval=POLL_MIN_INTERVAL, max_interval=POLL_MAX_INTERVAL, backoff=POLL_BACKOFF, timeout=POLL_TIMEOUT
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self._jobs = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def submit(self, check, name="job", min_interval=None, max_interval=None, timeout=None):
+        """
+        Start polling a job with check(), and return the future of its result. The job is
+        first checked at once, then after min_interval seconds, this interval growing up to
+        max_interval until the job is completed, or fails with a RetryTimeoutError once
+        timeout seconds have elapsed.
+        """
+        job = _Job(
+            check,
+            name,
+            self.min_interval if min_interval is None else min_interval,
+            self.max_interval if max_interval is None else max_interval,
+            self.timeout if timeout is None else timeout,
+        )
+        self._schedule(job, job.started)
+        return job.future
+
+    def _schedule(self, job, due):
+        with self._condition:
+            heapq.heappush(self._jobs, (due, next(self._counter), job))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="job-poller", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._jobs:
+                    self._thread = None
+                    return
+                due, _, job = self._jobs[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                heapq.heappop(self._jobs)
+            self._poll(job)
+
+    def _poll(self, job):
+        if job.future.cancelled():
+            return
+        try:
+            # The status of a job must never be replayed from the response cache
+            with uncached():
+                result = job.check()
+        except Exception as e:
+            now = time.monotonic()
+            if not is_retryable(e) or now >= job.deadline:
+                job.future.set_exception(e)
+                return
+            RETRY_BUDGET.record("retries")
+            logger.warning(f"Failed to check {job.name}: {type(e).__name__}: {e}")
+            result = Pending(get_retry_after(e))
+        now = time.monotonic()
+        if not isinstance(result, Pending):
+            logger.info(f"{job.name} completed after {now - job.started:.0f} s")
+            job.future.set_result(result)
+            return
+        if now >= job.deadline:
+            job.future.set_exception(RetryTimeoutError(f"{job.name} has taken more than {job.deadline - job.started:.0f} s"))
+            return
+        if result.retry_in is not None:
+            delay = result.retry_in
+        else:
+            delay = job.interval
+            job.interval = min(job.max_interval, job.interval * self.backoff)
+        delay = min(delay, job.deadline - now)
+        logger.info(f"{job.name} is still running, checking again in {delay:.0f} s")
+        self._schedule(job, now + delay)
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_poller():
+    """
+    Poller shared by the readers of a process, so that their jobs are checked together.
+    """
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = JobPoller()
+        return _poller
+
+
+def poll_job(check, name="job", **kwargs):
+    """
+    Wait for a job checked by check() to be completed, and return its result
+    (see JobPoller.submit for the keyword arguments).
+    """
+    return get_poller().submit(check, name, **kwargs).result()
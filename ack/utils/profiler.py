@@ -0,0 +1,117 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import re
+import threading
+from contextlib import contextmanager
+
+from ack.config import logger
+
+PROFILE_TOP_N = 25
+
+_run_ids = itertools.count(1)
+
+
+class Profiler:
+    """
+    Profile the phases of a run with cProfile: the generation of streams by the reader
+    (e.g. report requests), and the write of each stream (which includes the generation
+    of its records, their encoding and the upload). The stats of each phase are dumped
+    to a .pstats file of the given directory, and a table of its top functions, by time
+    spent in the function itself, is logged and written to a .txt file.
+
+    cProfile only profiles the thread it is enabled in: the work done by the threads
+    of broadcast writers or of part uploads is not included in the stats of a write.
+    """
+
+    def __init__(self, directory, top_n=PROFILE_TOP_N):
+        self.directory = directory
+        self.top_n = top_n
+        self.run_id = next(_run_ids)
+        self._stream_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def profiled_streams(self, streams):
+        """
+        Lazily yield the streams of the reader, profiling their generation as a single phase.
+        """
+        profile = cProfile.Profile()
+        iterator = iter(streams)
+        try:
+            while True:
+                with self._enabled(profile):
+                    stream = next(iterator, None)
+                if stream is None:
+                    return
+                yield stream
+        finally:
+            self._dump(profile, "reader")
+
+    @contextmanager
+    def profile_write(self, stream_name):
+        with self._lock:
+            stream_id = next(self._stream_ids)
+        profile = cProfile.Profile()
+        try:
+            with self._enabled(profile):
+                yield
+        finally:
+            self._dump(profile, f"stream-{stream_id}_{stream_name}")
+
+    @contextmanager
+    def _enabled(self, profile):
+        try:
+            profile.enable()
+        except ValueError as err:
+            # Since Python 3.12, a single profiler can be active at the same time
+            logger.warning(f"Profiling disabled for this phase: {err}")
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def _dump(self, profile, phase):
+        file_name = re.sub(r"[^\w.-]", "_", f"run-{self.run_id}_{phase}")
+        path = os.path.join(self.directory, file_name)
+        try:
+            stats = pstats.Stats(profile)
+        except TypeError:
+            # Nothing was profiled
+            return
+        stats.dump_stats(f"{path}.pstats")
+        table = format_top_functions(stats, self.top_n)
+        with open(f"{path}.txt", "w") as f:
+            f.write(table)
+        logger.info(f"Profile of {phase} written to {path}.pstats\n{table}")
+
+
+def format_top_functions(stats, top_n=PROFILE_TOP_N):
+    """
+    Flat table of the top_n functions of the stats, by time spent in the function itself.
+    """
+    output = io.StringIO()
+    stats.stream = output
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top_n)
+    return output.getvalue()
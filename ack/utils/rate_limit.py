@@ -0,0 +1,196 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Rate limiters shared by the threads of a process: a limiter reserves a time slot for
+each call under a lock, and the calling thread then sleeps (outside the lock) until
+this slot, so that concurrent workers share the same budget.
+"""
+import json
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+from ack.config import logger
+
+USAGE_THRESHOLD = 75
+MAX_USAGE_PAUSE_SECONDS = 300
+USAGE_HEADERS = ("x-business-use-case-usage", "x-ad-account-usage", "x-app-usage")
+USAGE_RATES = ("call_count", "total_cputime", "total_time", "acc_id_util_pct")
+
+
+class TokenBucket:
+    """
+    Allows bursts of up to capacity calls, refilled at rate calls per second.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Wait until tokens are available, and return the nb of seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Tokens can be borrowed from the future: following calls wait for them to be refilled
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+        _sleep(wait)
+        return wait
+
+
+class SlidingWindowLimiter:
+    """
+    Allows at most max_calls calls over any window of window seconds. Only the start
+    times of the last max_calls calls are kept, so that each call is O(1).
+    """
+
+    def __init__(self, max_calls, window):
+        self.max_calls = max_calls
+        self.window = window
+        self._calls = deque(maxlen=max_calls)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Wait until a call can be made, and return the nb of seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = now
+            if len(self._calls) == self.max_calls:
+                start = max(now, self._calls[0] + self.window)
+            self._calls.append(start)
+        wait = start - now
+        if wait > 0:
+            logger.info(f"Throttling activated: waiting for {wait:.1f} seconds...")
+        _sleep(wait)
+        return wait
+
+
+class AdaptiveRateLimiter:
+    """
+    Limiter driven by the responses of an API: update() pauses every caller of acquire()
+    according to a Retry-After header or to the usage rates of Facebook's usage headers
+    (pausing until the estimated time to regain access, or for a time growing from 0 to
+    max_pause seconds as usage goes from usage_threshold to 100%).
+    Calls can additionally be spaced by a limiter (e.g. a TokenBucket).
+    """
+
+    def __init__(self, limiter=None, usage_threshold=USAGE_THRESHOLD, max_pause=MAX_USAGE_PAUSE_SECONDS):
+        self.limiter = limiter
+        self.usage_threshold = usage_threshold
+        self.max_pause = max_pause
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Wait for the end of the current pause, if any, and return the nb of seconds waited.
+        """
+        with self._lock:
+            wait = max(0.0, self._paused_until - time.monotonic())
+        _sleep(wait)
+        if self.limiter is not None:
+            wait += self.limiter.acquire()
+        return wait
+
+    def pause(self, seconds, reason=""):
+        with self._lock:
+            paused_until = time.monotonic() + seconds
+            if paused_until <= self._paused_until:
+                return
+            self._paused_until = paused_until
+        logger.info(f"{reason}Pausing API calls for {seconds:.0f} seconds...")
+
+    def update(self, headers):
+        """
+        Pause calls according to the headers of a response (a mapping).
+        """
+        headers = {name.lower(): value for name, value in headers.items()}
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        if retry_after:
+            self.pause(retry_after, "Retry-After received. ")
+        usage, regain_access = max_usage(headers)
+        if regain_access:
+            self.pause(regain_access, "Rate limit reached. ")
+        elif usage > self.usage_threshold:
+            ratio = min(1.0, (usage - self.usage_threshold) / (100 - self.usage_threshold))
+            self.pause(ratio * self.max_pause, f"{usage}% of rate limit reached. ")
+
+
+_shared_limiters = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_limiter(key, create_limiter):
+    """
+    Limiter registered under key, created by create_limiter on first use, so that the
+    readers of a process calling the same API (e.g. concurrent jobs) share its budget.
+    """
+    with _shared_limiters_lock:
+        if key not in _shared_limiters:
+            _shared_limiters[key] = create_limiter()
+        return _shared_limiters[key]
+
+
+def parse_retry_after(value):
+    """
+    Nb of seconds to wait given by a Retry-After header (a nb of seconds or an HTTP date).
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def max_usage(headers):
+    """
+    Max usage rate (in %) given by the usage headers of a Facebook response, and max
+    estimated time to regain access (in seconds).
+    """
+    usage, regain_access = 0, 0
+    for name in USAGE_HEADERS:
+        if name not in headers:
+            continue
+        values = json.loads(headers[name])
+        # The business use case header maps business ids to lists of usages
+        entries = [entry for entries in values.values() for entry in entries] if name == USAGE_HEADERS[0] else [values]
+        for entry in entries:
+            usage = max([usage] + [entry[rate] for rate in USAGE_RATES if isinstance(entry.get(rate), (int, float))])
+            regain_access = max(regain_access, 60 * (entry.get("estimated_time_to_regain_access") or 0))
+    return usage, regain_access
+
+
+def _sleep(seconds):
+    if seconds > 0:
+        time.sleep(seconds)
@@ -19,27 +19,32 @@
 import pickle
 
 from ack.config import logger
+from ack.utils.state import StateService
 
 import redis
 
 
-class RedisStateService:
-    def __init__(self, name, host, port=6379):
+class RedisStateService(StateService):
+    """
+    State service storing values in a Redis hash, named after the service. Values of
+    a flush are written in a single round trip (through a pipeline).
+    """
+
+    def __init__(self, name, host, port=6379, checkpoint_rows=None, checkpoint_seconds=None):
         if host:
             logger.info(f"Using checkpointing service: {host}:{port} ({name})")
             self._enabled = True
-            self._name = name
             self._host = host
             self._port = port
             self._client = redis.Redis(host=host, port=port)
-        else:
-            self._enabled = False
-            logger.info("No checkpointing")
+        super().__init__(name, checkpoint_rows, checkpoint_seconds)
 
-    def get(self, key):
-        if self._enabled and self._client.hexists(self._name, key):
+    def _get_value(self, key):
+        if self._client.hexists(self._name, key):
             return pickle.loads(self._client.hget(self._name, key))
 
-    def set(self, key, value):
-        if self._enabled:
-            self._client.hset(self._name, key, pickle.dumps(value))
+    def _set_values(self, values):
+        pipeline = self._client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipeline.hset(self._name, key, pickle.dumps(value))
+        pipeline.execute()
@@ -0,0 +1,95 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from collections.abc import Mapping
+from importlib import import_module
+
+import click
+
+
+def import_object(path):
+    """
+    Import an object from its path, formatted as "package.module:object".
+    """
+    module_name, object_name = path.split(":")
+    return getattr(import_module(module_name), object_name)
+
+
+class LazyRegistry(Mapping):
+    """
+    Mapping of names to tuples of objects (e.g. a reader class and its config class),
+    given by their import paths. Modules are only imported when a name is accessed,
+    so that the dependencies of connectors that are not used are never imported.
+    """
+
+    def __init__(self, paths):
+        self._paths = paths
+        self._objects = {}
+
+    def __getitem__(self, name):
+        if name not in self._objects:
+            self._objects[name] = tuple(import_object(path) for path in self._paths[name])
+        return self._objects[name]
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+
+class LazyGroup(click.Group):
+    """
+    Click group whose commands are given by their import paths, and only imported
+    when they are invoked (or when the help of the group lists them).
+    """
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx):
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            self.add_command(import_object(self.lazy_commands[cmd_name]), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        """
+        List commands in the help of the group, a command whose dependencies
+        cannot be imported being listed as unavailable instead of failing.
+        """
+        commands = []
+        for cmd_name in self.list_commands(ctx):
+            try:
+                command = self.get_command(ctx, cmd_name)
+            except ImportError as err:
+                commands.append((cmd_name, f"(unavailable: {err})"))
+                continue
+            if command is not None and not command.hidden:
+                commands.append((cmd_name, command))
+
+        if commands:
+            limit = formatter.width - 6 - max(len(cmd_name) for cmd_name, _ in commands)
+            rows = [
+                (cmd_name, command if isinstance(command, str) else command.get_short_help_str(limit))
+                for cmd_name, command in commands
+            ]
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
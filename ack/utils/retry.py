@@ -15,20 +15,185 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""
+Retry policy of the calls to external services (APIs, databases, object storages).
 
+Only errors that may be transient are retried: 4xx HTTP errors (other than 408 and 429)
+and programming errors are raised at once. Retries wait for the delay given by a
+Retry-After header, if any, or for an exponentially growing delay with full jitter.
+All retried calls of a process share a retry budget, so that concurrent workers don't
+flood a failing service with retries, and the counters of the budget are exported to
+the run summary.
+"""
 import logging
+import random
+import threading
 
 from ack.config import logger
+from ack.utils.rate_limit import parse_retry_after
 from tenacity import before_log, before_sleep_log
 from tenacity import retry as _retry
-from tenacity import stop_after_attempt, wait_exponential
+from tenacity.retry import retry_base
+from tenacity.wait import wait_base
 
+RETRY_ATTEMPTS = 5
+RETRY_BASE_WAIT = 2
+RETRY_MAX_WAIT = 30
+RETRY_AFTER_MAX_WAIT = 300
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MIN_RETRIES = 20
+RETRYABLE_STATUS_CODES = (408, 429)
+NON_RETRYABLE_EXCEPTIONS = (TypeError, AttributeError, NameError, NotImplementedError, ImportError, SyntaxError)
+RETRY_COUNTERS = ("calls", "retries", "not_retried", "attempts_exhausted", "budget_exhausted")
+
+
+class RetryBudget:
+    """
+    Budget of retries shared by the retried calls of a process: a retry is allowed
+    as long as the nb of retries stays below min_retries + ratio * nb of calls.
+    """
+
+    def __init__(self, ratio=RETRY_BUDGET_RATIO, min_retries=RETRY_BUDGET_MIN_RETRIES):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self._counters = dict.fromkeys(RETRY_COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def record(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def try_retry(self):
+        """
+        Take a retry from the budget, if any is left.
+        """
+        with self._lock:
+            if self._counters["retries"] >= self.min_retries + self.ratio * self._counters["calls"]:
+                self._counters["budget_exhausted"] += 1
+                return False
+            self._counters["retries"] += 1
+            return True
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+
+RETRY_BUDGET = RetryBudget()
+
+
+class retry_if_transient_error(retry_base):
+    """
+    Retry a failed call if its error is retryable, attempts are left and the budget allows it.
+    """
+
+    def __init__(self, attempts, budget):
+        self.attempts = attempts
+        self.budget = budget
+
+    def __call__(self, retry_state):
+        if not retry_state.outcome.failed:
+            return False
+        exception = retry_state.outcome.exception()
+        name = getattr(retry_state.fn, "__qualname__", "call")
+        if not is_retryable(exception):
+            logger.info(f"Not retrying {name}: {type(exception).__name__} is not a transient error")
+            self.budget.record("not_retried")
+            return False
+        if retry_state.attempt_number >= self.attempts:
+            self.budget.record("attempts_exhausted")
+            return False
+        if not self.budget.try_retry():
+            logger.warning(f"Not retrying {name}: the retry budget of the run is exhausted")
+            return False
+        return True
+
+
+class wait_retry_after_or_full_jitter(wait_base):
+    """
+    Wait for the delay of the Retry-After header of the error, if any, or for a random
+    delay between 0 and an exponentially growing maximum.
+    """
+
+    def __call__(self, retry_state):
+        retry_after = get_retry_after(retry_state.outcome.exception())
+        if retry_after is not None:
+            return min(retry_after, RETRY_AFTER_MAX_WAIT)
+        return random.uniform(0, min(RETRY_MAX_WAIT, RETRY_BASE_WAIT * 2 ** retry_state.attempt_number))
+
+
+def retry(fn=None, attempts=RETRY_ATTEMPTS, budget=None):
+    """
+    Decorator retrying a function according to the retry policy of this module.
+    Can be used as @retry, or as @retry(attempts=3) to change the max nb of attempts.
+    """
+    if fn is None:
+        return lambda fn: retry(fn, attempts, budget)
+    budget = budget or RETRY_BUDGET
+    log_attempt = before_log(logger, logging.INFO)
+
+    def before(retry_state):
+        if retry_state.attempt_number == 1:
+            budget.record("calls")
+        log_attempt(retry_state)
 
-def retry(fn):
     return _retry(
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        stop=stop_after_attempt(5),
+        retry=retry_if_transient_error(attempts, budget),
+        wait=wait_retry_after_or_full_jitter(),
         reraise=True,
-        before=before_log(logger, logging.INFO),
+        before=before,
         before_sleep=before_sleep_log(logger, logging.INFO),
     )(fn)
+
+
+def is_retryable(exception):
+    """
+    Whether an error may be transient: HTTP errors are retryable if their status is
+    not a 4xx one (except 408 Request Timeout and 429 Too Many Requests).
+    """
+    if isinstance(exception, NON_RETRYABLE_EXCEPTIONS):
+        return False
+    status_code = get_status_code(exception)
+    if status_code is not None and 400 <= status_code < 500:
+        return status_code in RETRYABLE_STATUS_CODES
+    return True
+
+
+def get_status_code(exception):
+    """
+    HTTP status of the response an error was raised for, if any (requests, botocore,
+    googleapiclient and facebook_business errors).
+    """
+    response = getattr(exception, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if status_code is None and isinstance(response, dict):
+        status_code = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    if status_code is None:
+        status_code = getattr(getattr(exception, "resp", None), "status", None)
+    if status_code is None and callable(getattr(exception, "http_status", None)):
+        status_code = exception.http_status()
+    try:
+        return int(status_code) if status_code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def get_retry_after(exception):
+    """
+    Nb of seconds to wait given by the Retry-After header of the response an error was
+    raised for, if any.
+    """
+    response = getattr(exception, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None and isinstance(response, dict):
+        headers = response.get("ResponseMetadata", {}).get("HTTPHeaders")
+    if headers is None:
+        headers = getattr(exception, "resp", None)
+    if headers is None and callable(getattr(exception, "http_headers", None)):
+        headers = exception.http_headers()
+    if not hasattr(headers, "items"):
+        return None
+    for name, value in headers.items():
+        if str(name).lower() == "retry-after":
+            return parse_retry_after(value)
+    return None
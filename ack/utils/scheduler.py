@@ -0,0 +1,115 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ack.config import logger
+
+
+class Job:
+    """
+    Unit of work run by the scheduler.
+    Params
+        :name (str): name of the job, used in logs and in the run summary
+        :run (callable): function running the job, without arguments
+        :connectors (list): names of the connectors used by the job, for per-connector limits
+        :global_clients (dict): {connector: credentials} of the connectors used with a
+        process-wide client: jobs using such a connector with other credentials cannot
+        run at the same time
+    """
+
+    def __init__(self, name, run, connectors=(), global_clients=None):
+        self.name = name
+        self.run = run
+        self.connectors = list(connectors)
+        self.global_clients = global_clients or {}
+
+
+class JobResult:
+    def __init__(self, job, duration, error=None):
+        self.name = job.name
+        self.duration = duration
+        self.error = error
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+
+def run_jobs(jobs, max_concurrent_jobs=1, connector_limits=None):
+    """
+    Run jobs on a pool of worker threads, in order, and return their results.
+    At most max_concurrent_jobs jobs are in flight, and at most connector_limits[connector]
+    jobs using a given connector. A job that cannot start yet because of a connector limit
+    does not block the next jobs. A failed job does not stop the other jobs: its error is
+    logged and returned in its result.
+    """
+    connector_limits = connector_limits or {}
+    pending, running, results = list(jobs), {}, {}
+
+    with ThreadPoolExecutor(max_workers=max_concurrent_jobs, thread_name_prefix="ack-job") as executor:
+        while pending or running:
+            for job in list(pending):
+                if len(running) >= max_concurrent_jobs:
+                    break
+                if _can_start(job, running.values(), connector_limits):
+                    pending.remove(job)
+                    logger.info(f"Starting job {job.name}")
+                    running[executor.submit(_run_job, job)] = job
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                results[job] = future.result()
+
+    return [results[job] for job in jobs]
+
+
+def log_job_results(results):
+    """
+    Log the status of every job, and return the nb of failed jobs.
+    """
+    for result in results:
+        status = "succeeded" if result.succeeded else f"failed: {result.error!r}"
+        logger.info(f"Job {result.name} {status} ({result.duration:.1f}s)")
+    n_failed = len([result for result in results if not result.succeeded])
+    logger.info(f"{len(results) - n_failed} of {len(results)} jobs succeeded")
+    return n_failed
+
+
+def _can_start(job, running_jobs, connector_limits):
+    for connector in set(job.connectors):
+        if connector in connector_limits:
+            n_running = len([running_job for running_job in running_jobs if connector in running_job.connectors])
+            if n_running >= connector_limits[connector]:
+                return False
+    for connector, credentials in job.global_clients.items():
+        for running_job in running_jobs:
+            if running_job.global_clients.get(connector, credentials) != credentials:
+                return False
+    return True
+
+
+def _run_job(job):
+    start = time.perf_counter()
+    try:
+        job.run()
+    except Exception as err:
+        logger.exception(f"Job {job.name} failed")
+        return JobResult(job, time.perf_counter() - start, err)
+    return JobResult(job, time.perf_counter() - start)
@@ -0,0 +1,166 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import os
+import pickle
+import sqlite3
+import time
+
+from ack.config import logger
+
+SQLITE_STATE_TABLE = "state"
+SQLITE_TIMEOUT_SECONDS = 30
+
+
+class StateService:
+    """
+    Checkpointing service storing the state of a reader (e.g. watermarks) in a backend,
+    under the namespace given by its name.
+
+    Values passed to checkpoint() are coalesced in memory, keeping the max value of each
+    key, and written in a single update by flush(): every checkpoint_rows calls or
+    checkpoint_seconds seconds, if set, and when the stream they belong to is committed
+    (see Stream.on_commit), i.e. once its records have been written.
+
+    Backends implement _get_value and _set_values, and set _enabled in their constructor.
+    """
+
+    _enabled = False
+
+    def __init__(self, name, checkpoint_rows=None, checkpoint_seconds=None):
+        self._name = name
+        self._checkpoint_rows = checkpoint_rows
+        self._checkpoint_seconds = checkpoint_seconds
+        self._pending = {}
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+        if not self._enabled:
+            logger.info("No checkpointing")
+
+    def get(self, key):
+        if self._enabled:
+            return self._get_value(key)
+
+    def set(self, key, value):
+        if self._enabled:
+            self._set_values({key: value})
+
+    def checkpoint(self, key, value):
+        """
+        Keep the max value of key in memory, until it is flushed.
+        """
+        if not self._enabled or value is None:
+            return
+        pending = self._pending.get(key)
+        try:
+            is_greater = pending is None or value > pending
+        except TypeError:
+            is_greater = True
+        if is_greater:
+            self._pending[key] = value
+        self._pending_rows += 1
+        if self._is_flush_due():
+            self.flush()
+
+    def flush(self):
+        """
+        Write the values kept in memory, in a single update.
+        """
+        if self._pending:
+            self._set_values(self._pending)
+            logger.info(f"Checkpointed {self._pending} ({self._name})")
+            self._pending = {}
+        self._pending_rows = 0
+        self._last_flush = time.monotonic()
+
+    def commit(self):
+        """
+        Hook called once the records the values kept in memory were taken from have been written.
+        """
+        if self._enabled:
+            self.flush()
+
+    def _is_flush_due(self):
+        return (self._checkpoint_rows is not None and self._pending_rows >= self._checkpoint_rows) or (
+            self._checkpoint_seconds is not None and time.monotonic() - self._last_flush >= self._checkpoint_seconds
+        )
+
+    def _get_value(self, key):
+        raise NotImplementedError
+
+    def _set_values(self, values):
+        raise NotImplementedError
+
+
+class SQLiteStateService(StateService):
+    """
+    State service storing values in a table of a local SQLite database, one row per
+    (namespace, key). Values of a flush are written in a single transaction.
+    """
+
+    def __init__(self, name, path, checkpoint_rows=None, checkpoint_seconds=None):
+        if path:
+            logger.info(f"Using checkpointing service: {path} ({name})")
+            self._enabled = True
+            self._path = path
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            with self._connect() as connection:
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {SQLITE_STATE_TABLE} "
+                    "(namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB, PRIMARY KEY (namespace, key))"
+                )
+        super().__init__(name, checkpoint_rows, checkpoint_seconds)
+
+    def _connect(self):
+        return sqlite3.connect(self._path, timeout=SQLITE_TIMEOUT_SECONDS)
+
+    def _get_value(self, key):
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                f"SELECT value FROM {SQLITE_STATE_TABLE} WHERE namespace = ? AND key = ?", (self._name, key)
+            ).fetchone()
+        finally:
+            connection.close()
+        return pickle.loads(row[0]) if row else None
+
+    def _set_values(self, values):
+        connection = self._connect()
+        try:
+            # The connection context manager commits the transaction, or rolls it back on error
+            with connection:
+                connection.executemany(
+                    f"INSERT OR REPLACE INTO {SQLITE_STATE_TABLE} (namespace, key, value) VALUES (?, ?, ?)",
+                    [(self._name, key, pickle.dumps(value)) for key, value in values.items()],
+                )
+        finally:
+            connection.close()
+
+
+def create_state_service(name, host=None, port=6379, path=None, **kwargs):
+    """
+    Create the state service of a reader: backed by Redis if a host is given, by a local
+    SQLite database if a path is given, and disabled otherwise.
+    """
+    if host:
+        from ack.utils.redis import RedisStateService
+
+        return RedisStateService(name, host, port, **kwargs)
+    if path:
+        return SQLiteStateService(name, path, **kwargs)
+    return StateService(name, **kwargs)
@@ -23,6 +23,11 @@ from io import StringIO
 from itertools import islice
 
 from ack.config import logger
+from ack.streams.record_batch import RECORD_BATCH_SIZE, RecordBatch
+
+# Max nb of lines spanned by a quoted value of a flat file: beyond, its opening quote
+# is considered as unbalanced
+QUOTED_VALUE_MAX_LINES = 100
 
 
 def get_report_generator_from_flat_file(
@@ -48,24 +53,143 @@ def get_report_generator_from_flat_file(
         :add_column (bool): wether to add a fixed {column: value} at the end of each record
         :column_dict (dict): if add_column is True, {column: value} dictionnary
         to add at the end of each record (can include multiple column_names)
+
+    Lines are parsed by a single CSV reader, so that quoted values can include
+    delimiters and newlines. Lines whose length doesn't match the length of headers
+    are skipped, and counted in a single warning once the file has been read.
     """
+    rows = _parse_flat_file(line_iterator, delimiter, skip_n_first, skip_n_last)
+    headers = next(rows, None)
+    if headers is None:
+        return
+
+    for row in rows:
+        record = dict(zip(headers, row))
+        if add_column:
+            record.update(column_dict)
+        yield record
 
-    first_line = True
-    for line in skip(line_iterator, skip_n_first, skip_n_last):
-        line = decode_if_needed(line)
-        if first_line:
-            first_line = False
-            headers = parse_decoded_line(line, delimiter)
+
+def get_report_batches_from_flat_file(
+    line_iterator,
+    delimiter=",",
+    skip_n_first=0,
+    skip_n_last=0,
+    add_column=False,
+    column_dict={},
+    batch_size=RECORD_BATCH_SIZE,
+):
+    """
+    Same as get_report_generator_from_flat_file, but return a generator of RecordBatch
+    objects of at most batch_size records: the headers of the file are shared by all
+    batches, and records are kept as tuples of values.
+    """
+    rows = _parse_flat_file(line_iterator, delimiter, skip_n_first, skip_n_last)
+    headers = next(rows, None)
+    if headers is None:
+        return
+
+    if add_column:
+        added_headers = [column for column in column_dict if column not in headers]
+        if len(added_headers) == len(column_dict):
+            added_values = tuple(column_dict.values())
+            headers, rows = headers + added_headers, (tuple(row) + added_values for row in rows)
         else:
-            parsed_line = parse_decoded_line(line, delimiter)
-            if len(parsed_line) != len(headers):
-                logger.warning(f"Skipping line '{line}': length of parsed line doesn't match length of headers.")
-            else:
-                record = dict(zip(headers, parsed_line))
-                if add_column:
-                    yield {**record, **column_dict}
+            # Columns of the file are overwritten by column_dict, as they would be in a record
+            headers, rows = list({**dict.fromkeys(headers), **column_dict}), _update_rows(headers, rows, column_dict)
+
+    while True:
+        batch = [tuple(row) for row in islice(rows, batch_size)]
+        if not batch:
+            return
+        yield RecordBatch(headers, batch)
+
+
+def _parse_flat_file(line_iterator, delimiter, skip_n_first, skip_n_last):
+    """
+    Yield the headers of a flat file, followed by its rows whose length matches
+    the length of headers.
+    A row whose quoted value is not closed after QUOTED_VALUE_MAX_LINES lines, or before
+    the end of the file, is skipped: parsing resumes at the line following its first line.
+    """
+    lines = _RowLines(decode_if_needed(line) + "\n" for line in _skip_keeping_blank(line_iterator, skip_n_first, skip_n_last))
+    headers, n_skipped, first_skipped = None, 0, None
+    while True:
+        try:
+            for parsed_line in csv.reader(lines, delimiter=delimiter, quotechar='"', skipinitialspace=True):
+                if lines.end_of_file_reached:
+                    raise csv.Error("unexpected end of file in quoted value")
+                lines.row_lines.clear()
+                if not parsed_line:
+                    # Blank lines outside of quoted values
+                    continue
+                if headers is None:
+                    headers = parsed_line
+                    yield headers
+                elif len(parsed_line) != len(headers):
+                    n_skipped += 1
+                    first_skipped = first_skipped or delimiter.join(parsed_line)
                 else:
-                    yield record
+                    yield parsed_line
+            break
+        except (csv.Error, _UnclosedQuotedValue):
+            n_skipped += 1
+            first_skipped = first_skipped or lines.resync().rstrip("\n")
+
+    if n_skipped:
+        logger.warning(
+            f"Skipped {n_skipped} line(s) whose length doesn't match length of headers, e.g. '{first_skipped}'."
+        )
+
+
+class _UnclosedQuotedValue(Exception):
+    pass
+
+
+class _RowLines:
+    """
+    Iterator of the lines fed to a CSV reader, keeping the lines of the row being parsed,
+    so that parsing can resume at the line following the first line of a malformed row.
+    """
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._replayed_lines = deque()
+        self.row_lines = []
+        self.end_of_file_reached = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if len(self.row_lines) >= QUOTED_VALUE_MAX_LINES:
+            raise _UnclosedQuotedValue()
+        try:
+            line = self._replayed_lines.popleft() if self._replayed_lines else next(self._lines)
+        except StopIteration:
+            # The end of the file is only reached within a row if a quoted value is not closed
+            self.end_of_file_reached = bool(self.row_lines)
+            raise
+        self.row_lines.append(line)
+        return line
+
+    def resync(self):
+        """
+        Drop the first line of the row being parsed, and replay the next ones.
+        Return the dropped line.
+        """
+        first_line, next_lines = self.row_lines[0], self.row_lines[1:]
+        self._replayed_lines.extendleft(reversed(next_lines))
+        self.row_lines = []
+        self.end_of_file_reached = False
+        return first_line
+
+
+def _update_rows(headers, rows, column_dict):
+    for row in rows:
+        record = dict(zip(headers, row))
+        record.update(column_dict)
+        yield tuple(record.values())
 
 
 def decode_if_needed(line):
@@ -101,6 +225,30 @@ def skip(iterator, n_first, n_last):
     yield from iterator
 
 
+def _skip_keeping_blank(iterator, n_first, n_last):
+    """
+    Same as skip, but blank lines are kept between the lines which are not skipped,
+    as they can be part of quoted values.
+    """
+    iterator = iter(iterator)
+    if n_first > 0:
+        n_skipped = 0
+        for item in iterator:
+            n_skipped += bool(item)
+            if n_skipped == n_first:
+                break
+    pending_items, n_pending = deque(), 0
+    for item in iterator:
+        pending_items.append(item)
+        if item:
+            n_pending += 1
+            # The n_last last non-blank lines (and blank lines in between) are kept pending
+            while n_pending > n_last:
+                pending_item = pending_items.popleft()
+                n_pending -= bool(pending_item)
+                yield pending_item
+
+
 def skip_blank(iterator):
     for item in iterator:
         if item:
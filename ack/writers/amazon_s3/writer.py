@@ -39,7 +39,8 @@ class AmazonS3Writer(ObjectStorageWriter):
         return client.buckets.all()
 
     def _create_blob(self, file_name, stream):
-        self._bucket.upload_fileobj(stream.as_file(), file_name)
+        extra_args = {"ContentEncoding": stream.content_encoding} if stream.content_encoding else None
+        self._bucket.upload_fileobj(stream.as_file(), file_name, ExtraArgs=extra_args)
 
     def _get_uri(self, file_name):
         return f"s3{self._get_file_path(file_name)}"
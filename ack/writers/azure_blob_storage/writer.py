@@ -16,7 +16,7 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 from ack.writers.object_storage.writer import ObjectStorageWriter
-from azure.storage.blob import BlobServiceClient
+from azure.storage.blob import BlobServiceClient, ContentSettings
 
 
 class AzureBlobStorageWriter(ObjectStorageWriter):
@@ -35,7 +35,8 @@ class AzureBlobStorageWriter(ObjectStorageWriter):
 
     def _create_blob(self, file_name, stream):
         blob = self._bucket.get_blob_client(file_name)
-        blob.upload_blob(stream.as_file())
+        content_settings = ContentSettings(content_encoding=stream.content_encoding) if stream.content_encoding else None
+        blob.upload_blob(stream.as_file(), content_settings=content_settings)
 
     def _get_uri(self, file_name):
         return f"azure{self._get_file_path(file_name)}"
@@ -0,0 +1,103 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import threading
+
+from ack.config import logger
+from ack.streams.encoded_stream import EncodedStream
+from ack.utils.channel import END_OF_STREAM, Channel
+from ack.writers.writer import Writer
+
+BROADCAST_QUEUE_SIZE = 8
+BROADCAST_BATCH_SIZE = 500
+
+
+class BroadcastWriter(Writer):
+    """
+        Fan a stream out to several writers running in parallel.
+
+        Each record is encoded once, and the resulting bytes are pushed into a
+        bounded queue per writer. Every writer runs on its own thread, so the total
+        write time is close to the one of the slowest writer.
+    """
+
+    def __init__(self, writers, queue_size=BROADCAST_QUEUE_SIZE, batch_size=BROADCAST_BATCH_SIZE):
+        self._writers = writers
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+
+    def write(self, stream):
+        channels = [Channel(self._queue_size) for _ in self._writers]
+        errors = [None] * len(self._writers)
+        threads = [
+            threading.Thread(
+                target=self._run_writer,
+                args=(index, writer, EncodedStream(stream, iter(channel)), channel, errors),
+                name=f"{writer.__class__.__name__}-{index}",
+                daemon=True,
+            )
+            for index, (writer, channel) in enumerate(zip(self._writers, channels))
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            self._broadcast(stream, channels)
+        except Exception as err:
+            for channel in channels:
+                channel.put(err)
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+
+        self._raise_writer_errors(errors)
+
+    def _broadcast(self, stream, channels):
+        batch = []
+        for encoded_record in stream.read_encoded_records():
+            batch.append(encoded_record)
+            if len(batch) >= self._batch_size:
+                self._put(channels, batch)
+                batch = []
+            if all(channel.closed for channel in channels):
+                logger.warning(f"All writers stopped before the end of stream {stream.name}")
+                return
+        if batch:
+            self._put(channels, batch)
+        self._put(channels, END_OF_STREAM)
+
+    @staticmethod
+    def _put(channels, item):
+        for channel in channels:
+            channel.put(item)
+
+    @staticmethod
+    def _run_writer(index, writer, stream, channel, errors):
+        try:
+            writer.write(stream)
+        except Exception as err:
+            logger.error(f"{writer.__class__.__name__} failed to write stream {stream.name}: {err}")
+            errors[index] = err
+        finally:
+            channel.close()
+
+    @staticmethod
+    def _raise_writer_errors(errors):
+        for error in errors:
+            if error is not None:
+                raise error
@@ -20,6 +20,8 @@ from google.cloud import bigquery
 from ack import config
 from ack.config import logger
 from ack.clients.google.client import GoogleClient
+from ack.streams.compression import GZIP, ZSTD
+from ack.streams.csv_stream import CSVStream
 from ack.streams.normalized_json_stream import NormalizedJSONStream
 from ack.utils.retry import retry
 from ack.writers.google_cloud_storage.writer import GoogleCloudStorageWriter
@@ -47,13 +49,21 @@ class GoogleBigQueryWriter(Writer, GoogleClient):
     def write(self, stream):
 
         normalized_stream = NormalizedJSONStream.create_from_stream(stream)
+        if stream.is_encoded_by(CSVStream):
+            # The header of the CSV file gives the column names of the table
+            normalized_stream = CSVStream.create_from_stream(normalized_stream)
+        if normalized_stream.compression == ZSTD:
+            # BigQuery loads gzip-compressed files, but not zstd-compressed ones
+            normalized_stream.compress(GZIP)
 
         gcs_writer = GoogleCloudStorageWriter(self._bucket, self._project_id)
-        gcs_uri, blob = gcs_writer.write(normalized_stream)
+        # Parts of a rolled stream are loaded at once through a wildcard uri
+        gcs_uri, file_names = gcs_writer.write(normalized_stream)
 
         table_ref = self._get_table_ref()
 
-        load_job = self._client.load_table_from_uri(gcs_uri, table_ref, job_config=self.job_config())
+        job_config = self.job_config(csv=normalized_stream.is_encoded_by(CSVStream))
+        load_job = self._client.load_table_from_uri(gcs_uri, table_ref, job_config=job_config)
 
         logger.info(f"Loading data into BigQuery {self._dataset}:{self._table}")
         result = load_job.result()
@@ -62,7 +72,8 @@ class GoogleBigQueryWriter(Writer, GoogleClient):
 
         if not self._keep_files:
             logger.info(f"Deleting GCS file: {gcs_uri}")
-            blob.delete()
+            for file_name in file_names:
+                gcs_writer.delete(file_name)
 
     def _get_dataset(self):
         dataset_ref = self._client.dataset(self._dataset)
@@ -72,10 +83,14 @@ class GoogleBigQueryWriter(Writer, GoogleClient):
         dataset = self._get_dataset()
         return dataset.table(self._table)
 
-    def job_config(self):
+    def job_config(self, csv=False):
         job_config = bigquery.LoadJobConfig()
         job_config.create_disposition = bigquery.job.CreateDisposition.CREATE_IF_NEEDED
-        job_config.source_format = bigquery.job.SourceFormat.NEWLINE_DELIMITED_JSON
+        if csv:
+            job_config.source_format = bigquery.job.SourceFormat.CSV
+            job_config.skip_leading_rows = 1
+        else:
+            job_config.source_format = bigquery.job.SourceFormat.NEWLINE_DELIMITED_JSON
         job_config.autodetect = True
 
         if self._write_disposition == "truncate":
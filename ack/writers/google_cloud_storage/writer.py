@@ -39,8 +39,12 @@ class GoogleCloudStorageWriter(ObjectStorageWriter, GoogleClient):
 
     def _create_blob(self, file_name, stream):
         blob = self._bucket.blob(file_name)
+        blob.content_encoding = stream.content_encoding
         blob.upload_from_file(stream.as_file(), content_type=stream.mime_type)
 
+    def delete(self, file_name):
+        self._bucket.blob(file_name).delete()
+
     def _get_uri(self, file_name):
         return f"gs{self._get_file_path(file_name)}"
 
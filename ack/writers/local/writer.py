@@ -17,8 +17,10 @@
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
 import os
+import shutil
 
 from ack.config import logger
+from ack.streams.compression import COMPRESSION_EXTENSIONS
 from ack.writers.writer import Writer
 
 
@@ -30,16 +32,34 @@ class LocalWriter(Writer):
     def write(self, stream):
         """
         Write file to disk at location given as parameter.
+        If the stream is rolled, each part is written to its own file.
         """
-        file_name = self._file_name or stream.name
+        if stream.is_rolled:
+            for part in stream.parts():
+                try:
+                    self._write_file(part, part.name if self._file_name is None else self._get_file_name(stream, part.index))
+                finally:
+                    part.close()
+        else:
+            self._write_file(stream, stream.name if self._file_name is None else self._get_file_name(stream))
+
+    def _write_file(self, stream, file_name):
         path = os.path.join(self._directory, file_name)
 
         logger.info(f"Writing stream {file_name} to {path}")
-        file = stream.as_file()
         with open(path, "wb") as h:
-            while True:
-                buffer = file.read(1024)
-                if len(buffer) > 0:
-                    h.write(buffer)
-                else:
-                    break
+            shutil.copyfileobj(stream.as_file(), h)
+
+    def _get_file_name(self, stream, part_index=None):
+        """
+        Build the file name set on the writer, with the index of the part if any, and the
+        extension of the compression of the stream (e.g. ".gz"), as stream names have.
+        """
+        compression_extension = f".{COMPRESSION_EXTENSIONS[stream.compression]}" if stream.compression else ""
+        file_name = self._file_name
+        if compression_extension and file_name.endswith(compression_extension):
+            file_name = file_name[: -len(compression_extension)]
+        root, extension = os.path.splitext(file_name)
+        if part_index is not None:
+            root = f"{root}-{part_index:05d}"
+        return f"{root}{extension}{compression_extension}"
@@ -1 +1,2 @@
 S3_KEY_SIZE_LIMIT = 1024
+MAX_CONCURRENT_PART_UPLOADS = 4
@@ -16,10 +16,13 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from ack.config import logger
+from ack.utils.retry import retry
 from ack.writers.writer import Writer
-from ack.writers.object_storage.config import S3_KEY_SIZE_LIMIT
+from ack.writers.object_storage.config import MAX_CONCURRENT_PART_UPLOADS, S3_KEY_SIZE_LIMIT
 from datetime import datetime
 
 
@@ -32,10 +35,60 @@ class ObjectStorageWriter(Writer):
         self._bucket = self._get_bucket_if_exist()
 
     def write(self, stream):
+        """
+        Write the stream as a single file, or as one file per part if the stream is rolled.
+        Returns the uri of the written file (with a wildcard matching every part if the
+        stream is rolled) and the list of the written file names.
+        """
         logger.info(f"Start writing file to {self._platform} ...")
-        self._set_valid_file_name(stream.name)
-        final_name = os.path.join(self._prefix, self._file_name)
+        final_name = os.path.join(self._prefix, self._get_valid_file_name(stream.name, stream.suffix))
+        if stream.is_rolled:
+            file_names = self._write_parts(stream)
+            return self._get_uri(f"{final_name[: len(final_name) - len(stream.suffix)]}-*{stream.suffix}"), file_names
         self._write_aux(stream, final_name)
+        return self._get_uri(final_name), [final_name]
+
+    def _write_parts(self, stream):
+        """
+        Upload the parts of the stream on a pool of worker threads, while the next parts
+        are being built. At most MAX_CONCURRENT_PART_UPLOADS parts are held at the same time,
+        and each part is retried on its own, as it can be read several times.
+        """
+        file_names, in_flight = [], deque()
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PART_UPLOADS, thread_name_prefix="ack-part") as executor:
+            try:
+                for part in stream.parts():
+                    while len(in_flight) >= MAX_CONCURRENT_PART_UPLOADS:
+                        wait(in_flight, return_when=FIRST_COMPLETED)
+                        self._collect_uploaded_parts(in_flight, file_names)
+                    final_name = os.path.join(self._prefix, self._get_valid_file_name(part.name, part.suffix))
+                    in_flight.append(executor.submit(self._write_part, part, final_name))
+                while in_flight:
+                    wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._collect_uploaded_parts(in_flight, file_names)
+            finally:
+                for future in in_flight:
+                    future.cancel()
+        logger.info(f"Wrote {len(file_names)} parts of stream {stream.name} to {self._bucket_name} on {self._platform}")
+        return file_names
+
+    @staticmethod
+    def _collect_uploaded_parts(in_flight, file_names):
+        for future in [future for future in in_flight if future.done()]:
+            in_flight.remove(future)
+            file_names.append(future.result())
+        file_names.sort()
+
+    def _write_part(self, part, final_name):
+        try:
+            self._write_part_with_retry(part, final_name)
+        finally:
+            part.close()
+        return final_name
+
+    @retry
+    def _write_part_with_retry(self, part, final_name):
+        self._write_aux(part, final_name)
 
     def _write_aux(self, stream, final_name):
         self._create_blob(final_name, stream)
@@ -58,16 +111,20 @@ class ObjectStorageWriter(Writer):
     def _get_file_path(self, file_name):
         return f"://{self._bucket_name}/{file_name}"
 
-    def _set_valid_file_name(self, stream_name):
-        file_format = os.path.splitext(stream_name)[-1]
+    def _get_valid_file_name(self, stream_name, suffix=None):
+        """
+        Build the file name of a stream without altering the writer state,
+        so that a writer can write several streams at the same time.
+        The suffix (e.g. ".njson.gz") is appended to the file name set on the writer, if any.
+        """
+        file_format = suffix if suffix is not None else os.path.splitext(stream_name)[-1]
         temp_file_name = f"{self._file_name}{file_format}" if self._file_name is not None else stream_name
         temp_key = os.path.join(self._prefix, temp_file_name)
 
         if len(temp_key) > S3_KEY_SIZE_LIMIT and self._platform == "S3":
             logger.warning(f"The key {temp_key} is too long for S3, the file has been renamed as generic")
-            self._file_name = f"generic_file_name_{datetime.today().strftime('%Y-%m-%d-%H-%M-%S')}{file_format}"
-        else:
-            self._file_name = temp_file_name
+            return f"generic_file_name_{datetime.today().strftime('%Y-%m-%d-%H-%M-%S')}{file_format}"
+        return temp_file_name
 
     def _create_final_name(self):
         self.self._prefix, self._file_name, self._platform
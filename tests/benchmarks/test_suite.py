@@ -0,0 +1,83 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from ack.benchmarks.suite import BENCHMARKS, compare_results, run_suite
+from ack.benchmarks.synthetic import NullWriter, SyntheticReader, synthetic_flat_file_lines, synthetic_records
+from ack.entrypoints.bench.main import bench
+from click.testing import CliRunner
+
+PARAMS = {"n_records": 50, "width": 6, "nesting": 2, "n_date_columns": 2, "seed": 0}
+
+
+class SyntheticDataTest(TestCase):
+    def test_records_are_deterministic(self):
+        self.assertEqual(list(synthetic_records(**PARAMS)), list(synthetic_records(**PARAMS)))
+        self.assertNotEqual(list(synthetic_records(**PARAMS)), list(synthetic_records(**{**PARAMS, "seed": 1})))
+
+    def test_record_shape(self):
+        record = next(synthetic_records(**PARAMS))
+        self.assertEqual(len(record), 6 + 2 + 1)
+        self.assertEqual(record["date_0"], "2020-01-01")
+        self.assertIn("child", record["details"])
+
+    def test_flat_file_lines(self):
+        lines = list(synthetic_flat_file_lines(n_records=3, width=2, n_date_columns=1))
+        self.assertEqual(lines[0], b"Metric 0 (%),column_1,date_0")
+        self.assertEqual(len(lines), 4)
+
+    def test_null_writer_counts_bytes(self):
+        writer = NullWriter()
+        for stream in SyntheticReader(n_records=10, n_streams=2).read():
+            writer.write(stream)
+        expected = sum(len(json.dumps(record)) + 1 for seed in [0, 1] for record in synthetic_records(10, seed=seed))
+        self.assertEqual(writer.bytes_written, expected)
+
+
+class BenchmarkSuiteTest(TestCase):
+    def test_all_benchmarks_run(self):
+        results = run_suite(repeat=1, **PARAMS)
+
+        self.assertEqual(set(results["benchmarks"]), set(BENCHMARKS))
+        for result in results["benchmarks"].values():
+            self.assertEqual(result["records"], 50)
+            self.assertGreater(result["bytes"], 0)
+            self.assertGreater(result["records_per_second"], 0)
+
+    def test_compare_results(self):
+        results = run_suite(["json_stream"], repeat=1, **PARAMS)
+        baseline = json.loads(json.dumps(results))
+        baseline["benchmarks"]["json_stream"]["records_per_second"] /= 2
+
+        self.assertEqual(compare_results(results, baseline), {"json_stream": 2.0})
+        with self.assertRaises(ValueError):
+            compare_results(results, {**baseline, "parameters": {**PARAMS, "n_records": 10}})
+
+    def test_bench_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            result = CliRunner().invoke(
+                bench, ["--benchmark", "json_stream", "--n-records", "10", "--repeat", "1", "--output", output]
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertTrue(result.output.startswith("json_stream"))
+            with open(output) as f:
+                self.assertEqual(list(json.load(f)["benchmarks"]), ["json_stream"])
@@ -0,0 +1,154 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase, mock
+
+import httplib2
+from ack.clients.api.cache import CachingHttp, ResponseCache, api_requests, configure_response_cache, uncached
+from ack.clients.api.session import PooledSession
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    paths = []
+
+    def do_GET(self):
+        self.paths.append(self.path)
+        status = 500 if self.path == "/error" else 200
+        body = f"line 1\nline {len(self.paths)}\n".encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key(self):
+        key = self.cache.key("facebook", "GET", "https://api.com/report?b=2&a=1&access_token=abc")
+        self.assertEqual(key, self.cache.key("facebook", "get", "https://api.com/report?a=1&b=2&access_token=def"))
+        self.assertNotEqual(key, self.cache.key("facebook", "GET", "https://api.com/report?a=1&b=3"))
+        self.assertNotEqual(key, self.cache.key("adobe", "GET", "https://api.com/report?a=1&b=2"))
+        self.assertEqual(
+            self.cache.key("adobe", "POST", "https://api.com/report", b'{"start": "2020-01-01", "end": "2020-01-31"}'),
+            self.cache.key("adobe", "POST", "https://api.com/report", '{"end": "2020-01-31", "start": "2020-01-01"}'),
+        )
+
+    def test_get_and_set(self):
+        self.cache.set("0a1b", 200, {"Content-Type": "application/json", "Content-Encoding": "gzip"}, b"{}")
+        self.assertEqual(self.cache.get("0a1b"), (200, {"Content-Type": "application/json"}, b"{}"))
+        self.assertIsNone(self.cache.get("0a1c"))
+
+    def test_expired_entries(self):
+        cache = ResponseCache(self.directory.name, ttl=-1)
+        cache.set("0a1b", 200, {}, b"{}")
+        self.assertIsNone(cache.get("0a1b"))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ResponseCache(self.directory.name, max_bytes=150)
+        body = b"x" * 30
+        for key in ["aa", "bb"]:
+            cache.set(key, 200, {}, body)
+        for key, atime in [("aa", 2000), ("bb", 1000)]:
+            path = os.path.join(self.directory.name, key[:2], key)
+            os.utime(path, (atime, os.stat(path).st_mtime))
+        cache.set("cc", 200, {}, body)
+
+        self.assertIsNone(cache.get("bb"))
+        self.assertIsNotNone(cache.get("aa"))
+        self.assertIsNotNone(cache.get("cc"))
+
+
+class CachedRequestsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.paths.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        configure_response_cache(self.directory.name)
+        self.session = PooledSession(cache_namespace="test_api")
+
+    def tearDown(self):
+        configure_response_cache()
+        self.directory.cleanup()
+
+    def test_responses_are_replayed(self):
+        first = self.session.get(f"{self.url}/report?day=1", stream=True)
+        replayed = self.session.get(f"{self.url}/report?day=1", stream=True)
+
+        self.assertEqual(Handler.paths, ["/report?day=1"])
+        self.assertEqual(list(replayed.iter_lines()), list(first.iter_lines()))
+        self.assertEqual(replayed.text, "line 1\nline 1\n")
+        self.assertTrue(replayed.from_cache)
+
+    def test_replayed_requests_are_not_throttled(self):
+        throttle = mock.Mock()
+        for _ in range(2):
+            with api_requests(before=throttle) as sent_requests:
+                self.session.get(f"{self.url}/report")
+        self.assertEqual(sent_requests.count, 0)
+        throttle.assert_called_once()
+
+    def test_errors_are_not_cached(self):
+        self.session.get(f"{self.url}/error")
+        self.session.get(f"{self.url}/error")
+        self.assertEqual(len(Handler.paths), 2)
+
+    def test_uncached_requests(self):
+        self.session.get(f"{self.url}/status")
+        with uncached():
+            self.assertEqual(self.session.get(f"{self.url}/status").text, "line 1\nline 2\n")
+        self.assertEqual(len(Handler.paths), 2)
+
+    def test_disabled_cache(self):
+        configure_response_cache()
+        self.session.get(f"{self.url}/report")
+        self.session.get(f"{self.url}/report")
+        self.assertEqual(len(Handler.paths), 2)
+
+    def test_caching_http(self):
+        http = mock.Mock()
+        http.request.return_value = (httplib2.Response({"status": "200", "content-type": "application/json"}), b"{}")
+        caching_http = CachingHttp(http, "google_analytics")
+
+        for _ in range(2):
+            response, content = caching_http.request(f"{self.url}/batchGet", method="POST", body='{"viewId": "1"}')
+            self.assertEqual((response.status, content), (200, b"{}"))
+        http.request.assert_called_once()
@@ -0,0 +1,90 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase, mock
+
+from ack.clients.api.session import PooledSession, get_session
+from ack.clients.api.stats import HTTP_STATS
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client_ports = []
+
+    def do_GET(self):
+        self.client_ports.append(self.client_address[1])
+        status = 404 if self.path == "/missing" else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.send_header("Set-Cookie", "session=1")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+class PooledSessionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Handler.client_ports.clear()
+
+    def test_connections_are_reused(self):
+        session = PooledSession()
+        for _ in range(5):
+            self.assertEqual(session.get(f"{self.url}/page").json(), {})
+        self.assertEqual(len(set(Handler.client_ports)), 1)
+
+    def test_cookies_are_not_persisted(self):
+        session = PooledSession()
+        session.get(f"{self.url}/page")
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_stats_and_hooks(self):
+        hook = mock.Mock(return_value=None)
+        session = PooledSession(hooks=[hook])
+        start = HTTP_STATS.stats()
+        session.get(f"{self.url}/page")
+        session.get(f"{self.url}/missing")
+        stats = HTTP_STATS.stats()
+
+        self.assertEqual(stats["requests"] - start["requests"], 2)
+        self.assertEqual(stats["errors"] - start["errors"], 1)
+        self.assertEqual(hook.call_count, 2)
+
+    def test_default_timeout(self):
+        session = PooledSession(timeout=(1, 2))
+        with mock.patch("requests.Session.request") as request:
+            session.get(f"{self.url}/page")
+            session.get(f"{self.url}/page", timeout=5)
+        self.assertEqual([call.kwargs["timeout"] for call in request.call_args_list], [(1, 2), 5])
+
+    def test_shared_sessions(self):
+        self.assertIs(get_session("test_api"), get_session("test_api"))
+        self.assertIsNot(get_session("test_api"), get_session("other_api"))
@@ -68,14 +68,14 @@ class FacebookReaderTest(TestCase):
             ("ad_management_inputs_time_increment_check", {"ad_insights": False, "time_increment": "1"}),
         ]
     )
-    @mock.patch.object(FacebookAdsApi, "init", lambda *args: None)
+    @mock.patch.object(FacebookAdsApi, "init", lambda *args: mock.MagicMock())
     def test_validate_inputs(self, name, parameters):
         temp_kwargs = self.kwargs.copy()
         temp_kwargs.update(parameters)
         with self.assertRaises(ClickException):
             FacebookReader(**temp_kwargs)
 
-    @mock.patch.object(FacebookAdsApi, "init", lambda *args: None)
+    @mock.patch.object(FacebookAdsApi, "init", lambda *args: mock.MagicMock())
     def test_get_api_fields(self):
         temp_kwargs = self.kwargs.copy()
         temp_kwargs.update(
@@ -88,7 +88,7 @@ class FacebookReaderTest(TestCase):
         expected = ["impressions", "actions"]
         self.assertEqual(set(FacebookReader(**temp_kwargs)._api_fields), set(expected))
 
-    @mock.patch.object(FacebookAdsApi, "init", lambda *args: None)
+    @mock.patch.object(FacebookAdsApi, "init", lambda *args: mock.MagicMock())
     def test_get_field_paths(self):
 
         temp_kwargs = self.kwargs.copy()
@@ -108,7 +108,7 @@ class FacebookReaderTest(TestCase):
 
     @mock.patch("ack.readers.facebook.reader.FacebookReader.query_ad_insights")
     @mock.patch.object(FacebookReader, "get_params", lambda *args: {})
-    @mock.patch.object(FacebookAdsApi, "init", lambda *args: None)
+    @mock.patch.object(FacebookAdsApi, "init", lambda *args: mock.MagicMock())
     def test_read_with_ad_insights_query(self, mock_query_ad_insights):
         temp_kwargs = self.kwargs.copy()
         temp_kwargs.update({"ad_insights": True, "field": ["date_start", "impressions"]})
@@ -129,7 +129,7 @@ class FacebookReaderTest(TestCase):
 
     @mock.patch("ack.readers.facebook.reader.FacebookReader.query_ad_management")
     @mock.patch.object(FacebookReader, "get_params", lambda *args: {})
-    @mock.patch.object(FacebookAdsApi, "init", lambda *args: None)
+    @mock.patch.object(FacebookAdsApi, "init", lambda *args: mock.MagicMock())
     def test_read_with_ad_management_query(self, mock_query_ad_management):
         temp_kwargs = self.kwargs.copy()
         temp_kwargs.update({"ad_insights": False, "field": ["id", "status"]})
@@ -210,7 +210,7 @@ class FacebookReaderTest(TestCase):
             ),
         ]
     )
-    @mock.patch.object(FacebookAdsApi, "init", lambda *args: None)
+    @mock.patch.object(FacebookAdsApi, "init", lambda *args: mock.MagicMock())
     def test_format_and_yield(self, name, parameters, record, expected):
         temp_kwargs = self.kwargs.copy()
         temp_kwargs.update(parameters)
@@ -0,0 +1,53 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from unittest import TestCase
+
+from ack.readers.mysql.config import MySQLReaderConfig
+from pydantic import ValidationError
+
+
+class MySQLReaderConfigTest(TestCase):
+    config = {
+        "user": "user",
+        "password": "password",
+        "host": "localhost",
+        "database": "database",
+        "watermark_column": "updated_at",
+        "watermark_init": "2020-01-01",
+        "query": "SELECT * FROM table",
+        "query_name": "query",
+        "table": "table",
+        "redis_state_service_name": "mysql_state",
+    }
+
+    def test_sqlite_state_service(self):
+        config = MySQLReaderConfig(**self.config, sqlite_state_service_path="state.db")
+        self.assertEqual(config.sqlite_state_service_path, "state.db")
+        self.assertIsNone(config.redis_state_service_host)
+
+    def test_redis_state_service(self):
+        config = MySQLReaderConfig(**self.config, redis_state_service_host="localhost")
+        self.assertEqual(config.redis_state_service_host, "localhost")
+
+    def test_missing_state_service(self):
+        with self.assertRaisesRegex(ValidationError, "A Redis host or a SQLite path must be given"):
+            MySQLReaderConfig(**self.config)
+
+    def test_both_state_services(self):
+        with self.assertRaisesRegex(ValidationError, "Cannot specify both a Redis host and a SQLite path"):
+            MySQLReaderConfig(**self.config, redis_state_service_host="localhost", sqlite_state_service_path="state.db")
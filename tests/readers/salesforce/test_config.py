@@ -0,0 +1,49 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from unittest import TestCase
+
+from ack.readers.salesforce.config import SalesforceReaderConfig
+from pydantic import ValidationError
+
+
+class SalesforceReaderConfigTest(TestCase):
+    config = {
+        "consumer_key": "key",
+        "consumer_secret": "secret",
+        "user": "user",
+        "password": "password",
+        "watermark_column": "LastModifiedDate",
+        "watermark_init": "2020-01-01T00:00:00Z",
+        "query": "SELECT Id FROM Account",
+        "query_name": "accounts",
+        "table": "Account",
+        "redis_state_service_name": "salesforce_state",
+    }
+
+    def test_sqlite_state_service(self):
+        config = SalesforceReaderConfig(**self.config, sqlite_state_service_path="state.db")
+        self.assertEqual(config.sqlite_state_service_path, "state.db")
+        self.assertIsNone(config.redis_state_service_host)
+
+    def test_missing_state_service(self):
+        with self.assertRaisesRegex(ValidationError, "A Redis host or a SQLite path must be given"):
+            SalesforceReaderConfig(**self.config)
+
+    def test_both_state_services(self):
+        with self.assertRaisesRegex(ValidationError, "Cannot specify both a Redis host and a SQLite path"):
+            SalesforceReaderConfig(**self.config, redis_state_service_host="localhost", sqlite_state_service_path="state.db")
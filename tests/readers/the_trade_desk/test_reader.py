@@ -21,6 +21,7 @@ from unittest import TestCase, mock
 
 from ack.readers.the_trade_desk.reader import TheTradeDeskReader
 from ack.utils.exceptions import DateDefinitionException
+from ack.utils.poller import JobPoller
 
 
 class TheTradeDeskReaderTest(TestCase):
@@ -112,7 +113,7 @@ class TheTradeDeskReaderTest(TestCase):
         self.assertEqual(reader.report_schedule_id, 5678)
 
     @mock.patch("ack.readers.the_trade_desk.reader.TheTradeDeskReader._build_headers", return_value={})
-    @mock.patch("tenacity.BaseRetrying.wait", side_effect=lambda *args, **kwargs: 0)
+    @mock.patch("ack.utils.poller.get_poller", lambda: JobPoller(min_interval=0))
     @mock.patch(
         "ack.readers.the_trade_desk.reader.TheTradeDeskReader._make_api_call",
         side_effect=[
@@ -142,14 +143,13 @@ class TheTradeDeskReaderTest(TestCase):
             },
         ],
     )
-    def test_wait_for_download_url(self, mock_build_headers, mock_retry, mock_api_call):
+    def test_wait_for_download_url(self, mock_build_headers, mock_api_call):
         reader = TheTradeDeskReader(**self.kwargs)
         reader.report_schedule_id = 5678
         reader._wait_for_download_url()
         self.assertEqual(reader.download_url, "https://download.url")
 
     @mock.patch("ack.readers.the_trade_desk.reader.TheTradeDeskReader._build_headers", return_value={})
-    @mock.patch("tenacity.BaseRetrying.wait", side_effect=lambda *args, **kwargs: 0)
     @mock.patch.object(TheTradeDeskReader, "_get_report_template_id", lambda *args: None)
     @mock.patch.object(TheTradeDeskReader, "_create_report_schedule", lambda *args: None)
     @mock.patch.object(TheTradeDeskReader, "_wait_for_download_url", lambda *args: None)
@@ -163,7 +163,7 @@ class TheTradeDeskReaderTest(TestCase):
             ]
         ),
     )
-    def test_read(self, mock_build_headers, mock_retry, mock_download_report):
+    def test_read(self, mock_build_headers, mock_download_report):
         reader = TheTradeDeskReader(**self.kwargs)
         reader.report_template_id = 1234
         reader.report_schedule_id = 5678
@@ -16,6 +16,7 @@
 # along with this program; if not, write to the Free Software Foundation,
 # Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 
+from concurrent.futures import Future
 from datetime import datetime
 from unittest import TestCase, mock
 
@@ -295,3 +296,15 @@ class TwitterReaderTest(TestCase):
         ]
         for output_record, expected_record in zip(output.readlines(), iter(expected)):
             self.assertEqual(output_record, expected_record)
+
+    @mock.patch.object(Client, "__init__", lambda *args: None)
+    @mock.patch.object(Client, "accounts", lambda *args: None)
+    def test_pending_jobs_are_cancelled_if_a_job_fails(self):
+        failed_job, pending_job = Future(), Future()
+        failed_job.set_exception(ValueError("Job failed"))
+        reader = TwitterReader(**self.kwargs)
+
+        with mock.patch("ack.readers.twitter.reader.get_poller") as get_poller, self.assertRaises(ValueError):
+            get_poller.return_value.submit.side_effect = [failed_job, pending_job]
+            reader.get_analytics_report(["123", "456"])
+        self.assertTrue(pending_job.cancelled())
@@ -106,3 +106,38 @@ class TestsWithImplementedMethods(unittest.TestCase):
         string_arrray = bytes_array.decode("utf-8")
         res = string_arrray.split("\n")
         assert int(res[10]) == 10 ** 2
+
+    def test_can_read_as_a_file_with_small_buffer(self):
+        testStream = self.miniStream("test_file_3", (str(x) * 1000 for x in range(11)))
+        file = testStream.as_file(buffer_size=16)
+        res = file.read().decode("utf-8").split("\n")
+        assert res[:-1] == [str(x) * 1000 for x in range(11)]
+        assert file.tell() == sum(len(str(x)) * 1000 + 1 for x in range(11))
+
+    def test_can_read_as_a_file_in_large_blocks(self):
+        testStream = self.miniStream("test_file_4", range(100000))
+        file = testStream.as_file()
+        blocks = []
+        buffer = file.read(1000003)
+        while len(buffer) > 0:
+            blocks.append(buffer)
+            buffer = file.read(1000003)
+        res = b"".join(blocks).decode("utf-8").split("\n")
+        assert [int(x) for x in res[:-1]] == list(range(100000))
+
+    def test_encoded_records_stages_apply_to_file_and_parts(self):
+        seen = []
+
+        def observe(encoded_records):
+            for encoded_record in encoded_records:
+                seen.append(encoded_record)
+                yield encoded_record
+
+        testStream = self.miniStream("test_file_5", range(3)).map_encoded_records(observe)
+        assert testStream.as_file().read() == b"0\n1\n2\n"
+        assert seen == [b"0\n", b"1\n", b"2\n"]
+
+    def test_base_name(self):
+        testStream = self.miniStream("results", range(3))
+        assert testStream.base_name == "results"
+        assert testStream.name.startswith("results_")
@@ -0,0 +1,81 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import gzip
+import json
+from unittest import TestCase
+
+import zstandard
+from ack.streams.encoded_stream import EncodedStream
+from ack.streams.json_stream import JSONStream
+from ack.streams.normalized_json_stream import NormalizedJSONStream
+from parameterized import parameterized
+
+
+def record_generator(n):
+    for i in range(n):
+        yield {"Ad Name": f"ad_{i}", "Impressions": i}
+
+
+def read_chunked(file, size=1000):
+    content = b""
+    buffer = file.read(size)
+    while len(buffer) > 0:
+        content += buffer
+        buffer = file.read(size)
+    return content
+
+
+class StreamCompressionTest(TestCase):
+    @parameterized.expand(
+        [
+            ("gzip", "njson.gz", gzip.decompress),
+            ("zstd", "njson.zst", lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)),
+        ]
+    )
+    def test_compressed_stream(self, compression, extension, decompress):
+        stream = JSONStream("test", record_generator(10000)).compress(compression)
+
+        self.assertTrue(stream.name.endswith(f".{extension}"))
+        self.assertEqual(stream.content_encoding, compression)
+        content = read_chunked(stream.as_file(buffer_size=4096))
+        lines = decompress(content).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line) for line in lines], list(record_generator(10000)))
+
+    def test_uncompressed_stream(self):
+        stream = JSONStream("test", record_generator(1))
+        self.assertTrue(stream.name.endswith(".njson"))
+        self.assertIsNone(stream.content_encoding)
+
+    def test_unknown_compression(self):
+        with self.assertRaisesRegex(ValueError, "Unknown compression bz2"):
+            JSONStream("test", record_generator(1)).compress("bz2")
+
+    def test_empty_compressed_stream(self):
+        stream = JSONStream("test", record_generator(0)).compress("gzip")
+        self.assertEqual(gzip.decompress(stream.as_file().read()), b"")
+
+    def test_compression_is_kept_by_derived_streams(self):
+        source = JSONStream("test", record_generator(3)).compress("gzip")
+        normalized = NormalizedJSONStream.create_from_stream(source)
+        encoded = EncodedStream(normalized, (normalized.encode_record_as_bytes(r) for r in normalized))
+
+        self.assertEqual(normalized.compression, "gzip")
+        self.assertEqual(normalized.name.count(".njson.gz"), 1)
+        self.assertEqual(encoded.name, normalized.name)
+        lines = gzip.decompress(encoded.as_file().read()).splitlines()
+        self.assertEqual(json.loads(lines[2]), {"Ad_Name": "ad_2", "Impressions": 2})
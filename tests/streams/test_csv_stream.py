@@ -0,0 +1,87 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import csv
+import io
+from unittest import TestCase
+
+from ack.streams.csv_stream import CSVStream, LateKeyError
+from ack.streams.encoded_stream import EncodedStream
+from ack.streams.format_date_stream import FormatDateStream
+from ack.streams.json_stream import JSONStream
+from ack.writers.broadcast_writer import BroadcastWriter
+from ack.writers.writer import Writer
+
+
+def report_generator(n_rows, n_columns=50):
+    for i in range(n_rows):
+        yield {f"Metric Column {j}": str(i * j) for j in range(n_columns)}
+
+
+class CSVStreamTest(TestCase):
+    def test_header_is_written_once(self):
+        records = [{"Date": "2020-01-01", "Clicks": 1}, {"Date": "2020-01-02", "Clicks": 2}]
+        content = CSVStream("test", iter(records)).as_file().read()
+        self.assertEqual(content, b"Date,Clicks\n2020-01-01,1\n2020-01-02,2\n")
+
+    def test_columns_are_discovered_from_the_first_records(self):
+        records = [{"a": 1}, {"b": 2}, {"a": 3, "c": 4}]
+        stream = CSVStream("test", iter(records), header_sample_size=2)
+        with self.assertLogs(level="WARNING") as logs:
+            content = stream.as_file().read()
+
+        self.assertEqual(stream.columns, ["a", "b"])
+        self.assertEqual(content, b"a,b\n1,\n,2\n3,\n")
+        self.assertIn("Ignoring keys ['c']", logs.output[0])
+
+    def test_late_keys_can_fail(self):
+        records = [{"a": 1}, {"a": 2, "b": 3}]
+        stream = CSVStream("test", iter(records), header_sample_size=1, late_keys="fail")
+        with self.assertRaises(LateKeyError):
+            stream.as_file().read()
+
+    def test_values_are_quoted(self):
+        records = [{"text": 'multi\nline, "quoted"', "list": [1, 2], "none": None}]
+        content = CSVStream("test", iter(records)).as_file().read().decode("utf-8")
+        row = list(csv.DictReader(io.StringIO(content)))[0]
+        self.assertEqual(row, {"text": 'multi\nline, "quoted"', "list": "[1, 2]", "none": ""})
+
+    def test_create_from_stream_keeps_source_transformation(self):
+        source = FormatDateStream("test", iter([{"Date": "2020/01/27"}]), keys=["Date"])
+        stream = CSVStream.create_from_stream(source)
+        self.assertEqual(stream.name.split(".")[-1], "csv")
+        self.assertEqual(stream.as_file().read(), b"Date\n2020-01-27\n")
+
+    def test_encoded_stream_decodes_records(self):
+        source = CSVStream("test", iter([{"a": "1", "b": "x\ny"}, {"a": "2"}]))
+        encoded = EncodedStream(source, source.encoded_records())
+        self.assertEqual([record for record in encoded], [{"a": "1", "b": "x\ny"}, {"a": "2", "b": ""}])
+
+    def test_broadcast_sends_header_to_every_writer(self):
+        class MemoryWriter(Writer):
+            def write(self, stream):
+                self.content = stream.as_file().read()
+
+        writers = [MemoryWriter(), MemoryWriter()]
+        BroadcastWriter(writers).write(CSVStream("test", iter([{"a": 1}, {"a": 2}])))
+        self.assertEqual(writers[0].content, b"a\n1\n2\n")
+        self.assertEqual(writers[1].content, b"a\n1\n2\n")
+
+    def test_csv_is_smaller_than_njson_for_wide_reports(self):
+        csv_size = len(CSVStream("test", report_generator(1000)).as_file().read())
+        njson_size = len(JSONStream("test", report_generator(1000)).as_file().read())
+        self.assertLess(csv_size, njson_size / 2)
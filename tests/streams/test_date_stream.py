@@ -49,3 +49,40 @@ class TestStreamBaseClassMethods(unittest.TestCase):
                 """
 
         self.assertMultiLineEqual(res.decode().replace(" ", ""), output.replace(" ", ""))
+
+    def test_streams_keep_their_own_configuration(self):
+        dbm_stream = FormatDateStream("dbm", self.data_generator(self.data), ["Date"], date_format="%d/%m/%Y")
+        dv360_stream = FormatDateStream("dv360", iter([{"Day": "2020-01-27"}]), ["Day"], date_format="%Y%m%d")
+
+        self.assertEqual(dbm_stream.keys, ["Date"])
+        self.assertEqual(next(dbm_stream.records())["Date"], "27/01/2020")
+        self.assertEqual(next(dv360_stream.records())["Day"], "20200127")
+
+    def test_input_format_is_inferred_per_key(self):
+        records = [
+            {"Date": "2020/01/27", "Timestamp": "01/28/2020 10:30", "Other": "01/02/2020"},
+            {"Date": "2020/01/28", "Timestamp": "01/29/2020 11:30", "Other": "01/02/2020"},
+        ]
+        stream = FormatDateStream("result", iter(records), ["Date", "Timestamp"], date_format="%Y-%m-%d %H:%M")
+        output = list(stream.records())
+
+        self.assertEqual(stream._input_formats, {"Date": "%Y/%m/%d", "Timestamp": "%m/%d/%Y %H:%M"})
+        self.assertEqual([r["Date"] for r in output], ["2020-01-27 00:00", "2020-01-28 00:00"])
+        self.assertEqual([r["Timestamp"] for r in output], ["2020-01-28 10:30", "2020-01-29 11:30"])
+        self.assertEqual(output[0]["Other"], "01/02/2020")
+
+    def test_values_not_matching_the_inferred_format_fall_back_to_dateutil(self):
+        records = [{"Date": "2020-01-27"}, {"Date": "27 January 2020"}, {"Date": "2020-01-27T10:00:00+02:00"}]
+        stream = FormatDateStream("result", iter(records), ["Date"])
+
+        self.assertEqual([r["Date"] for r in stream.records()], ["2020-01-27"] * 3)
+
+    def test_formatted_dates_are_memoized(self):
+        stream = FormatDateStream("result", self.data_generator(self.data), ["Date"])
+        for _ in stream.records():
+            pass
+        FormatDateStream("other", iter([]), ["Date"])
+
+        self.assertEqual(stream._format_date.cache_info().currsize, 5)
+        self.assertEqual(stream.transform_record({"Date": "2020/01/27"}), {"Date": "2020-01-27"})
+        self.assertEqual(stream._format_date.cache_info().hits, 1)
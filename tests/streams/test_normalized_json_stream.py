@@ -0,0 +1,62 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from unittest import TestCase
+
+from ack.streams.normalized_json_stream import NormalizedJSONStream, _get_keys_plan
+from parameterized import parameterized
+
+
+class NormalizedJSONStreamTest(TestCase):
+    @parameterized.expand(
+        [
+            ("Ad Name", "Ad_Name"),
+            (" Conversion Rate % ", "Conversion_Rate_per"),
+            ("actions[action_type:link_click]", "actions_action_type_link_click"),
+            ("cost (EUR)", "cost__EUR"),
+            ("ga:date", "ga_date"),
+            ("a.b/c\\d-e", "a_b_c_d_e"),
+        ]
+    )
+    def test_normalize_key(self, key, expected):
+        self.assertEqual(NormalizedJSONStream._normalize_key(key), expected)
+
+    def test_normalize_nested_record(self):
+        record = {
+            "Ad Name": "ad",
+            "Spend": None,
+            "Targeting": {"Age Range": ["18-24", {"Max Age": 24}], "Geo": None},
+            3: 1.5,
+        }
+        expected = {
+            "Ad_Name": "ad",
+            "Spend": "",
+            "Targeting": {"Age_Range": ["18-24", {"Max_Age": 24}], "Geo": ""},
+            "3": 1.5,
+        }
+        self.assertEqual(NormalizedJSONStream.transform_record(record), expected)
+
+    def test_keys_plan_is_reused_for_records_with_the_same_shape(self):
+        _get_keys_plan.cache_clear()
+        records = [{"Ad Name": f"ad_{i}", "Ad Id": i} for i in range(10)] + [{"Ad Id": 0, "Ad Name": "ad"}]
+
+        output = [NormalizedJSONStream.transform_record(record) for record in records]
+
+        self.assertEqual(output[3], {"Ad_Name": "ad_3", "Ad_Id": 3})
+        self.assertEqual(list(output[10].keys()), ["Ad_Id", "Ad_Name"])
+        cache_info = _get_keys_plan.cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses), (9, 2))
@@ -0,0 +1,77 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import threading
+import time
+from unittest import TestCase
+
+from ack.streams.json_stream import JSONStream
+from ack.streams.prefetch import prefetch
+
+
+class Source:
+    def __init__(self, n, delay=0, fail_at=None):
+        self.n = n
+        self.delay = delay
+        self.fail_at = fail_at
+        self.produced = 0
+        self.closed = False
+
+    def __iter__(self):
+        try:
+            for i in range(self.n):
+                if i == self.fail_at:
+                    raise ValueError("API error")
+                time.sleep(self.delay)
+                self.produced += 1
+                yield {"id": i}
+        finally:
+            self.closed = True
+
+
+class PrefetchTest(TestCase):
+    def test_records_are_yielded_in_order(self):
+        self.assertEqual([record["id"] for record in prefetch(Source(1000), max_records=50)], list(range(1000)))
+
+    def test_source_runs_while_consumer_is_busy(self):
+        start = time.perf_counter()
+        for _ in prefetch(Source(20, delay=0.01), max_records=10, batch_size=1):
+            time.sleep(0.01)
+        # Sequential consumption would take about 0.4s
+        self.assertLess(time.perf_counter() - start, 0.35)
+
+    def test_source_errors_are_raised(self):
+        records = []
+        with self.assertRaisesRegex(ValueError, "API error"):
+            for record in prefetch(Source(1000, fail_at=250), max_records=100, batch_size=10):
+                records.append(record)
+        self.assertEqual(len(records), 250)
+
+    def test_cancellation(self):
+        source = Source(100000)
+        records = prefetch(source, max_records=100, batch_size=10)
+        next(records)
+        time.sleep(0.05)
+        self.assertLessEqual(source.produced, 100 + 2 * 10)
+
+        records.close()
+        self.assertTrue(source.closed)
+        self.assertEqual([thread for thread in threading.enumerate() if thread.name == "ack-prefetch"], [])
+
+    def test_prefetched_stream(self):
+        stream = JSONStream("test", iter(Source(10))).prefetch(max_records=4)
+        self.assertEqual(stream.as_file().read().count(b"\n"), 10)
@@ -0,0 +1,99 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from unittest import TestCase
+
+from ack.streams.csv_stream import CSVStream
+from ack.streams.format_date_stream import FormatDateStream
+from ack.streams.json_stream import JSONStream
+from ack.streams.normalized_json_stream import NormalizedJSONStream
+from ack.streams.record_batch import RecordBatch, records_from_batches, skip_last_rows
+from ack.utils.metrics import StreamMetrics
+
+HEADERS = ["Date", "Campaign Name", "Clicks (total)", "Spend"]
+
+
+def batch_generator(n_batches, batch_size=3):
+    for i in range(n_batches):
+        rows = [
+            (f"2020-01-{j % 28 + 1:02d}", f'Campagne "été" {j}', str(j), j * 1.5 if j % 2 else None)
+            for j in range(i * batch_size, (i + 1) * batch_size)
+        ]
+        yield RecordBatch(HEADERS, rows)
+
+
+def encoded_content(stream):
+    return b"".join(stream.encoded_records())
+
+
+class RecordBatchStreamTest(TestCase):
+    def test_records_from_batches(self):
+        records = list(records_from_batches(batch_generator(2, batch_size=1)))
+        self.assertEqual(
+            records,
+            [
+                {"Date": "2020-01-01", "Campaign Name": 'Campagne "été" 0', "Clicks (total)": "0", "Spend": None},
+                {"Date": "2020-01-02", "Campaign Name": 'Campagne "été" 1', "Clicks (total)": "1", "Spend": 1.5},
+            ],
+        )
+
+    def test_encoded_records(self):
+        for stream_class in (JSONStream, NormalizedJSONStream):
+            with self.subTest(stream_class=stream_class):
+                stream = stream_class.from_batches("test", batch_generator(3))
+                expected = encoded_content(stream_class("test", records_from_batches(batch_generator(3))))
+                self.assertTrue(stream.is_batched)
+                self.assertEqual(encoded_content(stream), expected)
+
+    def test_encoded_records__format_dates(self):
+        stream = FormatDateStream.from_batches("test", batch_generator(3), keys=["Date"], date_format="%d/%m/%Y")
+        source = FormatDateStream("test", records_from_batches(batch_generator(3)), keys=["Date"], date_format="%d/%m/%Y")
+        self.assertEqual(encoded_content(stream), encoded_content(source))
+
+    def test_encoded_records__duplicated_headers(self):
+        stream = JSONStream.from_batches("test", [RecordBatch(["a", "b", "a"], [("1", "2", "3")])])
+        self.assertEqual(encoded_content(stream), b'{"a": "3", "b": "2"}\n')
+
+    def test_record_stage_builds_records(self):
+        stream = JSONStream.from_batches("test", batch_generator(3)).filter(lambda record: record["Spend"] is None)
+        self.assertFalse(stream.is_batched)
+        self.assertEqual(len(encoded_content(stream).splitlines()), 5)
+
+    def test_derived_streams(self):
+        source = JSONStream.from_batches("test", batch_generator(3))
+        stream = NormalizedJSONStream.create_from_stream(source)
+        self.assertTrue(stream.is_batched)
+
+        stream = CSVStream.create_from_stream(stream)
+        lines = encoded_content(stream).decode("utf-8").splitlines()
+        self.assertEqual(lines[0], "Date,Campaign_Name,Clicks__total,Spend")
+        self.assertEqual(lines[1], '2020-01-01,"Campagne ""été"" 0",0,')
+        self.assertEqual(len(lines), 10)
+
+    def test_observed_and_prefetched_stream_stays_batched(self):
+        metrics = StreamMetrics("test")
+        stream = metrics.observe_source(JSONStream.from_batches("test", batch_generator(4))).prefetch(10)
+        self.assertTrue(stream.is_batched)
+        self.assertEqual(len(encoded_content(stream).splitlines()), 12)
+        self.assertEqual(metrics.records, 12)
+
+    def test_skip_last_rows(self):
+        batches = [RecordBatch(["a"], [(1,), (2,)]), RecordBatch(["a"], [(3,)]), RecordBatch(["a"], [(4,)])]
+        for n, expected in [(0, [1, 2, 3, 4]), (1, [1, 2, 3]), (2, [1, 2]), (3, [1]), (5, [])]:
+            with self.subTest(n=n):
+                rows = [row[0] for batch in skip_last_rows(iter(batches), n) for row in batch.rows]
+                self.assertEqual(rows, expected)
@@ -0,0 +1,92 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import gzip
+import json
+from unittest import TestCase
+
+from ack.streams.csv_stream import CSVStream
+from ack.streams.encoded_stream import EncodedStream
+from ack.streams.json_stream import JSONStream
+
+
+def record_generator(n):
+    for i in range(n):
+        yield {"id": i, "name": f"name_{i}"}
+
+
+def read_lines(part, decompress=None):
+    content = part.as_file().read()
+    return (decompress(content) if decompress else content).decode("utf-8").splitlines()
+
+
+class StreamPartsTest(TestCase):
+    def test_roll_by_rows(self):
+        stream = JSONStream("test", record_generator(25)).roll(max_part_rows=10)
+        parts = list(stream.parts())
+
+        self.assertEqual([part.rows for part in parts], [10, 10, 5])
+        self.assertEqual([part.index for part in parts], [1, 2, 3])
+        self.assertTrue(parts[0].name.endswith("-00001.njson"))
+        self.assertEqual(parts[2].suffix, "-00003.njson")
+        records = [json.loads(line) for part in parts for line in read_lines(part)]
+        self.assertEqual(records, list(record_generator(25)))
+
+    def test_roll_by_bytes(self):
+        stream = JSONStream("test", record_generator(1000)).roll(max_part_bytes=1000)
+        parts = list(stream.parts())
+
+        self.assertGreater(len(parts), 1)
+        record_size = max(len(line) + 1 for part in parts for line in read_lines(part))
+        for part in parts[:-1]:
+            self.assertGreaterEqual(part.size, 1000)
+            self.assertLess(part.size, 1000 + record_size)
+        records = [json.loads(line) for part in parts for line in read_lines(part)]
+        self.assertEqual(records, list(record_generator(1000)))
+
+    def test_part_can_be_read_several_times(self):
+        part = next(JSONStream("test", record_generator(3)).roll(max_part_rows=10).parts())
+        self.assertEqual(read_lines(part), read_lines(part))
+
+    def test_compressed_parts(self):
+        stream = JSONStream("test", record_generator(25)).compress("gzip").roll(max_part_rows=10)
+        parts = list(stream.parts())
+
+        self.assertEqual(parts[0].suffix, "-00001.njson.gz")
+        self.assertEqual(parts[0].content_encoding, "gzip")
+        records = [json.loads(line) for part in parts for line in read_lines(part, gzip.decompress)]
+        self.assertEqual(records, list(record_generator(25)))
+
+    def test_csv_header_is_repeated_in_every_part(self):
+        stream = CSVStream("test", record_generator(5)).roll(max_part_rows=2)
+        parts = list(EncodedStream(stream, stream.encoded_records()).parts())
+
+        self.assertEqual([part.rows for part in parts], [2, 2, 1])
+        self.assertEqual([read_lines(part)[0] for part in parts], ["id,name"] * 3)
+        self.assertEqual(read_lines(parts[2]), ["id,name", "4,name_4"])
+
+    def test_empty_stream_is_a_single_empty_part(self):
+        parts = list(CSVStream("test", record_generator(0)).roll(max_part_rows=2).parts())
+
+        self.assertEqual(len(parts), 1)
+        self.assertEqual(parts[0].rows, 0)
+
+    def test_rolling_is_kept_by_derived_streams(self):
+        stream = JSONStream("test", record_generator(5)).roll(max_part_rows=2)
+        self.assertFalse(JSONStream("test", record_generator(5)).is_rolled)
+        self.assertTrue(stream.is_rolled)
+        self.assertEqual(CSVStream.create_from_stream(stream).max_part_rows, 2)
@@ -0,0 +1,80 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import json
+from datetime import datetime
+from unittest import TestCase, mock
+
+from ack.streams.encoded_stream import EncodedStream
+from ack.streams.format_date_stream import FormatDateStream
+from ack.streams.json_stream import JSONStream
+from ack.streams.normalized_json_stream import NormalizedJSONStream
+
+
+def record_generator():
+    yield {"Ad Name": "ad_1", "Date": "2020/01/27", "Impressions": 10}
+    yield {"Ad Name": "ad_2", "Date": "2020/01/28", "Impressions": 0}
+    yield {"Ad Name": "ad_3", "Date": "2020/01/29", "Impressions": 30}
+
+
+def read_lines(stream):
+    return [json.loads(line) for line in stream.as_file().read().splitlines()]
+
+
+class StreamTransformsTest(TestCase):
+    def test_map_and_filter_are_lazy_and_chainable(self):
+        calls = []
+
+        def add_ctr(record):
+            calls.append(record["Ad Name"])
+            return {**record, "ctr": 0.1}
+
+        stream = JSONStream("test", record_generator()).filter(lambda r: r["Impressions"] > 0).map(add_ctr)
+        self.assertEqual(calls, [])
+
+        records = list(stream.records())
+        self.assertEqual(calls, ["ad_1", "ad_3"])
+        self.assertEqual([r["ctr"] for r in records], [0.1, 0.1])
+
+    def test_create_from_stream_does_not_decode_records(self):
+        source = JSONStream("test", record_generator())
+        with mock.patch.object(JSONStream, "decode_record") as decode_record:
+            stream = NormalizedJSONStream.create_from_stream(source)
+            output = read_lines(stream)
+        decode_record.assert_not_called()
+        self.assertEqual(output[0], {"Ad_Name": "ad_1", "Date": "2020/01/27", "Impressions": 10})
+
+    def test_create_from_stream_keeps_source_transformation(self):
+        source = FormatDateStream("test", record_generator(), keys=["Date"], date_format="%Y-%m-%d")
+        output = read_lines(NormalizedJSONStream.create_from_stream(source))
+        self.assertEqual([r["Date"] for r in output], ["2020-01-27", "2020-01-28", "2020-01-29"])
+        self.assertEqual(output[2]["Ad_Name"], "ad_3")
+
+    def test_create_from_stream_encodes_non_json_values_once(self):
+        source = JSONStream("test", iter([{"date": datetime(2020, 1, 1), 1: None}]))
+        output = read_lines(NormalizedJSONStream.create_from_stream(source))
+        self.assertEqual(output, [{"date": "2020-01-01 00:00:00", "1": ""}])
+
+    def test_create_from_encoded_stream(self):
+        source = NormalizedJSONStream("test", record_generator())
+        encoded = EncodedStream(source, (source.encode_record_as_bytes(r) for r in source))
+        self.assertIs(NormalizedJSONStream.create_from_stream(encoded), encoded)
+
+        source = JSONStream("test", record_generator())
+        encoded = EncodedStream(source, (source.encode_record_as_bytes(r) for r in source))
+        output = read_lines(NormalizedJSONStream.create_from_stream(encoded))
+        self.assertEqual(output[1], {"Ad_Name": "ad_2", "Date": "2020/01/28", "Impressions": 0})
@@ -0,0 +1,58 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import gzip
+import io
+import logging
+from unittest import TestCase
+
+import requests
+
+from ack.utils.download import iter_response_lines
+
+
+def build_response(content, headers=None):
+    response = requests.Response()
+    response.raw = io.BytesIO(content)
+    response.headers.update(headers or {})
+    return response
+
+
+class TestDownload(TestCase):
+    CONTENT = "Date,Country,Impressions\r\n2020-01-01,Été,10\r\n\r\n2020-01-02,Ça,20".encode("utf-8")
+    EXPECTED = ["Date,Country,Impressions", "2020-01-01,Été,10", "", "2020-01-02,Ça,20"]
+
+    def test_iter_response_lines(self):
+        self.assertEqual(list(iter_response_lines(build_response(self.CONTENT))), self.EXPECTED)
+
+    def test_iter_response_lines__chunks_split_characters_and_lines(self):
+        for chunk_size in (1, 2, 3, 7):
+            with self.subTest(chunk_size=chunk_size):
+                lines = iter_response_lines(build_response(self.CONTENT), chunk_size=chunk_size)
+                self.assertEqual(list(lines), self.EXPECTED)
+
+    def test_iter_response_lines__gzip_body(self):
+        lines = iter_response_lines(build_response(gzip.compress(self.CONTENT)), chunk_size=16)
+        self.assertEqual(list(lines), self.EXPECTED)
+
+    def test_iter_response_lines__invalid_bytes(self):
+        content = b"Date,Country\n2020-01-01,Fr\xffance\n2020-01-02,\xc3\xa9"
+        with self.assertLogs(level=logging.WARNING) as log:
+            lines = list(iter_response_lines(build_response(content), chunk_size=4))
+
+        self.assertEqual(lines, ["Date,Country", "2020-01-01,France", "2020-01-02,é"])
+        self.assertEqual(len(log.output), 1)
@@ -0,0 +1,137 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from ack.readers.reader import Reader
+from ack.streams.json_stream import JSONStream
+from ack.streams.normalized_json_stream import NormalizedJSONStream
+from ack.utils.metrics import RunMetrics, StreamMetrics, format_jobs_prometheus_metrics, format_prometheus_metrics
+from ack.utils.pipeline import process_streams
+from ack.writers.writer import Writer
+
+
+def slow_generator(n, delay):
+    for i in range(n):
+        time.sleep(delay)
+        yield {"id": i}
+
+
+class MockReader(Reader):
+    def read(self):
+        yield JSONStream("stream_0", slow_generator(5, 0.01))
+        yield JSONStream("stream_1", slow_generator(3, 0))
+
+
+class FileWriter(Writer):
+    def write(self, stream):
+        stream.as_file().read()
+
+
+class StreamMetricsTest(TestCase):
+    def test_source_and_encoding_are_observed(self):
+        stream_metrics = StreamMetrics("test")
+        stream = stream_metrics.observe_encoding(stream_metrics.observe_source(JSONStream("test", slow_generator(5, 0.01))))
+
+        content = stream.as_file().read()
+
+        self.assertEqual(stream_metrics.records, 5)
+        self.assertEqual(stream_metrics.encoded_bytes, len(content))
+        self.assertGreaterEqual(stream_metrics.source_seconds, 0.05)
+
+
+class RunMetricsTest(TestCase):
+    def test_summary_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            metrics_file = os.path.join(directory, "metrics.json")
+            prometheus_file = os.path.join(directory, "ack.prom")
+            process_streams(MockReader(), [FileWriter()], metrics_file=metrics_file, prometheus_file=prometheus_file)
+
+            with open(metrics_file) as f:
+                summary = json.load(f)
+            with open(prometheus_file) as f:
+                prometheus_metrics = f.read()
+
+        self.assertEqual(summary["status"], "success")
+        self.assertEqual(summary["records"], 8)
+        self.assertEqual([stream["records"] for stream in summary["streams"]], [5, 3])
+        self.assertEqual(summary["encoded_bytes"], sum(len(f'{{"id": {i}}}\n') for i in [0, 1, 2, 3, 4, 0, 1, 2]))
+        self.assertGreaterEqual(summary["streams"][0]["source_seconds"], 0.05)
+        self.assertGreaterEqual(summary["streams"][0]["write_seconds"], summary["streams"][0]["source_seconds"])
+        self.assertGreater(summary["peak_rss_bytes"], 0)
+        self.assertEqual(summary["http"]["requests"], 0)
+        self.assertIn("ack_run_success 1\n", prometheus_metrics)
+        self.assertEqual(summary["streams"][1]["label"], "stream_1")
+        self.assertIn('ack_stream_records_total{stream="stream_1"} 3\n', prometheus_metrics)
+
+    def test_encoded_bytes_of_derived_streams(self):
+        class NormalizingWriter(Writer):
+            def write(self, stream):
+                self.content = NormalizedJSONStream.create_from_stream(stream).as_file().read()
+
+        writer = NormalizingWriter()
+        with tempfile.TemporaryDirectory() as directory:
+            metrics_file = os.path.join(directory, "metrics.json")
+            process_streams(MockReader(), [writer], metrics_file=metrics_file)
+            with open(metrics_file) as f:
+                summary = json.load(f)
+
+        self.assertEqual(summary["streams"][1]["encoded_bytes"], len(writer.content))
+
+    def test_summary_of_failed_run(self):
+        class FailingWriter(Writer):
+            def write(self, stream):
+                raise ValueError("Upload failed")
+
+        with self.assertLogs() as logs, self.assertRaises(ValueError):
+            process_streams(MockReader(), [FailingWriter()])
+        self.assertIn('"status": "failed"', logs.output[-1])
+
+    def test_reader_time(self):
+        metrics = RunMetrics()
+        streams = [stream for stream in metrics.timed_streams(slow_generator(3, 0.01))]
+
+        self.assertEqual(len(streams), 3)
+        self.assertGreaterEqual(metrics.reader_seconds, 0.03)
+
+    def test_label_values_are_escaped(self):
+        summary = RunMetrics().summary("success")
+        summary["streams"] = [StreamMetrics('a "quoted" \\ name').as_dict()]
+        self.assertIn('{stream="a \\"quoted\\" \\\\ name"}', format_prometheus_metrics(summary))
+
+    def test_streams_sharing_a_label_are_summed(self):
+        summary = RunMetrics().summary("success")
+        summary["streams"] = [StreamMetrics(f"results_{i}.njson", "results").as_dict() for i in range(2)]
+        for stream in summary["streams"]:
+            stream["records"] = 2
+        prometheus_metrics = format_prometheus_metrics(summary)
+
+        self.assertIn('ack_stream_records_total{stream="results"} 4\n', prometheus_metrics)
+        self.assertNotIn("results_0", prometheus_metrics)
+
+    def test_job_metrics_are_labelled(self):
+        summary = RunMetrics().summary("success")
+        summary["streams"] = [StreamMetrics("results").as_dict()]
+        prometheus_metrics = format_jobs_prometheus_metrics({"first": summary, "second": summary})
+
+        self.assertEqual(prometheus_metrics.count("# TYPE ack_run_success gauge\n"), 1)
+        self.assertIn('ack_run_success{job="first"} 1\n', prometheus_metrics)
+        self.assertIn('ack_stream_records_total{job="second",stream="results"} 0\n', prometheus_metrics)
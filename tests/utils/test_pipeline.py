@@ -0,0 +1,140 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import gzip
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from ack.readers.reader import Reader
+from ack.streams.json_stream import JSONStream
+from ack.utils.pipeline import process_streams
+from ack.writers.local.writer import LocalWriter
+from ack.writers.writer import Writer
+
+
+class MockReader(Reader):
+    def __init__(self, n_streams):
+        self.n_streams = n_streams
+        self.generated = 0
+
+    def read(self):
+        for i in range(self.n_streams):
+            self.generated += 1
+            yield JSONStream(f"stream_{i}", ({"stream": i, "id": j} for j in range(3)))
+
+
+class MemoryWriter(Writer):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.records = {}
+
+    def write(self, stream):
+        records = [record for record in stream]
+        with self.lock:
+            self.records[stream.name] = records
+
+
+class BlockingWriter(MemoryWriter):
+    """Writer that only completes once n streams are being written at the same time."""
+
+    def __init__(self, n_parallel):
+        super().__init__()
+        self.barrier = threading.Barrier(n_parallel, timeout=5)
+
+    def write(self, stream):
+        self.barrier.wait()
+        super().write(stream)
+
+
+class FailingWriter(Writer):
+    def write(self, stream):
+        if "stream_1" in stream.name:
+            raise ValueError("Upload failed")
+        [record for record in stream]
+
+
+class ProcessStreamsTest(TestCase):
+    def test_sequential_processing(self):
+        writer = MemoryWriter()
+        process_streams(MockReader(3), [writer])
+        self.assertEqual(len(writer.records), 3)
+
+    def test_concurrent_processing(self):
+        writer = BlockingWriter(n_parallel=3)
+        process_streams(MockReader(6), [writer], max_concurrent_streams=3)
+
+        self.assertEqual(len(writer.records), 6)
+        for records in writer.records.values():
+            self.assertEqual([record["id"] for record in records], [0, 1, 2])
+
+    def test_completions_are_logged_in_order(self):
+        with self.assertLogs() as logs:
+            process_streams(MockReader(5), [MemoryWriter()], max_concurrent_streams=2)
+
+        written = [line for line in logs.output if "written" in line]
+        self.assertEqual([line.split("#")[1][0] for line in written], ["1", "2", "3", "4", "5"])
+
+    def test_concurrent_processing_fails_fast(self):
+        reader = MockReader(50)
+        with self.assertRaisesRegex(ValueError, "Upload failed"):
+            process_streams(reader, [FailingWriter()], max_concurrent_streams=2)
+        self.assertLess(reader.generated, 50)
+
+    def test_normalize_keys(self):
+        class KeyReader(Reader):
+            def read(self):
+                yield JSONStream("stream", iter([{"Ad Name": "ad"}]))
+
+        class FileWriter(Writer):
+            def write(self, stream):
+                self.content = stream.as_file().read()
+
+        writer = FileWriter()
+        process_streams(KeyReader(), [writer], normalize_keys=True, max_concurrent_streams=2)
+        self.assertEqual(writer.content, b'{"Ad_Name": "ad"}\n')
+
+    def test_rolled_streams_are_written_as_parts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            process_streams(MockReader(1), [LocalWriter(directory, "report.csv")], output_format="csv", max_part_rows=2)
+
+            self.assertEqual(sorted(os.listdir(directory)), ["report-00001.csv", "report-00002.csv"])
+            with open(os.path.join(directory, "report-00002.csv")) as f:
+                self.assertEqual(f.read(), "stream,id\n0,2\n")
+
+    def test_compressed_streams_get_the_compression_extension(self):
+        with tempfile.TemporaryDirectory() as directory:
+            options = {"output_format": "csv", "compression": "gzip"}
+            process_streams(MockReader(1), [LocalWriter(directory, "report.csv")], **options)
+            process_streams(MockReader(1), [LocalWriter(directory, "parts.csv.gz")], max_part_rows=2, **options)
+
+            self.assertEqual(sorted(os.listdir(directory)), ["parts-00001.csv.gz", "parts-00002.csv.gz", "report.csv.gz"])
+            with gzip.open(os.path.join(directory, "report.csv.gz"), "rt") as f:
+                self.assertEqual(f.read(), "stream,id\n0,0\n0,1\n0,2\n")
+
+    def test_streams_are_committed_once_written(self):
+        committed = []
+
+        class CommittingReader(Reader):
+            def read(self):
+                for i in range(3):
+                    yield JSONStream(f"stream_{i}", iter([{"id": i}])).on_commit(lambda i=i: committed.append(i))
+
+        with self.assertRaisesRegex(ValueError, "Upload failed"):
+            process_streams(CommittingReader(), [FailingWriter()], normalize_keys=True, output_format="csv")
+        self.assertEqual(committed, [0])
@@ -0,0 +1,90 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import time
+from unittest import TestCase, mock
+
+from ack.utils.exceptions import RetryTimeoutError
+from ack.utils.poller import PENDING, JobPoller, Pending
+from requests import HTTPError
+
+
+class Job:
+    def __init__(self, pending_checks, result="result"):
+        self.pending_checks = pending_checks
+        self.result = result
+        self.checks = 0
+
+    def check(self):
+        self.checks += 1
+        if self.checks <= self.pending_checks:
+            return PENDING
+        return self.result
+
+
+class JobPollerTest(TestCase):
+    def test_job_result(self):
+        job = Job(pending_checks=3)
+        future = JobPoller(min_interval=0.01).submit(job.check)
+        self.assertEqual(future.result(timeout=5), "result")
+        self.assertEqual(job.checks, 4)
+
+    def test_jobs_are_polled_together(self):
+        poller = JobPoller(min_interval=0.1, backoff=1)
+        jobs = [Job(pending_checks=2, result=i) for i in range(10)]
+        start = time.monotonic()
+        futures = [poller.submit(job.check, name=f"Job {i}") for i, job in enumerate(jobs)]
+        self.assertEqual([future.result(timeout=5) for future in futures], list(range(10)))
+        # 2 intervals per job, not 2 intervals for each job in turn
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_retry_in(self):
+        checks = iter([Pending(retry_in=0.01), "result"])
+        future = JobPoller(min_interval=60).submit(lambda: next(checks))
+        self.assertEqual(future.result(timeout=5), "result")
+
+    def test_check_error(self):
+        def check():
+            raise HTTPError(response=mock.Mock(status_code=404))
+
+        with self.assertRaises(HTTPError):
+            JobPoller().submit(check).result(timeout=5)
+
+    def test_transient_check_error(self):
+        checks = iter([ConnectionError("Connection reset by peer"), PENDING, "result"])
+
+        def check():
+            result = next(checks)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with self.assertLogs(level="WARNING"):
+            future = JobPoller(min_interval=0.01).submit(check)
+            self.assertEqual(future.result(timeout=5), "result")
+
+    def test_transient_check_error_after_timeout(self):
+        def check():
+            raise ConnectionError("Connection reset by peer")
+
+        with self.assertLogs(level="WARNING"), self.assertRaises(ConnectionError):
+            JobPoller(min_interval=0.01).submit(check, timeout=0.05).result(timeout=5)
+
+    def test_timeout(self):
+        future = JobPoller(min_interval=0.01).submit(lambda: PENDING, name="Query 1", timeout=0.05)
+        with self.assertRaisesRegex(RetryTimeoutError, "Query 1 has taken more than"):
+            future.result(timeout=5)
@@ -0,0 +1,63 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import os
+import pstats
+import tempfile
+from unittest import TestCase
+
+from ack.readers.reader import Reader
+from ack.streams.json_stream import JSONStream
+from ack.utils.pipeline import process_streams
+from ack.writers.writer import Writer
+
+
+def get_field_values(i):
+    return {"id": i, "values": [str(j) for j in range(50)]}
+
+
+class ProfiledReader(Reader):
+    def read(self):
+        for i in range(2):
+            yield JSONStream(f"stream_{i}", (get_field_values(j) for j in range(500)))
+
+
+class FileWriter(Writer):
+    def write(self, stream):
+        stream.as_file().read()
+
+
+class ProfilerTest(TestCase):
+    def test_reader_and_stream_writes_are_profiled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertLogs() as logs:
+                process_streams(ProfiledReader(), [FileWriter()], profile=directory)
+
+            files = sorted(os.listdir(directory))
+            self.assertEqual(len(files), 6)
+            self.assertTrue(all(f.startswith("run-") for f in files))
+            self.assertEqual(len([f for f in files if "_reader." in f]), 2)
+            stream_profiles = [f for f in files if "_stream-" in f and f.endswith(".pstats")]
+            self.assertEqual(len(stream_profiles), 2)
+
+            stats = pstats.Stats(os.path.join(directory, stream_profiles[0]))
+            functions = [function_name for _, _, function_name in stats.stats]
+            self.assertIn("get_field_values", functions)
+            with open(os.path.join(directory, stream_profiles[0].replace(".pstats", ".txt"))) as f:
+                self.assertIn("get_field_values", f.read())
+
+        self.assertEqual(len([line for line in logs.output if "Profile of stream-" in line]), 2)
@@ -0,0 +1,99 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import json
+import threading
+import time
+from unittest import TestCase, mock
+
+from ack.readers.facebook.helper import monitor_usage
+from ack.utils.rate_limit import AdaptiveRateLimiter, SlidingWindowLimiter, TokenBucket, parse_retry_after
+
+
+class FakeTime:
+    """Clock advanced by sleep() only."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def usage_header(**usage):
+    return json.dumps({"1234": [{"type": "ads_insights", **usage}]})
+
+
+@mock.patch("ack.utils.rate_limit.time", new_callable=FakeTime)
+class RateLimitTest(TestCase):
+    def test_token_bucket(self, fake_time):
+        bucket = TokenBucket(rate=2, capacity=2)
+        self.assertEqual([bucket.acquire() for _ in range(4)], [0, 0, 0.5, 0.5])
+
+        fake_time.sleep(10)
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0, 0, 0.5])
+
+    def test_sliding_window(self, fake_time):
+        limiter = SlidingWindowLimiter(max_calls=3, window=10)
+        self.assertEqual([limiter.acquire() for _ in range(5)], [0, 0, 0, 10, 0])
+
+        fake_time.sleep(4)
+        self.assertEqual([limiter.acquire() for _ in range(2)], [0, 6])
+
+    def test_retry_after(self, fake_time):
+        limiter = AdaptiveRateLimiter()
+        limiter.update({"Retry-After": "30"})
+        self.assertEqual(limiter.acquire(), 30)
+        self.assertEqual(limiter.acquire(), 0)
+        self.assertEqual(parse_retry_after("Thu, 01 Jan 1970 00:17:50 GMT"), 40)
+
+    def test_usage_headers(self, fake_time):
+        limiter = AdaptiveRateLimiter(usage_threshold=75, max_pause=300)
+        for usage, expected in [({"call_count": 50, "total_time": 20}, 0), ({"call_count": 10, "total_cputime": 87.5}, 150)]:
+            with self.subTest(usage=usage):
+                limiter.update({"x-business-use-case-usage": usage_header(**usage)})
+                self.assertEqual(limiter.acquire(), expected)
+
+        limiter.update({"X-Business-Use-Case-Usage": usage_header(call_count=100, estimated_time_to_regain_access=5)})
+        self.assertEqual(limiter.acquire(), 300)
+
+    def test_facebook_monitor_usage(self, fake_time):
+        limiter = AdaptiveRateLimiter()
+        response = mock.Mock(_headers=[{"name": "X-Business-Use-Case-Usage", "value": usage_header(call_count=100)}])
+        monitor_usage(response, limiter)
+        self.assertEqual(limiter.acquire(), 300)
+
+        monitor_usage(mock.Mock(_headers=[]), limiter)
+        self.assertEqual(limiter.acquire(), 0)
+
+
+class SharedBudgetTest(TestCase):
+    def test_threads_share_the_budget(self):
+        limiter = SlidingWindowLimiter(max_calls=2, window=0.1)
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(6)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
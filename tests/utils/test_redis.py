@@ -0,0 +1,62 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import pickle
+from unittest import TestCase, mock
+
+from ack.utils.redis import RedisStateService
+
+
+@mock.patch("ack.utils.redis.redis.Redis")
+class RedisStateServiceTest(TestCase):
+    def stored_values(self, redis_client):
+        pipeline = redis_client.return_value.pipeline.return_value
+        return [(args[1], pickle.loads(args[2])) for _, args, _ in pipeline.hset.mock_calls]
+
+    def test_checkpoints_are_coalesced_until_commit(self, redis_client):
+        service = RedisStateService("state", "localhost")
+        for value in [1, 3, 2]:
+            service.checkpoint("table", value)
+        redis_client.return_value.pipeline.assert_not_called()
+
+        service.commit()
+        self.assertEqual(self.stored_values(redis_client), [("table", 3)])
+        redis_client.return_value.pipeline.return_value.execute.assert_called_once()
+        redis_client.return_value.hset.assert_not_called()
+
+    def test_checkpoints_are_flushed_every_n_rows(self, redis_client):
+        service = RedisStateService("state", "localhost", checkpoint_rows=2)
+        for value in range(5):
+            service.checkpoint("table", value)
+
+        self.assertEqual(self.stored_values(redis_client), [("table", 1), ("table", 3)])
+        service.commit()
+        self.assertEqual(self.stored_values(redis_client)[-1], ("table", 4))
+
+    def test_none_values_are_ignored(self, redis_client):
+        service = RedisStateService("state", "localhost")
+        service.checkpoint("table", "2020-01-01")
+        service.checkpoint("table", None)
+        service.commit()
+        self.assertEqual(self.stored_values(redis_client), [("table", "2020-01-01")])
+
+    def test_disabled_service(self, redis_client):
+        service = RedisStateService("state", None)
+        service.checkpoint("table", 1)
+        service.commit()
+        self.assertIsNone(service.get("table"))
+        redis_client.assert_not_called()
@@ -0,0 +1,77 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import subprocess
+import sys
+from importlib.util import find_spec
+from unittest import TestCase
+
+import click
+from ack.entrypoints.cli.readers import readers
+from ack.entrypoints.cli.writers import writers
+from ack.entrypoints.json.readers import readers_classes
+from ack.entrypoints.json.writers import writers_classes
+from ack.utils.registry import LazyGroup, LazyRegistry
+from click.testing import CliRunner
+
+
+@click.command(name="hello")
+def hello():
+    """Say hello"""
+    click.echo("hello")
+
+
+class LazyRegistryTest(TestCase):
+    def test_objects_are_imported_when_accessed(self):
+        registry = LazyRegistry({"decoder": ("json:JSONDecoder", "json:loads")})
+
+        self.assertEqual(list(registry), ["decoder"])
+        self.assertEqual(registry._objects, {})
+        decoder_class, loads = registry["decoder"]
+        self.assertEqual(loads("[1]"), [1])
+        self.assertIs(registry["decoder"][0], decoder_class)
+
+    def test_registered_modules_exist(self):
+        paths = [*readers.values(), *writers.values()]
+        paths += [path for name in readers_classes for path in readers_classes._paths[name]]
+        paths += [path for name in writers_classes for path in writers_classes._paths[name]]
+        for path in paths:
+            self.assertIsNotNone(find_spec(path.split(":")[0]), path)
+
+    def test_cli_startup_does_not_import_connectors(self):
+        code = (
+            "import sys; import ack.entrypoints.cli.main; "
+            "print(sorted(m for m in sys.modules if m.startswith('ack.readers.')))"
+        )
+        output = subprocess.check_output([sys.executable, "-c", code]).decode()
+        self.assertEqual(output.strip(), "['ack.readers.reader']")
+
+
+class LazyGroupTest(TestCase):
+    def test_commands_are_imported_when_invoked(self):
+        group = LazyGroup(lazy_commands={"hello": "tests.utils.test_registry:hello"})
+
+        self.assertEqual(group.list_commands(None), ["hello"])
+        self.assertEqual(group.commands, {})
+        self.assertEqual(CliRunner().invoke(group, ["hello"]).output, "hello\n")
+
+    def test_unavailable_commands_are_listed_in_help(self):
+        group = LazyGroup(lazy_commands={"hello": "tests.utils.test_registry:hello", "broken": "not_a_module:command"})
+
+        output = CliRunner().invoke(group, ["--help"]).output
+        self.assertIn("hello   Say hello", output)
+        self.assertIn("broken  (unavailable: No module named 'not_a_module')", output)
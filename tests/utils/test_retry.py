@@ -0,0 +1,97 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+from unittest import TestCase, mock
+
+import requests
+from botocore.exceptions import ClientError
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
+from ack.utils.retry import RetryBudget, get_status_code, is_retryable, retry
+
+
+def http_error(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status_code} error", response=response)
+
+
+class FailingCall:
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "result"
+
+
+@mock.patch("tenacity.nap.time.sleep")
+class RetryTest(TestCase):
+    def retried(self, call, attempts=5, budget=None):
+        return retry(attempts=attempts, budget=budget or RetryBudget())(call)
+
+    def test_transient_errors_are_retried(self, sleep):
+        call = FailingCall([http_error(503), ConnectionError(), http_error(408), http_error(429)])
+        self.assertEqual(self.retried(call)(), "result")
+        self.assertEqual(call.calls, 5)
+        self.assertTrue(all(0 <= args[0] <= 30 for args, _ in sleep.call_args_list))
+
+    def test_attempts_are_limited(self, sleep):
+        budget = RetryBudget()
+        call = FailingCall([http_error(500)] * 5)
+        with self.assertRaises(requests.HTTPError):
+            self.retried(call, attempts=3, budget=budget)()
+        self.assertEqual(call.calls, 3)
+        self.assertEqual(budget.stats(), {**budget.stats(), "calls": 1, "retries": 2, "attempts_exhausted": 1})
+
+    def test_client_errors_are_not_retried(self, sleep):
+        for error in [http_error(400), http_error(404), TypeError("bad argument")]:
+            with self.subTest(error=error):
+                budget = RetryBudget()
+                call = FailingCall([error])
+                with self.assertRaises(type(error)):
+                    self.retried(call, budget=budget)()
+                self.assertEqual(call.calls, 1)
+                self.assertEqual(budget.stats()["not_retried"], 1)
+        sleep.assert_not_called()
+
+    def test_retry_after(self, sleep):
+        call = FailingCall([http_error(429, {"Retry-After": "42"})])
+        self.assertEqual(self.retried(call)(), "result")
+        sleep.assert_called_once_with(42)
+
+    def test_retry_budget(self, sleep):
+        budget = RetryBudget(ratio=0.5, min_retries=1)
+        with self.assertRaises(ConnectionError):
+            self.retried(FailingCall([ConnectionError()] * 5), budget=budget)()
+
+        # 1 call allows 1 + 0.5 retries: the third retry is denied
+        self.assertEqual(budget.stats()["retries"], 2)
+        self.assertEqual(budget.stats()["budget_exhausted"], 1)
+
+    def test_status_code_of_client_errors(self, sleep):
+        boto_error = ClientError({"Error": {}, "ResponseMetadata": {"HTTPStatusCode": 403}}, "PutObject")
+        google_error = HttpError(Response({"status": 503}), b"")
+        self.assertEqual(get_status_code(boto_error), 403)
+        self.assertEqual(get_status_code(google_error), 503)
+        self.assertFalse(is_retryable(boto_error))
+        self.assertTrue(is_retryable(google_error))
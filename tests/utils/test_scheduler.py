@@ -0,0 +1,171 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase, mock
+
+from ack.entrypoints.json.main import build_jobs, read_and_write, run_config_jobs
+from ack.utils.scheduler import Job, run_jobs
+from click.testing import CliRunner
+
+
+class RecordingJobs:
+    """Jobs recording the maximum nb of jobs running at the same time, overall and by connector."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = []
+        self.max_running = 0
+        self.max_running_by_connector = {}
+
+    def job(self, name, connectors, global_clients=None, fail=False):
+        def run():
+            with self.lock:
+                self.running.append(job)
+                self.max_running = max(self.max_running, len(self.running))
+                for connector in connectors:
+                    n_running = len([running_job for running_job in self.running if connector in running_job.connectors])
+                    self.max_running_by_connector[connector] = max(self.max_running_by_connector.get(connector, 0), n_running)
+            time.sleep(0.02)
+            with self.lock:
+                self.running.remove(job)
+            if fail:
+                raise ValueError(f"{name} failed")
+
+        job = Job(name, run, connectors, global_clients)
+        return job
+
+
+class SchedulerTest(TestCase):
+    def test_global_and_connector_limits(self):
+        recorder = RecordingJobs()
+        jobs = [recorder.job(f"facebook_{i}", ["facebook", "local"]) for i in range(6)]
+        jobs += [recorder.job(f"mysql_{i}", ["mysql", "local"]) for i in range(4)]
+
+        results = run_jobs(jobs, max_concurrent_jobs=4, connector_limits={"facebook": 2})
+
+        self.assertEqual([result.name for result in results], [job.name for job in jobs])
+        self.assertTrue(all(result.succeeded for result in results))
+        self.assertEqual(recorder.max_running, 4)
+        self.assertEqual(recorder.max_running_by_connector["facebook"], 2)
+
+    def test_global_clients_with_other_credentials_are_not_concurrent(self):
+        recorder = RecordingJobs()
+        jobs = [recorder.job(f"token_a_{i}", ["facebook"], {"facebook": ("a",)}) for i in range(2)]
+        jobs += [recorder.job(f"token_b_{i}", ["facebook"], {"facebook": ("b",)}) for i in range(2)]
+        overlaps = []
+        for job in jobs:
+            run = job.run
+
+            def checked_run(job=job, run=run):
+                with recorder.lock:
+                    overlaps.extend(
+                        running_job for running_job in recorder.running if running_job.global_clients != job.global_clients
+                    )
+                run()
+
+            job.run = checked_run
+
+        results = run_jobs(jobs, max_concurrent_jobs=4)
+
+        self.assertTrue(all(result.succeeded for result in results))
+        self.assertEqual(overlaps, [])
+        self.assertEqual(recorder.max_running, 2)
+
+    def test_failed_jobs_do_not_stop_other_jobs(self):
+        recorder = RecordingJobs()
+        jobs = [recorder.job(f"job_{i}", ["local"], fail=i == 1) for i in range(3)]
+
+        results = run_jobs(jobs, max_concurrent_jobs=2)
+
+        self.assertEqual([result.succeeded for result in results], [True, False, True])
+        self.assertIsInstance(results[1].error, ValueError)
+
+
+class MultiJobConfigTest(TestCase):
+    def test_jobs_are_built_with_shared_writers(self):
+        data = {
+            "normalize_keys": True,
+            "max_part_rows": 10,
+            "jobs": [
+                {"reader": {"name": "facebook", "access_token": "token"}, "writers": [{"name": "console"}]},
+                {"name": "sheet", "reader": {"name": "mysql"}, "writers": [{"name": "console"}], "max_part_rows": 5},
+            ],
+        }
+        jobs = build_jobs(data)
+
+        self.assertEqual([job.name for job in jobs], ["1_facebook", "sheet"])
+        self.assertEqual(jobs[0].connectors, ["facebook", "console"])
+        self.assertEqual(jobs[0].global_clients, {"facebook": (None, None, "token")})
+        self.assertIs(jobs[0].run.args[1][0], jobs[1].run.args[1][0])
+        self.assertEqual(jobs[0].run.args[2], {"normalize_keys": True, "max_part_rows": 10})
+        self.assertEqual(jobs[1].run.args[2], {"normalize_keys": True, "max_part_rows": 5})
+
+    def test_root_metrics_files_are_written_once_for_all_jobs(self):
+        def process_streams(reader, writers, on_summary=None, **options):
+            self.assertNotIn("metrics_file", options)
+            on_summary({"status": "success", "profile": options["profile"]})
+
+        with tempfile.TemporaryDirectory() as directory:
+            data = {
+                "metrics_file": os.path.join(directory, "metrics.json"),
+                "profile": "profiles",
+                "jobs": [
+                    {"name": "first", "reader": {"name": "mysql"}, "writers": [{"name": "console"}]},
+                    {"name": "second", "reader": {"name": "mysql"}, "writers": [{"name": "console"}]},
+                ],
+            }
+            with mock.patch("ack.entrypoints.json.main.format_reader"), mock.patch(
+                "ack.entrypoints.json.main.process_streams", process_streams
+            ):
+                run_config_jobs(data)
+            with open(data["metrics_file"]) as f:
+                summaries = json.load(f)
+
+        self.assertEqual(
+            summaries,
+            {
+                "jobs": {
+                    "first": {"status": "success", "profile": os.path.join("profiles", "first")},
+                    "second": {"status": "success", "profile": os.path.join("profiles", "second")},
+                }
+            },
+        )
+
+    def test_consolidated_exit_status(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config_file = os.path.join(directory, "config.json")
+            writers = [{"name": "local", "directory": directory, "file_name": "out.njson"}]
+            with open(config_file, "w") as f:
+                json.dump(
+                    {
+                        "max_concurrent_jobs": 2,
+                        "jobs": [
+                            {"reader": {"name": "mysql"}, "writers": writers},
+                            {"reader": {"name": "unknown"}, "writers": writers},
+                        ],
+                    },
+                    f,
+                )
+            result = CliRunner().invoke(read_and_write, ["--config-file", config_file])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("2 of 2 jobs failed", result.output)
@@ -0,0 +1,76 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import os
+import tempfile
+from datetime import datetime
+from unittest import TestCase, mock
+
+from ack.utils.redis import RedisStateService
+from ack.utils.state import SQLiteStateService, StateService, create_state_service
+
+
+class SQLiteStateServiceTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "state", "ack.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_and_set(self):
+        service = SQLiteStateService("mysql", self.path)
+        self.assertIsNone(service.get("table"))
+
+        service.set("table", datetime(2020, 1, 1))
+        self.assertEqual(SQLiteStateService("mysql", self.path).get("table"), datetime(2020, 1, 1))
+
+    def test_values_are_namespaced(self):
+        SQLiteStateService("mysql", self.path).set("table", 1)
+        SQLiteStateService("salesforce", self.path).set("table", 2)
+
+        self.assertEqual(SQLiteStateService("mysql", self.path).get("table"), 1)
+        self.assertEqual(SQLiteStateService("salesforce", self.path).get("table"), 2)
+
+    def test_checkpoints_are_written_on_commit(self):
+        service = SQLiteStateService("mysql", self.path)
+        for value in ["2020-01-02", "2020-01-03", "2020-01-01"]:
+            service.checkpoint("table", value)
+        service.checkpoint("other_table", 10)
+        self.assertIsNone(service.get("table"))
+
+        service.commit()
+        self.assertEqual(service.get("table"), "2020-01-03")
+        self.assertEqual(service.get("other_table"), 10)
+
+
+class CreateStateServiceTest(TestCase):
+    @mock.patch("ack.utils.redis.redis.Redis")
+    def test_redis_backend(self, _):
+        self.assertIsInstance(create_state_service("mysql", "localhost", 6379, None), RedisStateService)
+
+    def test_sqlite_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            service = create_state_service("mysql", None, 6379, os.path.join(directory, "ack.db"))
+            self.assertIsInstance(service, SQLiteStateService)
+
+    def test_disabled_service(self):
+        service = create_state_service("mysql", None, 6379, None)
+        self.assertEqual(type(service), StateService)
+        service.checkpoint("table", 1)
+        service.commit()
+        self.assertIsNone(service.get("table"))
@@ -18,7 +18,8 @@
 import logging
 from unittest import TestCase
 
-from ack.utils.text import parse_decoded_line, get_report_generator_from_flat_file
+from ack.streams.record_batch import RecordBatch
+from ack.utils.text import get_report_batches_from_flat_file, get_report_generator_from_flat_file, parse_decoded_line
 
 
 class TestTextUtilsMethod(TestCase):
@@ -198,3 +199,70 @@ class TestTextUtilsMethod(TestCase):
         ]
         for output_record, expected_record in zip(output, expected):
             self.assertEqual(output_record, expected_record)
+
+    def test_get_report_generator__quoted_newlines_and_delimiters(self):
+        lines = [
+            b"Date,Ad,Impressions",
+            b'2020-01-01,"First line',
+            b'second line, with a comma",10',
+            b'2020-01-02,"Ad ""quoted""",20',
+        ]
+        output = list(get_report_generator_from_flat_file(iter(lines)))
+        expected = [
+            {"Date": "2020-01-01", "Ad": "First line\nsecond line, with a comma", "Impressions": "10"},
+            {"Date": "2020-01-02", "Ad": 'Ad "quoted"', "Impressions": "20"},
+        ]
+        self.assertEqual(output, expected)
+
+    def test_get_report_generator__skipped_lines_are_counted(self):
+        lines = ["Date\tImpressions", "2020-01-01\t10", "Total", "2020-01-02\t20", "Copyright\tArtefact\t2020"]
+        with self.assertLogs(level=logging.WARNING) as log:
+            output = list(get_report_generator_from_flat_file(iter(lines), delimiter="\t"))
+
+        self.assertEqual(output, [{"Date": "2020-01-01", "Impressions": "10"}, {"Date": "2020-01-02", "Impressions": "20"}])
+        self.assertEqual(
+            log.output, ["WARNING:root:Skipped 2 line(s) whose length doesn't match length of headers, e.g. 'Total'."]
+        )
+
+    def test_get_report_batches(self):
+        lines = [b"Date,Impressions", b"2020-01-01,10", b"2020-01-02,20", b"Total", b"2020-01-03,30"]
+        with self.assertLogs(level=logging.WARNING):
+            output = list(get_report_batches_from_flat_file(iter(lines), batch_size=2))
+        expected = [
+            RecordBatch(["Date", "Impressions"], [("2020-01-01", "10"), ("2020-01-02", "20")]),
+            RecordBatch(["Date", "Impressions"], [("2020-01-03", "30")]),
+        ]
+        self.assertEqual(output, expected)
+
+    def test_get_report_batches__add_column(self):
+        lines = ["Date,Impressions", "2020-01-01,10", "2020-01-02,20"]
+        for column_dict in ({"Source": "API"}, {"Source": "API", "Date": "2020-12-31"}):
+            with self.subTest(column_dict=column_dict):
+                batches = get_report_batches_from_flat_file(iter(lines), add_column=True, column_dict=column_dict)
+                records = [record for batch in batches for record in batch.records()]
+                expected = get_report_generator_from_flat_file(iter(lines), add_column=True, column_dict=column_dict)
+                self.assertEqual(records, list(expected))
+
+    def test_get_report_generator__unbalanced_quote(self):
+        for n_rows in (20000, 50000):
+            with self.subTest(n_rows=n_rows):
+                lines = ["Date,Ad,Impressions", '1,"2,3'] + [f"2020-01-01,{i},10" for i in range(n_rows)]
+                with self.assertLogs(level=logging.WARNING) as log:
+                    output = list(get_report_generator_from_flat_file(iter(lines)))
+
+                self.assertEqual(len(output), n_rows)
+                self.assertEqual(output[0], {"Date": "2020-01-01", "Ad": "0", "Impressions": "10"})
+                self.assertIn("Skipped 1 line(s)", log.output[0])
+
+    def test_get_report_generator__unbalanced_quote_at_end_of_file(self):
+        lines = ["Date,Ad,Impressions", "2020-01-01,1,10", '2020-01-01,"2,10', "2020-01-01,3,10"]
+        with self.assertLogs(level=logging.WARNING):
+            output = list(get_report_generator_from_flat_file(iter(lines)))
+
+        self.assertEqual([record["Ad"] for record in output], ["1", "3"])
+
+    def test_get_report_generator__blank_lines_in_quoted_values(self):
+        lines = ["(Not desired first line)", "", "Date,Ad,Impressions", '2020-01-01,"line1', "", 'line3",10', "", "Total"]
+        output = list(get_report_generator_from_flat_file(iter(lines), skip_n_first=1, skip_n_last=1))
+
+        self.assertEqual(output, [{"Date": "2020-01-01", "Ad": "line1\n\nline3", "Impressions": "10"}])
@@ -36,8 +36,22 @@ class AmazonS3WriterTest(TestCase):
     )
     def test_valid_filename(self, file_name, stream_name, expected):
         writer = AmazonS3Writer("test", "us-east-1", "", "", prefix=None, filename=file_name)
-        writer._set_valid_file_name(stream_name)
-        self.assertEqual(expected, writer._file_name)
+        self.assertEqual(expected, writer._get_valid_file_name(stream_name))
+
+    def test_valid_filename_with_suffix(self):
+        writer = AmazonS3Writer("test", "us-east-1", "", "", prefix=None, filename="file_name")
+        self.assertEqual("file_name-00001.njson.gz", writer._get_valid_file_name("stream-00001.njson.gz", "-00001.njson.gz"))
+
+    def test_write_rolled_stream(self):
+        writer = AmazonS3Writer("test", "us-east-1", "", "", prefix="rolled", filename="report")
+        uri, file_names = writer.write(mock_stream(list_dict, "test").roll(max_part_rows=1))
+
+        self.assertEqual(uri, "s3://test/rolled/report-*.njson")
+        self.assertEqual(file_names, [f"rolled/report-{i:05d}.njson" for i in range(1, len(list_dict) + 1)])
+        bucket = boto3.resource("s3", region_name="us-east-1").Bucket("test")
+        for i, file_name in enumerate(file_names):
+            body = bucket.Object(file_name).get()["Body"].read().decode("utf-8")
+            self.assertEqual(json.loads(body), list_dict[i])
 
     def test_Write(self):
         writer = AmazonS3Writer("test", "us-east-1", "", "")
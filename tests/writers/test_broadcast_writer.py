@@ -0,0 +1,100 @@
+# GNU Lesser General Public License v3.0 only
+# Copyright (C) 2020 Artefact
+# licence-information@artefact.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+import json
+import threading
+from unittest import TestCase
+
+from ack.streams.json_stream import JSONStream
+from ack.writers.broadcast_writer import BroadcastWriter
+from ack.writers.writer import Writer
+
+
+class MemoryWriter(Writer):
+    def __init__(self):
+        self.content = b""
+        self.thread_name = None
+
+    def write(self, stream):
+        self.thread_name = threading.current_thread().name
+        self.content = stream.as_file().read()
+
+
+class RecordWriter(Writer):
+    def __init__(self):
+        self.records = []
+
+    def write(self, stream):
+        self.records = [record for record in stream]
+
+
+class FailingWriter(Writer):
+    def write(self, stream):
+        stream.as_file().read(10)
+        raise ValueError("Upload failed")
+
+
+def record_generator(n):
+    for i in range(n):
+        yield {"id": i, "name": f"record_{i}"}
+
+
+def failing_generator():
+    yield {"id": 0}
+    raise RuntimeError("API unavailable")
+
+
+class BroadcastWriterTest(TestCase):
+    def test_every_writer_receives_the_whole_stream(self):
+        writers = [MemoryWriter(), MemoryWriter(), RecordWriter()]
+        BroadcastWriter(writers, queue_size=2, batch_size=7).write(JSONStream("test", record_generator(100)))
+
+        expected = b"".join(json.dumps(record).encode("utf-8") + b"\n" for record in record_generator(100))
+        self.assertEqual(writers[0].content, expected)
+        self.assertEqual(writers[1].content, expected)
+        self.assertEqual(writers[2].records, list(record_generator(100)))
+
+    def test_writers_run_on_their_own_thread(self):
+        writers = [MemoryWriter(), MemoryWriter()]
+        BroadcastWriter(writers).write(JSONStream("test", record_generator(10)))
+
+        self.assertNotEqual(writers[0].thread_name, threading.current_thread().name)
+        self.assertNotEqual(writers[0].thread_name, writers[1].thread_name)
+
+    def test_writer_error_is_raised_after_other_writers_complete(self):
+        writers = [FailingWriter(), MemoryWriter()]
+        with self.assertRaisesRegex(ValueError, "Upload failed"):
+            BroadcastWriter(writers, queue_size=1, batch_size=1).write(JSONStream("test", record_generator(50)))
+
+        self.assertEqual(len(writers[1].content.splitlines()), 50)
+
+    def test_source_error_is_propagated(self):
+        writers = [MemoryWriter(), MemoryWriter()]
+        with self.assertRaisesRegex(RuntimeError, "API unavailable"):
+            BroadcastWriter(writers).write(JSONStream("test", failing_generator()))
+
+    def test_encoded_stream_keeps_source_name(self):
+        stream = JSONStream("test", record_generator(1))
+        names = []
+
+        class NameWriter(Writer):
+            def write(self, stream):
+                names.append(stream.name)
+                stream.as_file().read()
+
+        BroadcastWriter([NameWriter(), NameWriter()]).write(stream)
+        self.assertEqual(names, [stream.name, stream.name])